@@ -0,0 +1,159 @@
+"""
+Section conformance of the specs against their kind's template.
+
+``SpecKind.template_for`` creates every spec with the ``## `` sections listed
+in ``spec-kinds.yaml``. This compares the ``##`` headings each spec actually
+has with that list (titles are matched case insensitively) and reports:
+
+- missing sections (error)
+- sections out of the template order (error)
+- sections still holding the template text from ``help_for_section``, or the
+  ``None`` written for sections without help (error)
+- sections the template does not list (warning, specs may add their own)
+
+Specs are checked in a worker pool. Results are cached per content hash under
+``.cache/doc-manager``, together with a hash of the kind definitions, so an
+unchanged corpus is not parsed again.
+"""
+
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from auto.types import SPEC_DIR, Language, SpecDocument, SpecKind
+
+CACHE_PATH = Path(".cache/doc-manager/conformance.json")
+CACHE_VERSION = 2
+# first line of SpecKind.reference_section
+REFERENCES_PLACEHOLDER = "<!-- Remove un-necessary sections -->"
+
+
+@dataclass
+class Issue:
+    line: int
+    section: str
+    problem: str
+    # "error" or "warning"
+    severity: str = "error"
+
+
+def template_text(kind: SpecKind, section: str) -> str:
+    """Text ``template_for`` puts under ``section``, as found in a fresh spec."""
+    if section.lower() == "references":
+        return REFERENCES_PLACEHOLDER
+    # the template writes "None" for sections without help text
+    return str(kind.help_for_section(section)).split("\n\n")[0]
+
+
+def check(document: SpecDocument, kind: SpecKind) -> list[Issue]:
+    expected = {name.lower(): i for i, name in enumerate(kind.sections)}
+    headings = [h for h in document.headings if h.level == 2]
+    issues = []
+
+    found = {}
+    for heading in headings:
+        key = heading.title.lower()
+        if key not in expected:
+            issues.append(
+                Issue(heading.line, heading.title, "not in the template", "warning")
+            )
+        elif key not in found:
+            found[key] = heading
+
+    for name in kind.sections:
+        if name.lower() not in found:
+            issues.append(Issue(0, name, "missing"))
+
+    previous = None
+    for heading in sorted(found.values(), key=lambda h: h.line):
+        position = expected[heading.title.lower()]
+        if previous is not None and position < expected[previous.title.lower()]:
+            issues.append(
+                Issue(
+                    heading.line,
+                    heading.title,
+                    f"should come before {previous.title!r}",
+                )
+            )
+        else:
+            previous = heading
+
+    for name in kind.sections:
+        heading = found.get(name.lower())
+        if heading is None:
+            continue
+        text = document.text_under(heading)
+        placeholder = template_text(kind, name)
+        lines = [line.strip() for line in text.splitlines()]
+        if placeholder in lines or (len(placeholder) > 40 and placeholder in text):
+            issues.append(
+                Issue(heading.line, heading.title, "still has the template text")
+            )
+
+    issues.sort(key=lambda i: i.line)
+    return issues
+
+
+def _check_file(job: tuple[Path, SpecKind]) -> tuple[str, list[Issue]]:
+    path, kind = job
+    text = path.read_text()
+    return hashlib.sha256(text.encode()).hexdigest(), check(
+        SpecDocument.parse(text), kind
+    )
+
+
+def rules_hash(lang: Language) -> str:
+    kinds = [asdict(kind) for kind in lang.spec_kinds]
+    helps = {
+        name: template_text(kind, name)
+        for kind in lang.spec_kinds
+        for name in kind.sections
+    }
+    data = json.dumps([kinds, helps], sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def run(
+    lang: Language,
+    workers: int | None = None,
+    cache_path: Path | None = CACHE_PATH,
+) -> dict[str, list[Issue]]:
+    """Issues per spec (relative to SPEC_DIR), checking only changed files."""
+    rules = rules_hash(lang)
+    cached = {}
+    if cache_path is not None and cache_path.exists():
+        try:
+            data = json.loads(cache_path.read_text())
+            if data.get("version") == CACHE_VERSION and data.get("rules") == rules:
+                cached = data["files"]
+        except ValueError:
+            pass
+
+    kinds = {kind.id.lower(): kind for kind in lang.spec_kinds}
+    files, jobs = {}, []
+    for path in lang.spec_paths():
+        key = path.relative_to(SPEC_DIR).as_posix()
+        entry = cached.get(key)
+        if entry is not None:
+            sha256 = hashlib.sha256(path.read_bytes()).hexdigest()
+            if entry["sha256"] == sha256:
+                files[key] = entry
+                continue
+        jobs.append((key, path, kinds[path.parent.name]))
+
+    work = [(path, kind) for _, path, kind in jobs]
+    if workers == 1 or len(work) < 2:
+        results = list(map(_check_file, work))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_check_file, work))
+    for (key, _, _), (sha256, issues) in zip(jobs, results):
+        files[key] = {"sha256": sha256, "issues": [asdict(i) for i in issues]}
+
+    if cache_path is not None and files != cached:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": CACHE_VERSION, "rules": rules, "files": files}
+        cache_path.write_text(json.dumps(data))
+    return {key: [Issue(**i) for i in files[key]["issues"]] for key in sorted(files)}
@@ -1,6 +1,23 @@
+import json
+import time
+from dataclasses import asdict
+from datetime import date
+from pathlib import Path
+
 import typer
+from yaml import safe_load as load_yaml
 
-from auto.types import ROOT, SPEC_DIR, Language, Spec
+from auto import conformance
+from auto import error_codes as err_catalog
+from auto import links as link_index
+from auto import navigation
+from auto import query as spec_query
+from auto import refactor as corpus_refactor
+from auto import search
+from auto import similar as spec_similarity
+from auto import transition as spec_transition
+from auto.shard import Shard, ShardReport, load_costs, merge, select, store_costs
+from auto.types import ROOT, SPEC_DIR, Language, Spec, SpecStatus, SpecUpdate
 
 app = typer.Typer(
     name="doc-manager",
@@ -13,6 +30,17 @@ TEMPLATES = {
     "ad": TEMPLATE_PATH / "ad.md",
 }
 
+# recorded seconds per item of the sharded commands, see auto/shard.py
+SHARD_COSTS = Path(".cache/doc-manager/shard-costs.json")
+SHARD_DIR = Path(".cache/doc-manager/shards")
+
+
+def parse_shard(value: str) -> Shard:
+    try:
+        return Shard.parse(value)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
 
 @app.command()
 def spec_guide():
@@ -62,11 +90,7 @@ def new_spec(
     path.write_text(out)
 
 
-@app.command()
-def collect_specs():
-    lang = Language.get()
-    specs = lang.specs()
-
+def write_summary(lang: Language, specs: list[Spec]):
     summary = "---\ntitle: Specifications\n---\n\n"
     by_category: dict[str, list[Spec]] = {}
     for spec in specs:
@@ -87,5 +111,318 @@ def collect_specs():
     print(f"Wrote spec summary to {summary_path}")
 
 
+def write_navigation(lang: Language, specs: list[Spec]):
+    if navigation.write(navigation.build(lang, specs)):
+        print(f"Wrote spec navigation to {navigation.NAV_PATH}")
+
+
+@app.command()
+def collect_specs(
+    shard: Shard = typer.Option(
+        None,
+        parser=parse_shard,
+        help="Only parse shard i/n of the specs (e.g. 2/4), see merge-shards",
+    ),
+    shard_dir: Path = typer.Option(SHARD_DIR, help="Directory for shard reports"),
+):
+    lang = Language.get()
+    if shard is None:
+        specs = lang.specs()
+        write_summary(lang, specs)
+        write_navigation(lang, specs)
+        return
+
+    paths = [p.relative_to(SPEC_DIR).as_posix() for p in lang.spec_paths()]
+    report = ShardReport.new("collect-specs", shard, paths)
+    for path in select(paths, shard, load_costs(SHARD_COSTS)):
+        start = time.perf_counter()
+        spec = Spec.from_markdown_head((SPEC_DIR / path).read_text())
+        report.data[path] = asdict(spec)
+        report.costs[path] = time.perf_counter() - start
+    out = report.write(shard_dir)
+    print(f"Collected {len(report.costs)} of {len(paths)} specs into {out}")
+
+
+@app.command()
+def merge_shards(
+    shard_dir: Path = typer.Option(SHARD_DIR, help="Directory for shard reports"),
+):
+    """Write the spec summary from the reports of a sharded collect-specs run."""
+    try:
+        merged = merge(ShardReport.load_all(shard_dir, "collect-specs"))
+    except ValueError as e:
+        print(e)
+        raise typer.Exit(code=1)
+
+    lang = Language.get()
+    kinds = [kind.id for kind in lang.spec_kinds]
+    specs = Spec.read_many(list(merged.data.values()))
+    specs.sort(key=lambda spec: (kinds.index(spec.kind), spec.number))
+    write_summary(lang, specs)
+    write_navigation(lang, specs)
+    store_costs(SHARD_COSTS, merged.costs)
+
+
+@app.command()
+def search_index(
+    full: bool = typer.Option(False, help="Re-tokenize every file, ignoring the cache"),
+):
+    """Write the prebuilt search index under public/search."""
+    result = search.build(cache_path=None if full else search.CACHE_PATH)
+    print(
+        f"Indexed {result.documents} documents ({result.reindexed} re-tokenized), "
+        f"{result.terms} terms; wrote {len(result.written)} files, "
+        f"removed {len(result.removed)}"
+    )
+
+
+@app.command()
+def query(
+    expression: list[str] = typer.Argument(
+        None, help='Filter such as "kind=SPEC status=draft version=0.1.0"'
+    ),
+    json_output: bool = typer.Option(
+        False, "--json", help="Print the matching specs as JSON"
+    ),
+):
+    """List the specs matching a filter (see auto/query.py for the syntax)."""
+    index = spec_query.SpecIndex.build(spec_query.load_specs(Language.get()))
+    try:
+        specs = index.query(" ".join(expression or []))
+    except spec_query.QueryError as e:
+        raise typer.BadParameter(str(e), param_hint="expression")
+    if json_output:
+        print(json.dumps(Spec.dump_many(specs), indent=2, default=str))
+    else:
+        print(spec_query.table(specs))
+
+
+@app.command()
+def error_codes(
+    workers: int = typer.Option(None, help="Worker processes (default: CPU count)"),
+    force: bool = typer.Option(
+        False, help="Rebuild even if the ERR specs are unchanged"
+    ),
+):
+    """Write the error-code catalog from the ERR specs."""
+    paths = err_catalog.err_specs()
+    sha256 = err_catalog.source_hash(paths)
+    path = err_catalog.CATALOG_PATH
+    if not force and err_catalog.is_current(path, sha256):
+        print(f"Unchanged {path}")
+        return
+
+    catalog = err_catalog.build(paths, workers)
+    for warning in catalog.warnings:
+        print(f"warning: {warning}")
+    if catalog.conflicts:
+        print("\nConflicting error codes:")
+        for conflict in catalog.conflicts:
+            print(f"- {conflict}")
+        raise typer.Exit(code=1)
+    err_catalog.write(path, err_catalog.catalog_data(catalog, sha256))
+    print(f"Wrote {len(catalog.codes)} error codes from {len(paths)} specs to {path}")
+
+
+@app.command()
+def links(
+    json_output: bool = typer.Option(
+        False, "--json", help="Print the cross-reference graph and problems as JSON"
+    ),
+):
+    """Check links and spec mentions across src/content."""
+    report = link_index.check(link_index.load())
+    if json_output:
+        print(
+            json.dumps(
+                {
+                    "graph": {k: sorted(v) for k, v in report.graph.items()},
+                    "broken": [asdict(p) for p in report.broken],
+                    "placeholders": [asdict(p) for p in report.placeholders],
+                    "orphans": report.orphans,
+                },
+                indent=2,
+            )
+        )
+    else:
+        edges = sum(len(targets) for targets in report.graph.values())
+        print(f"{len(report.graph)} files, {edges} cross-references")
+        for title, problems in (
+            ("Broken links", report.broken),
+            ("Unresolved placeholders", report.placeholders),
+        ):
+            if problems:
+                print(f"\n{title}:")
+                for p in problems:
+                    print(f"- {p.source}:{p.line}: {p.target} ({p.reason})")
+        if report.orphans:
+            print("\nSpecs no other page references:")
+            for spec in report.orphans:
+                print(f"- {spec}")
+    if report.broken:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def refactor(
+    mapping: list[str] = typer.Argument(
+        None, help="OLD=NEW pairs, e.g. RFC-0019=RFC-0032 or parser=syntax"
+    ),
+    mappings: Path = typer.Option(
+        None, help="YAML file mapping old spec or component ids to new ones"
+    ),
+    dry_run: bool = typer.Option(
+        False, help="Print the diff instead of writing the changes"
+    ),
+):
+    """Rename specs and components everywhere they are referenced."""
+    pairs: dict[str, str] = {}
+    if mappings is not None:
+        data = load_yaml(mappings.read_text())
+        if not isinstance(data, dict):
+            raise typer.BadParameter("expected a mapping", param_hint="--mappings")
+        pairs.update({str(k): str(v) for k, v in data.items()})
+    for item in mapping or []:
+        old, sep, new = item.partition("=")
+        if not sep or not old or not new:
+            raise typer.BadParameter(f"expected OLD=NEW, got {item!r}")
+        pairs[old] = new
+    if not pairs:
+        raise typer.BadParameter("no mappings given")
+
+    lang = Language.get()
+    try:
+        resolved = corpus_refactor.resolve(
+            pairs,
+            specs={p.stem for p in lang.spec_paths()},
+            kinds={kind.id for kind in lang.spec_kinds},
+            components={c.id for c in lang.components},
+        )
+    except corpus_refactor.RefactorError as e:
+        raise typer.BadParameter(str(e))
+
+    plan = corpus_refactor.plan(resolved)
+    summary = (
+        f"{plan.replacements} replacements in {len(plan.edits)} files, "
+        f"{len(plan.moves)} specs moved"
+    )
+    if dry_run:
+        print(corpus_refactor.diff(plan), end="")
+        print(f"Would make {summary}")
+        return
+    corpus_refactor.apply(plan)
+    print(f"Made {summary}")
+    if plan.edits:
+        print("Run collect-specs and spec-guide to refresh the generated files")
+
+
+@app.command()
+def transition(
+    status: SpecStatus = typer.Argument(help="Status to move the specs to"),
+    spec_ids: list[str] = typer.Argument(None, help="Spec ids such as RFC-0019"),
+    where: str = typer.Option(
+        None, "--query", help='Also select the specs matching a query, e.g. "kind=RFC"'
+    ),
+    author: str = typer.Option(help="Author of the update (github username)"),
+    description: str = typer.Option(
+        None, help='Update description (default: "Status changed to <status>")'
+    ),
+    dry_run: bool = typer.Option(False, help="Only check and list the transitions"),
+    workers: int = typer.Option(None, help="Worker threads (default: automatic)"),
+):
+    """Move specs to a new status, recording it in their updates."""
+    lang = Language.get()
+    paths = {p.stem: p for p in lang.spec_paths()}
+    selected: dict[str, Path] = {}
+    for spec_id in spec_ids or []:
+        if spec_id.upper() not in paths:
+            raise typer.BadParameter(f"Unknown spec {spec_id}", param_hint="spec_ids")
+        selected[spec_id.upper()] = paths[spec_id.upper()]
+    if where is not None:
+        index = spec_query.SpecIndex.build(spec_query.load_specs(lang))
+        try:
+            for spec in index.query(where):
+                selected[spec.qualified_id()] = paths[spec.qualified_id()]
+        except spec_query.QueryError as e:
+            raise typer.BadParameter(str(e), param_hint="--query")
+    if not selected:
+        raise typer.BadParameter("no specs selected")
+
+    update = SpecUpdate(
+        author=author,
+        date=date.today(),
+        description=description or f"Status changed to {status.value}",
+    )
+    changes = spec_transition.run(
+        list(selected.values()), status, update, dry_run=dry_run, workers=workers
+    )
+    errors = [c for c in changes if c.error]
+    for change in changes:
+        if change.error:
+            print(f"- {change.spec}: {change.error}")
+        elif change.skipped:
+            print(f"- {change.spec}: already {status.value}")
+        else:
+            print(f"- {change.spec}: {change.old.value} -> {status.value}")
+    if errors:
+        print(f"\n{len(errors)} invalid transitions, no spec was changed")
+        raise typer.Exit(code=1)
+    moved = sum(1 for c in changes if not c.skipped)
+    print(f"{'Would move' if dry_run else 'Moved'} {moved} specs to {status.value}")
+
+
+@app.command()
+def check_sections(
+    workers: int = typer.Option(None, help="Worker processes (default: CPU count)"),
+    warnings: bool = typer.Option(
+        False, help="Also list sections the kind's template does not have"
+    ),
+    json_output: bool = typer.Option(
+        False, "--json", help="Print the issues of every spec as JSON"
+    ),
+):
+    """Check the sections of every spec against its kind's template."""
+    results = conformance.run(Language.get(), workers)
+    errors = sum(i.severity == "error" for issues in results.values() for i in issues)
+    if json_output:
+        data = {k: [asdict(i) for i in v] for k, v in results.items() if v}
+        print(json.dumps(data, indent=2))
+    else:
+        for spec, issues in results.items():
+            shown = [i for i in issues if warnings or i.severity == "error"]
+            if not shown:
+                continue
+            print(f"\n{spec}:")
+            for issue in shown:
+                where = f":{issue.line}" if issue.line else ""
+                print(f"- {issue.section}{where}: {issue.problem}")
+        print(f"\n{errors} problems in {len(results)} specs")
+    if errors:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def similar(
+    threshold: float = typer.Option(
+        0.5, min=0.01, max=1.0, help="Minimum estimated Jaccard similarity"
+    ),
+    json_output: bool = typer.Option(
+        False, "--json", help="Print the similar pairs as JSON"
+    ),
+):
+    """List pairs of specs whose text is nearly the same."""
+    signatures, computed = spec_similarity.load(Language.get())
+    pairs = spec_similarity.similar(signatures, threshold)
+    if json_output:
+        print(json.dumps([asdict(p) for p in pairs], indent=2))
+        return
+    for pair in pairs:
+        print(f"{pair.similarity:.2f}  {pair.first}  {pair.second}")
+    print(
+        f"{len(pairs)} pairs at {threshold:.2f} or above among {len(signatures)} "
+        f"specs ({computed} signatures computed)"
+    )
+
+
 if __name__ == "__main__":
     app()
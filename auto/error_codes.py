@@ -0,0 +1,222 @@
+"""
+Error-code catalog extracted from the ERR specs.
+
+Each ERR spec defines its codes twice: a row in the ``## Domain Summary``
+table (code, name, severity, category) and a ``### CODE: Name`` section
+with ``**Severity:**``, ``**Phase:**`` and a ``**Message:**`` block. Every
+spec is parsed in a worker process; the definitions are then merged into one
+catalog keyed by code and checked for:
+
+- codes defined by more than one spec
+- a summary row and a section disagreeing on name or severity
+- codes only present in the summary table or only as a section (specs
+  without a summary table only have sections)
+
+The catalog is written to ``src/assets/error-codes.json`` as one compact
+object keyed by code, for O(1) lookups from the site and compiler tooling.
+It records the hash of the specs it was built from, so an unchanged corpus
+is not parsed again.
+"""
+
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from auto.search import slug
+from auto.types import DOCS_ROOT, SPEC_DIR, SpecDocument
+
+CATALOG_PATH = DOCS_ROOT / "src" / "assets" / "error-codes.json"
+# bump when the parsing changes, so the source hash no longer matches
+FORMAT_VERSION = 2
+
+# title of a ### heading
+_HEADING = re.compile(r"^`?(?P<code>[A-Z]+\d{4})`?\s*:\s*(?P<name>.+?)$")
+_FIELD = re.compile(r"^\*\*(?P<key>[A-Za-z ]+):\*\*\s*(?P<value>.*?)\s*$")
+_CODE = re.compile(r"^[A-Z]+\d{4}$")
+
+
+@dataclass
+class ErrorCode:
+    code: str
+    name: str
+    spec: str
+    anchor: str = ""
+    severity: str = ""
+    category: str = ""
+    phase: str = ""
+    message: str = ""
+    line: int = 0
+
+
+@dataclass
+class ParsedSpec:
+    spec: str
+    path: str
+    # code -> definition, from the ### sections
+    sections: dict[str, ErrorCode] = field(default_factory=dict)
+    # code -> (name, severity, category, line), from the summary table
+    summary: dict[str, tuple[str, str, str, int]] = field(default_factory=dict)
+    problems: list[str] = field(default_factory=list)
+
+
+def _cell(text: str) -> str:
+    return text.strip("`").strip()
+
+
+def parse(path: Path) -> ParsedSpec:
+    """Every code one ERR spec defines."""
+    document = SpecDocument.read(path)
+    parsed = ParsedSpec(spec=path.stem, path=str(path))
+
+    for heading in document.headings:
+        if heading.level != 2 or heading.title.lower() != "domain summary":
+            continue
+        for table in document.tables:
+            if not heading.line < table.line < heading.end:
+                continue
+            columns = [_cell(c).lower() for c in table.header]
+            for number, cells in enumerate(table.rows, start=table.line + 2):
+                row = dict(zip(columns, map(_cell, cells)))
+                code = row.get("code", "")
+                if not _CODE.match(code):
+                    continue
+                if code in parsed.summary:
+                    parsed.problems.append(
+                        f"{path}:{number}: {code} listed twice in the summary"
+                    )
+                parsed.summary[code] = (
+                    row.get("name", ""),
+                    row.get("severity", ""),
+                    row.get("category", ""),
+                    number,
+                )
+
+    blocks = {block.line: block for block in document.code_blocks}
+    for heading in document.headings:
+        if heading.level != 3 or not (m := _HEADING.match(heading.title)):
+            continue
+        code = m.group("code")
+        if code in parsed.sections:
+            parsed.problems.append(f"{path}:{heading.line}: {code} defined twice")
+        current = parsed.sections[code] = ErrorCode(
+            code=code,
+            name=m.group("name"),
+            spec=parsed.spec,
+            anchor=slug(heading.title.replace("`", "")),
+            line=heading.line,
+        )
+        # the message is the first code block after its field
+        awaiting_message = False
+        for number in range(heading.line + 1, heading.end):
+            if (block := blocks.get(number)) is not None and awaiting_message:
+                current.message = block.code.strip()
+                awaiting_message = False
+            if document.fenced[number - 1]:
+                continue
+            if m := _FIELD.match(document.lines[number - 1]):
+                key, value = m.group("key").lower(), m.group("value")
+                if key in ("severity", "phase"):
+                    setattr(current, key, value)
+                awaiting_message = key == "message"
+    return parsed
+
+
+@dataclass
+class Catalog:
+    codes: dict[str, ErrorCode] = field(default_factory=dict)
+    # definitions disagreeing with each other
+    conflicts: list[str] = field(default_factory=list)
+    # incomplete definitions (summary row or section missing)
+    warnings: list[str] = field(default_factory=list)
+
+
+def merge(specs: list[ParsedSpec]) -> Catalog:
+    catalog = Catalog()
+    for parsed in specs:
+        catalog.conflicts.extend(parsed.problems)
+        for code in sorted(parsed.summary.keys() | parsed.sections.keys()):
+            section = parsed.sections.get(code)
+            row = parsed.summary.get(code)
+            if section is None:
+                name, severity, category, line = row
+                catalog.warnings.append(
+                    f"{parsed.path}:{line}: {code} has no '### {code}' section"
+                )
+                section = ErrorCode(
+                    code, name, parsed.spec, severity=severity, line=line
+                )
+            elif row is None:
+                if parsed.summary:
+                    catalog.warnings.append(
+                        f"{parsed.path}:{section.line}: {code} is missing from "
+                        "the Domain Summary"
+                    )
+            else:
+                name, severity, category, _ = row
+                if name != section.name:
+                    catalog.conflicts.append(
+                        f"{parsed.path}:{section.line}: {code} is named "
+                        f"{section.name!r} but {name!r} in the summary"
+                    )
+                if severity and section.severity and severity != section.severity:
+                    catalog.conflicts.append(
+                        f"{parsed.path}:{section.line}: {code} has severity "
+                        f"{section.severity!r} but {severity!r} in the summary"
+                    )
+                section.severity = section.severity or severity
+            if row is not None:
+                section.category = row[2]
+
+            if (existing := catalog.codes.get(code)) is not None:
+                catalog.conflicts.append(
+                    f"{parsed.path}:{section.line}: {code} ({section.name}) is "
+                    f"already defined by {existing.spec} ({existing.name})"
+                )
+                continue
+            catalog.codes[code] = section
+    catalog.codes = dict(sorted(catalog.codes.items()))
+    return catalog
+
+
+def err_specs() -> list[Path]:
+    return sorted(SPEC_DIR.glob("err/ERR-*.md"))
+
+
+def source_hash(paths: list[Path]) -> str:
+    digest = hashlib.sha256(f"{FORMAT_VERSION}".encode())
+    for path in paths:
+        digest.update(path.name.encode() + b"\0" + path.read_bytes() + b"\0")
+    return digest.hexdigest()
+
+
+def build(paths: list[Path], workers: int | None = None) -> Catalog:
+    if workers == 1:
+        return merge([parse(p) for p in paths])
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return merge(list(pool.map(parse, paths)))
+
+
+def catalog_data(catalog: Catalog, sha256: str) -> dict:
+    codes = {}
+    for code, entry in catalog.codes.items():
+        data = asdict(entry)
+        del data["code"], data["line"]
+        codes[code] = {k: v for k, v in data.items() if v}
+    return {"source_sha256": sha256, "codes": codes}
+
+
+def is_current(path: Path, sha256: str) -> bool:
+    try:
+        return json.loads(path.read_text()).get("source_sha256") == sha256
+    except (OSError, ValueError):
+        return False
+
+
+def write(path: Path, data: dict):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, separators=(",", ":"), sort_keys=True) + "\n")
+    os.replace(tmp, path)
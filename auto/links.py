@@ -0,0 +1,242 @@
+"""
+Cross-reference graph of ``src/content`` and a broken-link checker.
+
+Every content file is read once as a ``SpecDocument``, collecting its
+headings, markdown links and plain ``KIND-NNNN`` mentions (fenced code and
+inline code are skipped). Targets are then resolved against the spec index and the docs
+tree:
+
+- ``/specs/rfc/RFC-0019``, ``/specs/rfc/rfc-0019#anchor`` (ids are case
+  insensitive, like the site routes)
+- ``../rfc/RFC-0019.md``, ``../../assets/image.png`` and other paths
+  relative to the file
+- ``/types/union``, ``../union`` and other docs routes
+- files under ``public/``
+
+External URLs and the generated ``diagrams/`` images (checked by
+``python -m gen_diagrams refs``) are not resolved. The report lists broken
+links and anchors, template placeholders such as ``RFC-000n`` and specs no
+other page links to or mentions (the generated spec summary does not count).
+
+What each file contains is cached per content hash under
+``.cache/doc-manager``, so only changed files are read again; resolution is
+recomputed every run since it depends on the whole tree.
+"""
+
+import hashlib
+import json
+import posixpath
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from urllib.parse import urljoin
+
+from auto.search import CONTENT_DIR, content_files, slug, url_for
+from auto.types import DOCS_ROOT, SpecDocument
+
+CACHE_PATH = Path(".cache/doc-manager/links.json")
+CACHE_VERSION = 2
+PUBLIC_DIR = DOCS_ROOT / "public"
+# generated, links every spec
+SUMMARY = "docs/summary.md"
+
+_LINK = re.compile(
+    r"""
+    !?\[(?P<text>(?:[^\[\]]|\[[^\]]*\])*)\]
+    \(\s*<?(?P<target>[^)\s>]*)>?[^)]*\)
+    """,
+    re.X,
+)
+_INLINE_CODE = re.compile(r"`[^`]*`")
+_MENTION = re.compile(
+    r"(?<![\w/.-])(?P<kind>[A-Z]{2,5})-(?P<number>[0-9]{3}[0-9a-z])\b"
+)
+_SPEC_ROUTE = re.compile(r"^/specs/(?P<kind>[a-z]+)/(?P<id>[a-z]+-[0-9a-z]{4})$")
+_SPEC_ID = re.compile(r"(?P<kind>[A-Za-z]+)-(?P<number>[0-9]{3}[0-9a-z])")
+
+
+@dataclass
+class Reference:
+    line: int
+    target: str
+    # "link" or "mention"
+    via: str = "link"
+
+
+@dataclass
+class FileLinks:
+    sha256: str
+    anchors: list[str] = field(default_factory=list)
+    references: list[Reference] = field(default_factory=list)
+
+
+def extract(md: str) -> FileLinks:
+    document = SpecDocument.parse(md)
+    found = FileLinks(sha256=document.sha256)
+    for heading in document.headings:
+        title = _LINK.sub(r"\g<text>", heading.title).replace("`", "")
+        found.anchors.append(slug(title))
+    for number, line in enumerate(document.lines, start=1):
+        if document.fenced[number - 1]:
+            continue
+        text = _INLINE_CODE.sub("", line)
+        for m in _LINK.finditer(text):
+            found.references.append(Reference(number, m.group("target")))
+        for m in _MENTION.finditer(_LINK.sub("", text)):
+            found.references.append(Reference(number, m.group(0), "mention"))
+    return found
+
+
+def load(root: Path = CONTENT_DIR, cache_path: Path | None = CACHE_PATH):
+    """Extracted links of every content file, reading only changed files."""
+    cached = {}
+    if cache_path is not None and cache_path.exists():
+        try:
+            data = json.loads(cache_path.read_text())
+            if data.get("version") == CACHE_VERSION:
+                cached = data["files"]
+        except ValueError:
+            pass
+
+    files: dict[str, FileLinks] = {}
+    for relative in content_files(root):
+        md = (root / relative).read_text()
+        key = relative.as_posix()
+        entry = cached.get(key)
+        if (
+            entry is not None
+            and entry["sha256"] == hashlib.sha256(md.encode()).hexdigest()
+        ):
+            refs = [Reference(**r) for r in entry["references"]]
+            files[key] = FileLinks(entry["sha256"], entry["anchors"], refs)
+        else:
+            files[key] = extract(md)
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {k: asdict(v) for k, v in files.items()}
+        cache_path.write_text(json.dumps({"version": CACHE_VERSION, "files": data}))
+    return files
+
+
+@dataclass
+class Problem:
+    source: str
+    line: int
+    target: str
+    reason: str
+
+
+@dataclass
+class LinkReport:
+    # content file -> content files it links to or mentions
+    graph: dict[str, set[str]] = field(default_factory=dict)
+    broken: list[Problem] = field(default_factory=list)
+    placeholders: list[Problem] = field(default_factory=list)
+    orphans: list[str] = field(default_factory=list)
+
+
+class Resolver:
+    def __init__(self, files: dict[str, FileLinks], root: Path = CONTENT_DIR):
+        self.files = files
+        self.root = root
+        self.routes: dict[str, str] = {}
+        self.specs: dict[str, str] = {}
+        self.kinds: set[str] = set()
+        self.pages: set[str] = {"/specs"}
+        for key in files:
+            path = Path(key)
+            if path.parts[0] == "specs" and len(path.parts) == 3:
+                self.specs[path.stem.upper()] = key
+                self.kinds.add(path.stem.split("-")[0].upper())
+                self.pages.add(f"/specs/{path.parts[1]}")
+            self.routes[url_for(path).rstrip("/").lower() or "/"] = key
+
+    def spec_id(self, mention: str) -> str | None:
+        return self.specs.get(mention.upper())
+
+    def resolve(self, source: str, target: str) -> tuple[str | None, str | None]:
+        """(content file, anchor) of ``target``; file is "" for non-content."""
+        path, _, anchor = target.partition("#")
+        path = path.split("?")[0]
+        if not path:
+            return source, anchor or None
+        if path.startswith("/"):
+            route = path
+        elif path.endswith((".md", ".mdx")):
+            resolved = posixpath.normpath(
+                posixpath.join(posixpath.dirname(source), path)
+            )
+            return (resolved if resolved in self.files else None), anchor or None
+        elif posixpath.splitext(path)[1]:
+            # images and other assets next to the page
+            asset = (self.root / source).parent / path
+            return ("" if asset.is_file() else None), None
+        else:
+            # relative route, resolved like the browser does from the page URL
+            route = urljoin(url_for(Path(source)), path)
+
+        route = route.rstrip("/").lower() or "/"
+        if route.endswith((".md", ".mdx")):
+            route = route.rsplit(".", 1)[0]
+        if m := _SPEC_ROUTE.match(route):
+            return self.spec_id(m.group("id")), anchor or None
+        if route in self.routes:
+            return self.routes[route], anchor or None
+        if route in self.pages or (PUBLIC_DIR / route.lstrip("/")).is_file():
+            return "", None
+        return None, None
+
+
+def skipped(target: str) -> bool:
+    return (
+        "://" in target
+        or target.startswith(("mailto:", "data:"))
+        or "/diagrams/" in f"/{target}"
+    )
+
+
+def placeholder(target: str) -> bool:
+    """Whether ``target`` is a template id such as ``RFC-000n``."""
+    stem = target.split("#")[0].rstrip("/").rsplit("/", 1)[-1]
+    m = _SPEC_ID.fullmatch(stem.removesuffix(".md"))
+    return m is not None and not m.group("number").isdigit()
+
+
+def check(files: dict[str, FileLinks], root: Path = CONTENT_DIR) -> LinkReport:
+    resolver = Resolver(files, root)
+    report = LinkReport(graph={key: set() for key in files})
+    inbound: dict[str, set[str]] = {key: set() for key in resolver.specs.values()}
+
+    for source, found in files.items():
+        for ref in found.references:
+            if ref.via == "mention" and ref.target.split("-")[0] not in resolver.kinds:
+                continue
+            if ref.via == "link" and skipped(ref.target):
+                continue
+            if placeholder(ref.target):
+                report.placeholders.append(
+                    Problem(source, ref.line, ref.target, "placeholder")
+                )
+                continue
+
+            if ref.via == "mention":
+                target, anchor = resolver.spec_id(ref.target), None
+            else:
+                target, anchor = resolver.resolve(source, ref.target)
+            if target is None:
+                reason = "unknown spec" if ref.via == "mention" else "missing target"
+                report.broken.append(Problem(source, ref.line, ref.target, reason))
+                continue
+            if anchor and target and anchor.lower() not in files[target].anchors:
+                report.broken.append(
+                    Problem(source, ref.line, ref.target, "missing anchor")
+                )
+
+            if target and target != source:
+                report.graph[source].add(target)
+                if target in inbound and source != SUMMARY:
+                    inbound[target].add(source)
+
+    report.orphans = sorted(spec for spec, sources in inbound.items() if not sources)
+    return report
@@ -0,0 +1,85 @@
+"""
+Precomputed navigation over the specs, written by ``collect-specs``.
+
+``src/assets/spec-nav.json`` holds everything the spec pages would otherwise
+regroup from the whole collection on every render:
+
+- ``categories``: category -> kinds -> spec ids, in ``spec-kinds.yaml`` order
+- ``specs``: spec id -> title, status, route and ``prev``/``next`` ids, in
+  the order of the spec summary (kind order, then number)
+- ``components``: component id -> spec ids (every known component, even
+  without specs)
+- ``statuses``: status -> spec ids
+
+Spec ids are the only references between sections, so every lookup is one
+key access.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from auto.types import DOCS_ROOT, Language, Spec, SpecStatus
+
+NAV_PATH = DOCS_ROOT / "src" / "assets" / "spec-nav.json"
+
+
+def build(lang: Language, specs: list[Spec]) -> dict:
+    """Navigation data of ``specs``, which must be in summary order."""
+    ids = [spec.qualified_id() for spec in specs]
+    by_kind: dict[str, list[str]] = {kind.id: [] for kind in lang.spec_kinds}
+    components: dict[str, list[str]] = {c.id: [] for c in lang.components}
+    statuses: dict[str, list[str]] = {status.value: [] for status in SpecStatus}
+    entries = {}
+
+    for i, (spec_id, spec) in enumerate(zip(ids, specs)):
+        status = SpecStatus(spec.status).value
+        by_kind.setdefault(spec.kind, []).append(spec_id)
+        statuses.setdefault(status, []).append(spec_id)
+        for component in spec.components:
+            components.setdefault(component, []).append(spec_id)
+        entries[spec_id] = {
+            "kind": spec.kind,
+            "number": spec.number,
+            "title": spec.title,
+            "status": status,
+            "route": spec.url_for(),
+            "components": list(spec.components),
+            "prev": ids[i - 1] if i > 0 else None,
+            "next": ids[i + 1] if i + 1 < len(ids) else None,
+        }
+
+    categories = []
+    for category in lang.spec_categories:
+        kinds = [
+            {
+                "id": kind.id,
+                "name": kind.name,
+                "route": f"/specs/{kind.id.lower()}",
+                "specs": by_kind[kind.id],
+            }
+            for kind in lang.spec_kinds
+            if kind.category == category.id
+        ]
+        categories.append({"id": category.id, "name": category.name, "kinds": kinds})
+
+    return {
+        "categories": categories,
+        "specs": entries,
+        "components": components,
+        "statuses": statuses,
+    }
+
+
+def write(data: dict, path: Path = NAV_PATH) -> bool:
+    """Write ``data`` unless ``path`` already holds it; whether it was written."""
+    out = json.dumps(data, separators=(",", ":")) + "\n"
+    try:
+        if path.read_text() == out:
+            return False
+    except OSError:
+        pass
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(out)
+    os.replace(tmp, path)
+    return True
@@ -0,0 +1,347 @@
+"""
+Spec queries over per-value bitmap indexes.
+
+A query is a boolean expression over spec fields::
+
+    kind=SPEC status=draft,proposed components=compiler version=0.1.0
+    (status=draft or status=proposed) and not author=octocat
+    created>=2025-11-01 and updated<2026-01-01
+
+Comparisons are ``field op value`` with ``=`` (or ``:``), ``!=``, ``<``,
+``<=``, ``>`` and ``>=``; a comma separated value matches any of its items.
+Terms next to each other are combined with ``and``. ``version=V`` matches
+the specs in effect at ``V`` (``version_after <= V < version_before``).
+
+Every field value maps to a bitmap (a Python int, one bit per spec). Ordered
+fields also keep cumulative bitmaps over their sorted values, so any range
+is one ``&`` of two precomputed bitmaps and no query scans the specs.
+
+The parsed specs are cached under ``.cache/doc-manager`` and only re-read
+when a spec file changes.
+"""
+
+import json
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from auto.types import SPEC_DIR, Language, Spec
+
+CACHE_PATH = Path(".cache/doc-manager/spec-index.json")
+CACHE_VERSION = 1
+
+
+class QueryError(ValueError):
+    pass
+
+
+def version_key(value: str) -> tuple:
+    """Semver precedence: 0.1.0-alpha < 0.1.0-alpha.1 < 0.1.0-beta < 0.1.0.
+
+    Build metadata (``+...``) is ignored.
+    """
+    version = value.partition("+")[0]
+    core, pre_release, pre = version.partition("-")
+
+    def parts(text: str) -> tuple:
+        # numeric identifiers sort before textual ones
+        return tuple(
+            (0, int(p), "") if p.isdigit() else (1, 0, p) for p in text.split(".")
+        )
+
+    # a pre-release comes before its release
+    return parts(core), (0, parts(pre)) if pre_release else (1, ())
+
+
+def date_key(value: str) -> str:
+    # ISO dates sort lexicographically
+    return value
+
+
+def load_specs(lang: Language, cache_path: Path | None = CACHE_PATH) -> list[Spec]:
+    """Every spec, re-parsing only the files changed since the cached run."""
+    cached = {}
+    if cache_path is not None and cache_path.exists():
+        try:
+            data = json.loads(cache_path.read_text())
+            if data.get("version") == CACHE_VERSION:
+                cached = data["files"]
+        except ValueError:
+            pass
+
+    files, specs = {}, []
+    for path in lang.spec_paths():
+        stat = path.stat()
+        key = path.relative_to(SPEC_DIR).as_posix()
+        entry = cached.get(key)
+        if entry is None or entry["stat"] != [stat.st_mtime_ns, stat.st_size]:
+            spec = Spec.from_markdown_head(path.read_text())
+            entry = {
+                "stat": [stat.st_mtime_ns, stat.st_size],
+                "spec": json.loads(json.dumps(asdict(spec), default=str)),
+            }
+        files[key] = entry
+        specs.append(Spec.load_from_dict(entry["spec"]))
+
+    if cache_path is not None and files != cached:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps({"version": CACHE_VERSION, "files": files}))
+    kinds = [kind.id for kind in lang.spec_kinds]
+    specs.sort(key=lambda s: (kinds.index(s.kind), s.number))
+    return specs
+
+
+class ValueIndex:
+    """Value -> bitmap of the specs holding it."""
+
+    def __init__(self):
+        self.bitmaps: dict[str, int] = {}
+
+    def add(self, value: str, bit: int):
+        self.bitmaps[value] = self.bitmaps.get(value, 0) | bit
+
+    def equal(self, value: str) -> int:
+        return self.bitmaps.get(value, 0)
+
+
+class OrderedIndex(ValueIndex):
+    """A :class:`ValueIndex` that also answers range comparisons."""
+
+    def __init__(self, key: Callable[[str], object]):
+        super().__init__()
+        self.key = key
+        self._keys: list | None = None
+        # _below[i] = specs holding any of the first i sorted values
+        self._below: list[int] = []
+
+    def add(self, value: str, bit: int):
+        super().add(value, bit)
+        self._keys = None
+
+    def _prepare(self):
+        if self._keys is not None:
+            return
+        values = sorted(self.bitmaps, key=self.key)
+        self._keys = [self.key(v) for v in values]
+        self._below = [0]
+        for value in values:
+            self._below.append(self._below[-1] | self.bitmaps[value])
+
+    def less(self, value: str, inclusive: bool = False) -> int:
+        self._prepare()
+        find = bisect_right if inclusive else bisect_left
+        return self._below[find(self._keys, self.key(value))]
+
+    def present(self) -> int:
+        self._prepare()
+        return self._below[-1]
+
+
+@dataclass
+class SpecIndex:
+    specs: list[Spec] = field(default_factory=list)
+    fields: dict[str, ValueIndex] = field(default_factory=dict)
+
+    CATEGORICAL = ("kind", "status", "author", "components")
+    ORDERED = {
+        "number": lambda v: int(v),
+        "created": date_key,
+        "updated": date_key,
+        "version_after": version_key,
+        "version_before": version_key,
+    }
+
+    @classmethod
+    def build(cls, specs: list[Spec]) -> "SpecIndex":
+        index = cls(specs=specs)
+        for name in cls.CATEGORICAL:
+            index.fields[name] = ValueIndex()
+        for name, key in cls.ORDERED.items():
+            index.fields[name] = OrderedIndex(key)
+        for i, spec in enumerate(specs):
+            bit = 1 << i
+            for name, value in cls.values(spec).items():
+                for v in value if isinstance(value, list) else [value]:
+                    if v is not None:
+                        index.fields[name].add(str(v), bit)
+        return index
+
+    @staticmethod
+    def values(spec: Spec) -> dict:
+        return {
+            "kind": spec.kind.lower(),
+            "status": str(spec.status).lower(),
+            "author": spec.author.lower(),
+            "components": [c.lower() for c in spec.components],
+            "number": spec.number,
+            "created": spec.created,
+            "updated": max((str(u.date) for u in spec.updates), default=None),
+            "version_after": spec.version_after,
+            "version_before": spec.version_before,
+        }
+
+    @property
+    def universe(self) -> int:
+        return (1 << len(self.specs)) - 1
+
+    def compare(self, name: str, op: str, value: str) -> int:
+        if name == "version":
+            return self.in_version(value, op)
+        if name not in self.fields:
+            known = ", ".join(sorted([*self.fields, "version"]))
+            raise QueryError(f"Unknown field {name!r}, expected one of {known}")
+        index = self.fields[name]
+        if name in self.CATEGORICAL:
+            value = value.lower()
+        if op == "=":
+            return index.equal(value)
+        if op == "!=":
+            return self.universe & ~index.equal(value)
+        if not isinstance(index, OrderedIndex):
+            raise QueryError(f"Field {name!r} only supports = and !=")
+        try:
+            if op in ("<", "<="):
+                return index.less(value, inclusive=op == "<=")
+            return index.present() & ~index.less(value, inclusive=op == ">")
+        except ValueError as e:
+            raise QueryError(f"Invalid value {value!r} for {name}: {e}")
+
+    def in_version(self, value: str, op: str) -> int:
+        if op not in ("=", "!="):
+            raise QueryError("Field 'version' only supports = and !=")
+        after = self.fields["version_after"]
+        before = self.fields["version_before"]
+        matched = after.less(value, inclusive=True) & ~before.less(
+            value, inclusive=True
+        )
+        return matched if op == "=" else self.universe & ~matched
+
+    def select(self, bitmap: int) -> list[Spec]:
+        out = []
+        while bitmap:
+            low = bitmap & -bitmap
+            out.append(self.specs[low.bit_length() - 1])
+            bitmap ^= low
+        return out
+
+    def query(self, text: str) -> list[Spec]:
+        return self.select(_Parser(text, self).parse())
+
+
+_TOKEN = re.compile(
+    r"""
+    \s*(?:
+        (?P<paren>[()])
+      | (?P<keyword>and|or|not)(?![\w.\-])
+      | (?P<field>[A-Za-z_]+)\s*(?P<op>!=|<=|>=|=|:|<|>)\s*
+        (?P<value>"[^"]*"|'[^']*'|[^\s()]+)
+    )
+    """,
+    re.X | re.I,
+)
+
+
+class _Parser:
+    """Recursive descent: or_expr := and_expr ("or" and_expr)*, and so on."""
+
+    def __init__(self, text: str, index: SpecIndex):
+        self.index = index
+        self.tokens: list[tuple[str, tuple]] = []
+        pos = 0
+        text = text.rstrip()
+        while pos < len(text):
+            m = _TOKEN.match(text, pos)
+            if m is None or m.end() == pos:
+                raise QueryError(f"Cannot parse query at {text[pos:].strip()!r}")
+            if m.group("paren"):
+                self.tokens.append((m.group("paren"), ()))
+            elif m.group("keyword"):
+                self.tokens.append((m.group("keyword").lower(), ()))
+            else:
+                value = m.group("value").strip("\"'")
+                op = "=" if m.group("op") == ":" else m.group("op")
+                self.tokens.append(("cmp", (m.group("field").lower(), op, value)))
+            pos = m.end()
+        self.pos = 0
+
+    def peek(self) -> str | None:
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def take(self) -> tuple[str, tuple]:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def parse(self) -> int:
+        if not self.tokens:
+            return self.index.universe
+        result = self.or_expr()
+        if self.peek() is not None:
+            raise QueryError(f"Unexpected {self.peek()!r} in query")
+        return result
+
+    def or_expr(self) -> int:
+        result = self.and_expr()
+        while self.peek() == "or":
+            self.take()
+            result |= self.and_expr()
+        return result
+
+    def and_expr(self) -> int:
+        result = self.not_expr()
+        while self.peek() in ("and", "not", "(", "cmp"):
+            if self.peek() == "and":
+                self.take()
+            result &= self.not_expr()
+        return result
+
+    def not_expr(self) -> int:
+        if self.peek() == "not":
+            self.take()
+            return self.index.universe & ~self.not_expr()
+        return self.atom()
+
+    def atom(self) -> int:
+        kind = self.peek()
+        if kind == "(":
+            self.take()
+            result = self.or_expr()
+            if self.peek() != ")":
+                raise QueryError("Missing closing parenthesis")
+            self.take()
+            return result
+        if kind != "cmp":
+            raise QueryError(f"Expected a comparison, got {kind or 'end of query'!r}")
+        name, op, value = self.take()[1]
+        result = 0
+        if op in ("=", "!="):
+            for item in value.split(","):
+                result |= self.index.compare(name, "=", item)
+            return result if op == "=" else self.index.universe & ~result
+        return self.index.compare(name, op, value)
+
+
+COLUMNS = ("id", "status", "version", "components", "title")
+
+
+def row(spec: Spec) -> dict[str, str]:
+    versions = spec.version_after + (
+        f"..{spec.version_before}" if spec.version_before else ".."
+    )
+    return {
+        "id": spec.qualified_id(),
+        "status": str(spec.status),
+        "version": versions,
+        "components": ",".join(spec.components),
+        "title": spec.title,
+    }
+
+
+def table(specs: list[Spec]) -> str:
+    rows = [dict(zip(COLUMNS, COLUMNS))] + [row(s) for s in specs]
+    widths = {c: max(len(r[c]) for r in rows) for c in COLUMNS}
+    return "\n".join(
+        "  ".join(r[c].ljust(widths[c]) for c in COLUMNS).rstrip() for r in rows
+    )
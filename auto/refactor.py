@@ -0,0 +1,313 @@
+"""
+Batch renames across the docs corpus: spec renumbering (``RFC-0019`` ->
+``RFC-0032``, or to another kind) and component ids (``parser`` ->
+``syntax``).
+
+Every mapping is compiled into one Aho-Corasick automaton, so each file is
+scanned once however many mappings there are, and a swap such as
+``RFC-0019=RFC-0020 RFC-0020=RFC-0019`` works since replaced text is never
+scanned again. Matches must start and end on a word boundary
+(``RFC-0001`` does not match inside ``RFC-00010``); of overlapping matches
+the leftmost, then longest wins.
+
+- spec ids are replaced anywhere in ``src/content``, in both the
+  ``RFC-0019`` and ``rfc-0019`` spellings the routes use; the spec file is
+  moved and its frontmatter ``kind`` and ``number`` updated
+- component ids are plain words, so they are only replaced where they name
+  a component: the ``id`` entries of ``components.yaml`` and the
+  ``components`` lists of the spec frontmatter
+
+All edits are planned before anything is written. They are then staged
+next to their targets and moved into place with ``os.replace``; the old
+files of moved specs are removed last.
+"""
+
+import difflib
+import os
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from auto.search import CONTENT_DIR, content_files
+from auto.types import COMPONENTS, DOCS_ROOT
+
+_SPEC_ID = re.compile(r"(?P<kind>[A-Z]+)-(?P<number>[0-9]{4})")
+_COMPONENT_ID = re.compile(r"[\w-]+")
+_REGISTRY_ID = re.compile(r"^-[ \t]+id:[ \t]*([\w-]+)[ \t]*$", re.M)
+_FRONTMATTER = re.compile(r"\A---\n(.*?\n)---", re.S)
+_COMPONENT_LIST = re.compile(r"^components:[ \t]*\n((?:[ \t]*-[ \t]*.*\n)*)", re.M)
+_LIST_ITEM = re.compile(r"^[ \t]*-[ \t]*([\w-]+)[ \t]*$", re.M)
+
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class RefactorError(ValueError):
+    pass
+
+
+class Automaton:
+    """Aho-Corasick automaton finding every occurrence of a set of patterns."""
+
+    def __init__(self, patterns: list[str]):
+        self.patterns = patterns
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail = [0]
+        # index of the pattern ending at each state, or -1
+        self.output = [-1]
+        # nearest state on the failure chain with an output
+        self.dictionary = [0]
+
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(-1)
+                    self.dictionary.append(0)
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state] = index
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                failed = self.fail[child]
+                self.dictionary[child] = (
+                    failed if self.output[failed] >= 0 else self.dictionary[failed]
+                )
+
+    def find(self, text: str):
+        """Yield ``(start, end, pattern index)`` of every occurrence."""
+        state = 0
+        for end, char in enumerate(text, start=1):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            match = state if self.output[state] >= 0 else self.dictionary[state]
+            while match:
+                index = self.output[match]
+                yield end - len(self.patterns[index]), end, index
+                match = self.dictionary[match]
+
+
+@dataclass
+class Mapping:
+    old: str
+    new: str
+    # "spec" or "component"
+    kind: str
+
+
+def resolve(
+    pairs: dict[str, str], specs: set[str], kinds: set[str], components: set[str]
+) -> list[Mapping]:
+    """Check ``old -> new`` pairs against the existing specs and components."""
+    mappings = []
+    for old, new in pairs.items():
+        if old == new:
+            raise RefactorError(f"{old} is mapped to itself")
+        if _SPEC_ID.fullmatch(old.upper()):
+            old, new = old.upper(), new.upper()
+            if old not in specs:
+                raise RefactorError(f"Unknown spec {old}")
+            if not (m := _SPEC_ID.fullmatch(new)) or m.group("kind") not in kinds:
+                raise RefactorError(f"{new} is not a valid spec id")
+            mappings.append(Mapping(old, new, "spec"))
+        elif old in components:
+            if not _COMPONENT_ID.fullmatch(new):
+                raise RefactorError(f"{new!r} is not a valid component id")
+            mappings.append(Mapping(old, new, "component"))
+        else:
+            raise RefactorError(f"Unknown spec or component {old!r}")
+
+    for kind, existing in (("spec", specs), ("component", components)):
+        olds = {m.old for m in mappings if m.kind == kind}
+        news = [m.new for m in mappings if m.kind == kind]
+        for new in news:
+            if news.count(new) > 1:
+                raise RefactorError(f"More than one {kind} is renamed to {new}")
+            if new in existing and new not in olds:
+                raise RefactorError(f"{new} already exists")
+    return mappings
+
+
+def replacements(mappings: list[Mapping]) -> dict[str, tuple[str, str]]:
+    """pattern -> (replacement, "spec" or "component")."""
+    found = {}
+    for m in mappings:
+        if m.kind == "component":
+            found[m.old] = (m.new, m.kind)
+            continue
+        old_kind, new_kind = m.old.split("-")[0], m.new.split("-")[0]
+        for old, new in ((m.old, m.new), (m.old.lower(), m.new.lower())):
+            found[old] = (new, m.kind)
+            if old_kind != new_kind:
+                # ../rfc/RFC-0019.md and /specs/rfc/rfc-0019 change directory
+                found[f"{old_kind.lower()}/{old}"] = (
+                    f"{new_kind.lower()}/{new}",
+                    m.kind,
+                )
+    return found
+
+
+def component_spans(text: str, registry: bool = False) -> set[tuple[int, int]]:
+    """Where ``text`` names a component id."""
+    if registry:
+        return {m.span(1) for m in _REGISTRY_ID.finditer(text)}
+    head = _FRONTMATTER.match(text)
+    if head is None:
+        return set()
+    spans = set()
+    for block in _COMPONENT_LIST.finditer(text, 0, head.end(1)):
+        for m in _LIST_ITEM.finditer(text, block.start(1), block.end(1)):
+            spans.add(m.span(1))
+    return spans
+
+
+def rewrite(
+    text: str,
+    automaton: Automaton,
+    targets: list[tuple[str, str]],
+    components: set[tuple[int, int]] = frozenset(),
+) -> tuple[str, int]:
+    """``text`` with every match replaced, and the number of replacements."""
+    matches = []
+    for start, end, index in automaton.find(text):
+        if (start and _is_word(text[start - 1])) or (
+            end < len(text) and _is_word(text[end])
+        ):
+            continue
+        if targets[index][1] == "component" and (start, end) not in components:
+            continue
+        matches.append((start, end, index))
+    matches.sort(key=lambda m: (m[0], -m[1]))
+
+    out, position = [], 0
+    for start, end, index in matches:
+        if start < position:
+            continue
+        out.append(text[position:start])
+        out.append(targets[index][0])
+        position = end
+    out.append(text[position:])
+    return "".join(out), len(out) // 2
+
+
+def _update_head(text: str, spec_id: str) -> str:
+    kind, number = spec_id.split("-")
+    head = _FRONTMATTER.match(text)
+    if head is None:
+        return text
+    updated = re.sub(r"^kind:.*$", f"kind: {kind}", head.group(1), flags=re.M)
+    updated = re.sub(r"^number:.*$", f"number: {int(number)}", updated, flags=re.M)
+    return text[: head.start(1)] + updated + text[head.end(1) :]
+
+
+@dataclass
+class Edit:
+    path: Path
+    # differs from path for moved specs
+    target: Path
+    before: str
+    after: str
+    replacements: int = 0
+
+
+@dataclass
+class Plan:
+    edits: list[Edit] = field(default_factory=list)
+
+    @property
+    def moves(self) -> list[Edit]:
+        return [e for e in self.edits if e.path != e.target]
+
+    @property
+    def replacements(self) -> int:
+        return sum(e.replacements for e in self.edits)
+
+
+def plan(
+    mappings: list[Mapping], root: Path = CONTENT_DIR, registry: Path = COMPONENTS
+) -> Plan:
+    """Every file change the mappings need, without writing anything."""
+    targets = replacements(mappings)
+    patterns = list(targets)
+    automaton = Automaton(patterns)
+    values = [targets[p] for p in patterns]
+    moved = {m.old: m.new for m in mappings if m.kind == "spec"}
+
+    result = Plan()
+    paths = [(root / p, False) for p in content_files(root)]
+    if any(m.kind == "component" for m in mappings):
+        paths.append((registry, True))
+    for path, is_registry in paths:
+        before = path.read_text()
+        after, count = rewrite(
+            before, automaton, values, component_spans(before, is_registry)
+        )
+        target = path
+        if path.parent.parent == root / "specs" and path.stem in moved:
+            new = moved[path.stem]
+            after = _update_head(after, new)
+            target = root / "specs" / new.split("-")[0].lower() / f"{new}.md"
+        if after != before or target != path:
+            result.edits.append(Edit(path, target, before, after, count))
+    return result
+
+
+def _display(path: Path) -> str:
+    try:
+        return path.relative_to(DOCS_ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def diff(result: Plan) -> str:
+    """Unified diff of the plan, with moved specs shown as renames."""
+    out = []
+    for edit in result.edits:
+        old, new = _display(edit.path), _display(edit.target)
+        if old != new:
+            out.append(f"rename from {old}\nrename to {new}\n")
+        out.extend(
+            difflib.unified_diff(
+                edit.before.splitlines(keepends=True),
+                edit.after.splitlines(keepends=True),
+                f"a/{old}",
+                f"b/{new}",
+            )
+        )
+    return "".join(out)
+
+
+def apply(result: Plan):
+    """Write every edit, staging all files before any is replaced."""
+    staged = []
+    try:
+        for edit in result.edits:
+            edit.target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = edit.target.with_name(edit.target.name + ".tmp")
+            tmp.write_text(edit.after)
+            staged.append((tmp, edit.target))
+    except OSError:
+        for tmp, _ in staged:
+            tmp.unlink(missing_ok=True)
+        raise
+
+    for tmp, target in staged:
+        os.replace(tmp, target)
+    written = {edit.target for edit in result.edits}
+    for edit in result.moves:
+        if edit.path not in written:
+            edit.path.unlink()
@@ -0,0 +1,281 @@
+"""
+Prebuilt full-text search index over ``src/content``.
+
+Every docs page and spec is tokenized into one position stream: the title
+first, then the body with markdown syntax stripped (fenced code is indexed
+as is). Spec frontmatter adds the terms ``kind:<kind>`` and
+``status:<status>``, which match the whole document and have no positions.
+The index is written as static files the search UI fetches on demand::
+
+    public/search/
+      meta.json     format version, prefix length, documents and shard list
+      <prefix>.json postings of every term starting with <prefix>
+
+``meta.json`` lists every document as ``{url, title, kind, status,
+title_length, sections}``; positions below ``title_length`` are title matches
+and ``sections`` holds ``[position, heading, anchor]`` so a match can link to
+its section. A shard maps each term to a flat integer list: per document the
+gap to the previous document id, the number of positions, then the positions
+as gaps. Stop words are not indexed but still take a position, so phrase
+queries can rely on adjacent positions.
+
+Tokenized files are cached per content hash under ``.cache/doc-manager``, so
+a rebuild only re-tokenizes changed files and rewrites changed shards.
+Compound tokens such as ``version_after`` or ``type-registry`` are indexed whole
+and by their parts.
+"""
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from yaml import YAMLError
+from yaml import safe_load as load_yaml
+
+from auto.types import DOCS_ROOT, SpecDocument
+
+CONTENT_DIR = DOCS_ROOT / "src" / "content"
+INDEX_DIR = DOCS_ROOT / "public" / "search"
+CACHE_PATH = Path(".cache/doc-manager/search.json")
+
+FORMAT_VERSION = 2
+PREFIX_LENGTH = 2
+CONTENT_SUFFIXES = frozenset({".md", ".mdx"})
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from in is it of on or that the this to with".split()
+)
+
+_TOKEN = re.compile(r"[^\W_]+(?:[-_.][^\W_]+)*")
+_SEPARATOR = re.compile(r"[-_.]")
+_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+_TAG = re.compile(r"</?[A-Za-z][^>]*>")
+_MDX_STATEMENT = re.compile(r"^(?:import|export)\s.*$")
+
+
+def tokens(text: str) -> list[str]:
+    """Lowercase terms of ``text``; ``version_after`` and ``0.1.0`` stay whole."""
+    return [t.lower() for t in _TOKEN.findall(text)]
+
+
+def slug(heading: str) -> str:
+    """Heading anchor as generated by the site (github-slugger rules)."""
+    text = re.sub(r"[^\w\- ]", "", heading.strip().lower())
+    return text.replace(" ", "-")
+
+
+def split_frontmatter(md: str) -> tuple[dict, str]:
+    if not md.startswith("---"):
+        return {}, md
+    parts = md.split("---", 2)
+    if len(parts) < 3:
+        return {}, md
+    try:
+        head = load_yaml(parts[1]) or {}
+    except YAMLError:
+        return {}, md
+    return (head if isinstance(head, dict) else {}), parts[2]
+
+
+def url_for(relative: Path) -> str:
+    """Site URL of a content file, relative to CONTENT_DIR."""
+    collection, *rest = relative.with_suffix("").parts
+    if collection == "specs":
+        return f"/specs/{'/'.join(rest)}"
+    parts = [p.lower() for p in rest if p != "index"]
+    return "/" + "".join(f"{p}/" for p in parts)
+
+
+@dataclass
+class IndexedFile:
+    sha256: str
+    url: str
+    title: str
+    kind: str | None = None
+    status: str | None = None
+    title_length: int = 0
+    # [position, heading, anchor]
+    sections: list[list] = field(default_factory=list)
+    # term -> positions
+    terms: dict[str, list[int]] = field(default_factory=dict)
+
+    def document(self) -> dict:
+        doc = asdict(self)
+        del doc["sha256"], doc["terms"]
+        return doc
+
+
+def index_file(relative: Path, md: str) -> IndexedFile:
+    head, body = split_frontmatter(md)
+    title = str(head.get("title", relative.stem))
+    entry = IndexedFile(
+        sha256=hashlib.sha256(md.encode()).hexdigest(),
+        url=url_for(relative),
+        title=title,
+    )
+    position = 0
+
+    def add(text: str):
+        nonlocal position
+        for token in tokens(text):
+            # compounds are also found by their parts, at the same position
+            parts = _SEPARATOR.split(token)
+            for term in dict.fromkeys([token, *parts] if len(parts) > 1 else parts):
+                if term not in STOP_WORDS:
+                    entry.terms.setdefault(term, []).append(position)
+            position += 1
+
+    add(title)
+    entry.title_length = position
+    if relative.parts[0] == "specs" and "kind" in head:
+        entry.kind = str(head["kind"])
+        entry.status = str(head.get("status", ""))
+        # document-level terms, without positions so phrase and proximity
+        # queries never match across them
+        entry.terms[f"kind:{entry.kind.lower()}"] = []
+        entry.terms[f"status:{entry.status.lower()}"] = []
+
+    document = SpecDocument.parse(body)
+    blocks = {block.line - 1: block for block in document.code_blocks}
+    for i, line in enumerate(document.lines):
+        if (block := blocks.get(i)) is not None:
+            add(block.code)
+        if document.fenced[i] or _MDX_STATEMENT.match(line):
+            continue
+        if m := _HEADING.match(line):
+            heading = _LINK.sub(r"\1", m.group(2)).replace("`", "")
+            entry.sections.append([position, heading, slug(heading)])
+            line = heading
+        add(_TAG.sub(" ", _LINK.sub(r"\1", line)))
+    return entry
+
+
+def content_files(root: Path = CONTENT_DIR) -> list[Path]:
+    return sorted(
+        p.relative_to(root)
+        for p in root.rglob("*")
+        if p.suffix in CONTENT_SUFFIXES and p.is_file()
+    )
+
+
+def load_cache(path: Path) -> dict[str, IndexedFile]:
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != FORMAT_VERSION:
+        return {}
+    return {k: IndexedFile(**v) for k, v in data["files"].items()}
+
+
+def store_cache(path: Path, files: dict[str, IndexedFile]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "version": FORMAT_VERSION,
+        "files": {k: asdict(v) for k, v in files.items()},
+    }
+    path.write_text(json.dumps(data, separators=(",", ":")))
+
+
+def encode_postings(postings: list[tuple[int, list[int]]]) -> list[int]:
+    out = []
+    previous_doc = 0
+    for doc, positions in postings:
+        out += [doc - previous_doc, len(positions)]
+        previous = 0
+        for p in positions:
+            out.append(p - previous)
+            previous = p
+        previous_doc = doc
+    return out
+
+
+def decode_postings(data: list[int]) -> list[tuple[int, list[int]]]:
+    postings = []
+    i, doc = 0, 0
+    while i < len(data):
+        doc += data[i]
+        count = data[i + 1]
+        positions, p = [], 0
+        for gap in data[i + 2 : i + 2 + count]:
+            p += gap
+            positions.append(p)
+        postings.append((doc, positions))
+        i += 2 + count
+    return postings
+
+
+def shard_of(term: str) -> str:
+    """Shard file stem of ``term``; safe on every filesystem."""
+    prefix = term[:PREFIX_LENGTH]
+    return "".join(c if c.isascii() and c.isalnum() else "_" for c in prefix)
+
+
+@dataclass
+class BuildResult:
+    documents: int
+    reindexed: int
+    terms: int
+    written: list[Path] = field(default_factory=list)
+    removed: list[Path] = field(default_factory=list)
+
+
+def _write_if_changed(path: Path, data: str) -> bool:
+    if path.exists() and path.read_text() == data:
+        return False
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(data)
+    os.replace(tmp, path)
+    return True
+
+
+def build(
+    root: Path = CONTENT_DIR,
+    out_dir: Path = INDEX_DIR,
+    cache_path: Path | None = CACHE_PATH,
+) -> BuildResult:
+    cached = load_cache(cache_path) if cache_path is not None else {}
+    files: dict[str, IndexedFile] = {}
+    reindexed = 0
+    for relative in content_files(root):
+        md = (root / relative).read_text()
+        key = relative.as_posix()
+        entry = cached.get(key)
+        if entry is None or entry.sha256 != hashlib.sha256(md.encode()).hexdigest():
+            entry = index_file(relative, md)
+            reindexed += 1
+        files[key] = entry
+    if cache_path is not None:
+        store_cache(cache_path, files)
+
+    postings: dict[str, list[tuple[int, list[int]]]] = {}
+    for doc, entry in enumerate(files.values()):
+        for term, positions in entry.terms.items():
+            postings.setdefault(term, []).append((doc, positions))
+
+    shards: dict[str, dict[str, list[int]]] = {}
+    for term in sorted(postings):
+        shards.setdefault(shard_of(term), {})[term] = encode_postings(postings[term])
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    result = BuildResult(documents=len(files), reindexed=reindexed, terms=len(postings))
+    meta = {
+        "version": FORMAT_VERSION,
+        "prefix_length": PREFIX_LENGTH,
+        "documents": [entry.document() for entry in files.values()],
+        "shards": {name: len(terms) for name, terms in sorted(shards.items())},
+    }
+    outputs = {"meta": meta, **shards}
+    for name, data in outputs.items():
+        path = out_dir / f"{name}.json"
+        if _write_if_changed(path, json.dumps(data, separators=(",", ":"))):
+            result.written.append(path)
+    for path in sorted(out_dir.glob("*.json")):
+        if path.stem not in outputs:
+            path.unlink()
+            result.removed.append(path)
+    return result
@@ -0,0 +1,155 @@
+"""
+Deterministic sharding of corpus-wide work across CI machines.
+
+``--shard i/n`` (1-based) makes a command process only its part of the work
+and write a :class:`ShardReport` instead of the final artifacts; a merge step
+then combines the ``n`` reports into the same artifacts a single unsharded run
+would produce.
+
+Every shard computes the partition independently, so it has to be a pure
+function of the item list and the recorded costs: items are assigned longest
+first to the least loaded shard (ties broken by name and shard index). The
+costs are the seconds each item took in earlier runs, updated by the merge
+step; items without a recorded cost count as the mean of the known ones.
+They are kept under ``.cache``, which CI restores before the shards start
+and saves afterwards (see ``.github/workflows/deploy.yaml``), so every shard
+of a run reads the same costs.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class Shard:
+    index: int
+    count: int
+
+    @classmethod
+    def parse(cls, value: str) -> "Shard":
+        index, sep, count = value.partition("/")
+        if not sep or not index.isdigit() or not count.isdigit():
+            raise ValueError(f"Expected a shard like 2/4, got {value!r}")
+        shard = cls(int(index), int(count))
+        if not 1 <= shard.index <= shard.count:
+            raise ValueError(f"Shard index must be between 1 and {shard.count}")
+        return shard
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def partition(items: list[str], costs: dict[str, float], count: int) -> list[list[str]]:
+    """Split ``items`` into ``count`` shards of roughly equal total cost."""
+    known = [costs[item] for item in items if item in costs]
+    default = sum(known) / len(known) if known else 1.0
+    shards: list[list[str]] = [[] for _ in range(count)]
+    loads = [0.0] * count
+    for item in sorted(set(items), key=lambda i: (-costs.get(i, default), i)):
+        target = min(range(count), key=lambda s: (loads[s], s))
+        shards[target].append(item)
+        loads[target] += costs.get(item, default)
+    return [sorted(shard) for shard in shards]
+
+
+def select(items: list[str], shard: Shard, costs: dict[str, float]) -> list[str]:
+    """The items ``shard`` processes, in their original order."""
+    mine = set(partition(items, costs, shard.count)[shard.index - 1])
+    return [item for item in items if item in mine]
+
+
+def universe_key(items: list[str]) -> str:
+    """Identifies the full item list, so shards of different runs do not mix."""
+    return hashlib.sha256("\n".join(sorted(items)).encode()).hexdigest()
+
+
+def load_costs(path: Path) -> dict[str, float]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def store_costs(path: Path, costs: dict[str, float]):
+    """Merge ``costs`` into the recorded ones and write them atomically."""
+    merged = {**load_costs(path), **{k: round(v, 4) for k, v in costs.items()}}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(merged, indent=2, sort_keys=True) + "\n")
+    os.replace(tmp, path)
+
+
+@dataclass
+class ShardReport:
+    task: str
+    shard: str
+    universe: str
+    total: int
+    # item -> seconds it took
+    costs: dict[str, float] = field(default_factory=dict)
+    # task specific results, merged by the task itself
+    data: dict = field(default_factory=dict)
+
+    @classmethod
+    def new(cls, task: str, shard: Shard, items: list[str], **kwargs):
+        return cls(
+            task=task,
+            shard=str(shard),
+            universe=universe_key(items),
+            total=len(set(items)),
+            **kwargs,
+        )
+
+    def path_in(self, directory: Path) -> Path:
+        index, count = self.shard.split("/")
+        return directory / f"{self.task}-{index}of{count}.json"
+
+    def write(self, directory: Path) -> Path:
+        path = self.path_in(directory)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(asdict(self), default=str))
+        return path
+
+    @classmethod
+    def load_all(cls, directory: Path, task: str) -> list["ShardReport"]:
+        return [
+            cls(**json.loads(path.read_text()))
+            for path in sorted(directory.glob(f"{task}-*of*.json"))
+        ]
+
+
+def merge(reports: list[ShardReport]) -> ShardReport:
+    """Combine the reports of one sharded run, checking nothing is missing.
+
+    Raises ``ValueError`` when shards are missing, come from different runs,
+    or do not cover every item exactly once.
+    """
+    if not reports:
+        raise ValueError("No shard reports to merge")
+    first = reports[0]
+    count = Shard.parse(first.shard).count
+    problems = []
+    if {(r.task, r.universe, r.total) for r in reports} != {
+        (first.task, first.universe, first.total)
+    }:
+        problems.append("shard reports come from different item lists")
+    seen = {Shard.parse(r.shard) for r in reports}
+    if {s.count for s in seen} != {count}:
+        problems.append("shard reports disagree on the shard count")
+    if missing := sorted(set(range(1, count + 1)) - {s.index for s in seen}):
+        problems.append(f"missing shards {', '.join(f'{i}/{count}' for i in missing)}")
+
+    merged = ShardReport(first.task, "merged", first.universe, first.total)
+    for report in reports:
+        if overlap := sorted(merged.costs.keys() & report.costs.keys()):
+            problems.append(f"items processed twice: {', '.join(overlap)}")
+        merged.costs.update(report.costs)
+        merged.data.update(report.data)
+    if not problems and len(merged.costs) != first.total:
+        problems.append(f"shards processed {len(merged.costs)} of {first.total} items")
+    if problems:
+        raise ValueError("; ".join(problems))
+    return merged
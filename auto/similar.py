@@ -0,0 +1,153 @@
+"""
+Near-duplicate specs via MinHash signatures and locality-sensitive hashing.
+
+Each spec body (without frontmatter and the ``References`` list every spec
+has) is reduced to the set of its word 5-shingles. A MinHash signature of
+``NUM_PERM`` values estimates the Jaccard similarity of two such sets as the
+fraction of equal positions. Signatures are split into bands of ``rows``
+values; only specs with an identical band are compared, so the pairs checked
+grow with the number of similar specs rather than quadratically. The band
+size is the largest that still finds pairs at the threshold with 95%
+probability, lower thresholds need smaller bands and compare more pairs.
+
+The signatures use ``(a * x + b) mod PRIME`` over 32-bit shingle hashes,
+which is exact in 64-bit integers: NumPy (optional) computes all of a
+spec's permutations at once and gives the same values as the pure Python
+fallback. They are cached per content hash under ``.cache/doc-manager``.
+"""
+
+import hashlib
+import json
+import random
+import zlib
+from dataclasses import dataclass
+from itertools import combinations
+from pathlib import Path
+
+from auto.search import tokens
+from auto.types import SPEC_DIR, Language, SpecDocument
+
+try:
+    import numpy as np
+except ImportError:  # optional, vectorizes the signatures
+    np = None
+
+CACHE_PATH = Path(".cache/doc-manager/minhash.json")
+CACHE_VERSION = 1
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+# smallest prime above 2**32, so a * x + b < 2**64 for 32-bit a, b and x
+PRIME = 4294967311
+SEED = 1
+
+_random = random.Random(SEED)
+_A = [_random.randrange(1, 2**32) for _ in range(NUM_PERM)]
+_B = [_random.randrange(0, 2**32) for _ in range(NUM_PERM)]
+
+
+def body(document: SpecDocument) -> str:
+    lines = document.lines[document.body_start :]
+    if (references := document.sections.get("References")) is not None:
+        start = references.line - 1 - document.body_start
+        end = references.end - 1 - document.body_start
+        lines = lines[:start] + lines[end:]
+    return "\n".join(lines)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[int]:
+    words = tokens(text)
+    if not words:
+        return set()
+    return {
+        zlib.crc32(" ".join(words[i : i + size]).encode())
+        for i in range(max(1, len(words) - size + 1))
+    }
+
+
+def signature(hashes: set[int]) -> list[int]:
+    if not hashes:
+        return [PRIME] * NUM_PERM
+    if np is not None:
+        x = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+        a = np.array(_A, dtype=np.uint64)[:, None]
+        b = np.array(_B, dtype=np.uint64)[:, None]
+        return ((a * x + b) % np.uint64(PRIME)).min(axis=1).tolist()
+    return [min((a * x + b) % PRIME for x in hashes) for a, b in zip(_A, _B)]
+
+
+def similarity(first: list[int], second: list[int]) -> float:
+    """Estimated Jaccard similarity of the shingle sets."""
+    return sum(x == y for x, y in zip(first, second)) / NUM_PERM
+
+
+def band_rows(threshold: float, recall: float = 0.95) -> int:
+    """Largest band size finding pairs at ``threshold`` with ``recall``."""
+    best = 1
+    for rows in (2, 4, 8, 16, 32):
+        bands = NUM_PERM // rows
+        if 1 - (1 - threshold**rows) ** bands >= recall:
+            best = rows
+    return best
+
+
+def candidates(signatures: dict[str, list[int]], rows: int) -> set[tuple[str, str]]:
+    """Pairs with at least one identical band of ``rows`` values."""
+    pairs = set()
+    for start in range(0, NUM_PERM, rows):
+        buckets: dict[tuple[int, ...], list[str]] = {}
+        for key, values in signatures.items():
+            if values[0] == PRIME:
+                # no text to compare
+                continue
+            buckets.setdefault(tuple(values[start : start + rows]), []).append(key)
+        for keys in buckets.values():
+            pairs.update(combinations(sorted(keys), 2))
+    return pairs
+
+
+@dataclass
+class Pair:
+    first: str
+    second: str
+    similarity: float
+
+
+def load(lang: Language, cache_path: Path | None = CACHE_PATH):
+    """Signature of every spec (relative to SPEC_DIR), hashing only changes."""
+    params = [SHINGLE_SIZE, NUM_PERM, SEED]
+    cached = {}
+    if cache_path is not None and cache_path.exists():
+        try:
+            data = json.loads(cache_path.read_text())
+            if data.get("version") == CACHE_VERSION and data.get("params") == params:
+                cached = data["files"]
+        except ValueError:
+            pass
+
+    files, computed = {}, 0
+    for path in lang.spec_paths():
+        key = path.relative_to(SPEC_DIR).as_posix()
+        text = path.read_text()
+        sha256 = hashlib.sha256(text.encode()).hexdigest()
+        entry = cached.get(key)
+        if entry is None or entry["sha256"] != sha256:
+            hashes = shingles(body(SpecDocument.parse(text)))
+            entry = {"sha256": sha256, "signature": signature(hashes)}
+            computed += 1
+        files[key] = entry
+
+    if cache_path is not None and files != cached:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": CACHE_VERSION, "params": params, "files": files}
+        cache_path.write_text(json.dumps(data))
+    return {key: entry["signature"] for key, entry in files.items()}, computed
+
+
+def similar(signatures: dict[str, list[int]], threshold: float) -> list[Pair]:
+    pairs = [
+        Pair(first, second, similarity(signatures[first], signatures[second]))
+        for first, second in candidates(signatures, band_rows(threshold))
+    ]
+    pairs = [p for p in pairs if p.similarity >= threshold]
+    pairs.sort(key=lambda p: (-p.similarity, p.first, p.second))
+    return pairs
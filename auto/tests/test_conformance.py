@@ -0,0 +1,81 @@
+from docs.auto.conformance import check
+from docs.auto.types import SpecDocument, SpecKind
+
+KIND = SpecKind(
+    id="RFC",
+    name="Request for Comment",
+    description="",
+    category="core",
+    references=["SPEC"],
+    sections=["Abstract", "Motivation", "Rationale", "References"],
+)
+
+
+def problems(md: str) -> list[tuple[str, str, str]]:
+    return [
+        (i.section, i.problem, i.severity) for i in check(SpecDocument.parse(md), KIND)
+    ]
+
+
+def test_conforming_spec():
+    md = KIND.template_for(None).format(qualified_spec="RFC-0001", title="T")
+    for section in KIND.sections:
+        md = md.replace(KIND.help_for_section(section) or "None", "Written.")
+    md = md.replace("<!-- Remove un-necessary sections -->", "")
+    assert problems(md) == []
+
+
+def test_template_drift():
+    md = """# RFC-0001: T
+
+## Rationale
+
+Because.
+
+## Abstract
+
+Provide a brief summary of the specification's purpose and goals.
+
+## Notes
+
+```md
+## Motivation
+```
+
+## References
+
+<!-- Remove un-necessary sections -->
+"""
+    assert problems(md) == [
+        ("Motivation", "missing", "error"),
+        ("Abstract", "should come before 'Rationale'", "error"),
+        ("Abstract", "still has the template text", "error"),
+        ("Notes", "not in the template", "warning"),
+        ("References", "still has the template text", "error"),
+    ]
+
+
+def test_same_title_at_another_level():
+    md = """# RFC-0001: T
+
+### Abstract
+
+Provide a brief summary of the specification's purpose and goals.
+
+## Abstract
+
+Written.
+
+## Motivation
+
+Written.
+
+## Rationale
+
+Written.
+
+## References
+
+- RFC-0002
+"""
+    assert problems(md) == []
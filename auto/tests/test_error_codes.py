@@ -0,0 +1,65 @@
+from docs.auto.error_codes import merge, parse
+
+ERR_A = """---
+kind: ERR
+---
+
+## Domain Summary
+
+| Code    | Name          | Severity | Category |
+| ------- | ------------- | -------- | -------- |
+| KTY3001 | IdentConflict | Error    | Conflict |
+| KTY3002 | DuplicateType | Warning  | Conflict |
+
+## Error Definitions
+
+### KTY3001: IdentConflict
+
+**Severity:** Error
+**Phase:** Parsing
+
+**Message:**
+
+```
+{ident} is declared multiple times
+```
+
+### KTY3002: DuplicateTypes
+
+**Severity:** Error
+"""
+
+ERR_B = """
+### KTY3001: Other
+
+**Severity:** Error
+"""
+
+
+def test_parse_sections_and_summary(tmp_path):
+    path = tmp_path / "ERR-0005.md"
+    path.write_text(ERR_A)
+    parsed = parse(path)
+
+    assert parsed.summary["KTY3002"][:3] == ("DuplicateType", "Warning", "Conflict")
+    code = parsed.sections["KTY3001"]
+    assert (code.spec, code.anchor, code.phase) == (
+        "ERR-0005",
+        "kty3001-identconflict",
+        "Parsing",
+    )
+    assert code.message == "{ident} is declared multiple times"
+
+
+def test_merge_reports_conflicts(tmp_path):
+    (tmp_path / "ERR-0005.md").write_text(ERR_A)
+    (tmp_path / "ERR-0006.md").write_text(ERR_B)
+    catalog = merge([parse(tmp_path / "ERR-0005.md"), parse(tmp_path / "ERR-0006.md")])
+
+    assert list(catalog.codes) == ["KTY3001", "KTY3002"]
+    assert catalog.codes["KTY3001"].category == "Conflict"
+    assert len(catalog.conflicts) == 3
+    assert "named 'DuplicateTypes' but 'DuplicateType'" in catalog.conflicts[0]
+    assert "severity 'Error' but 'Warning'" in catalog.conflicts[1]
+    assert "already defined by ERR-0005" in catalog.conflicts[2]
+    assert catalog.warnings == []
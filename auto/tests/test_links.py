@@ -0,0 +1,61 @@
+from docs.auto.links import check, extract
+
+
+def test_extract_skips_code():
+    found = extract("""## See [RFC-0001](/specs/rfc/rfc-0001)
+
+Mentions SPEC-0002 but not `SPEC-0003`.
+
+```
+[not](/a/link) SPEC-0004
+```
+""")
+
+    assert found.anchors == ["see-rfc-0001"]
+    assert [(r.line, r.target, r.via) for r in found.references] == [
+        (1, "/specs/rfc/rfc-0001", "link"),
+        (3, "SPEC-0002", "mention"),
+    ]
+
+
+def test_extract_nested_fences():
+    found = extract("""````md
+```kintsu
+## Not a heading
+```
+````
+
+## After [RFC-0001](/specs/rfc/rfc-0001)
+""")
+
+    assert found.anchors == ["after-rfc-0001"]
+    assert [(r.line, r.target) for r in found.references] == [
+        (7, "/specs/rfc/rfc-0001"),
+    ]
+
+
+def test_check_resolves_and_reports():
+    files = {
+        "docs/types/union.md": extract(
+            "[struct](../struct#fields) [spec](/specs/rfc/RFC-0001.md)\n"
+            "[gone](/types/gone) [todo](../spec/SPEC-000n.md) RFC-0009"
+        ),
+        "docs/types/struct.md": extract("## Fields\n"),
+        "specs/rfc/RFC-0001.md": extract("[self](#top)\n"),
+        "specs/rfc/RFC-0002.md": extract("[rfc](./RFC-0001.md)\n"),
+        "docs/summary.md": extract("[all](/specs/rfc/RFC-0002)\n"),
+    }
+    report = check(files)
+
+    assert report.graph["docs/types/union.md"] == {
+        "docs/types/struct.md",
+        "specs/rfc/RFC-0001.md",
+    }
+    assert [(p.target, p.reason) for p in report.broken] == [
+        ("/types/gone", "missing target"),
+        ("RFC-0009", "unknown spec"),
+        ("#top", "missing anchor"),
+    ]
+    assert [p.target for p in report.placeholders] == ["../spec/SPEC-000n.md"]
+    # only the generated summary links RFC-0002
+    assert report.orphans == ["specs/rfc/RFC-0002.md"]
@@ -0,0 +1,69 @@
+from docs.auto.navigation import build
+from docs.auto.types import (
+    Component,
+    Language,
+    Spec,
+    SpecCategory,
+    SpecKind,
+    SpecStatus,
+)
+
+
+def kind(kind_id: str, category: str) -> SpecKind:
+    return SpecKind(kind_id, kind_id, "", category, [], [])
+
+
+def spec(kind_id: str, number: int, status: SpecStatus, components) -> Spec:
+    return Spec(
+        kind=kind_id,
+        number=number,
+        title=f"{kind_id} {number}",
+        author="testgh",
+        created="2025-10-30",
+        status=status,
+        components=components,
+        updates=[],
+        version_after="0.1.0",
+    )
+
+
+def test_build_navigation():
+    lang = Language(
+        current_version="0.1.0",
+        versions=["0.1.0"],
+        components=[
+            Component("compiler", "Compiler", "", "C"),
+            Component("cli", "CLI", "", "L"),
+        ],
+        spec_kinds=[kind("RFC", "core"), kind("UNIT", "test")],
+        spec_categories=[
+            SpecCategory("core", "Core", ""),
+            SpecCategory("test", "Test", ""),
+        ],
+    )
+    nav = build(
+        lang,
+        [
+            spec("RFC", 1, SpecStatus.Draft, ["compiler"]),
+            spec("RFC", 2, SpecStatus.Accepted, ["compiler", "parser"]),
+            spec("UNIT", 1, "draft", []),
+        ],
+    )
+
+    assert [(c["id"], [k["specs"] for k in c["kinds"]]) for c in nav["categories"]] == [
+        ("core", [["RFC-0001", "RFC-0002"]]),
+        ("test", [["UNIT-0001"]]),
+    ]
+    assert nav["specs"]["RFC-0002"]["route"] == "/specs/rfc/RFC-0002"
+    assert (nav["specs"]["RFC-0002"]["prev"], nav["specs"]["RFC-0002"]["next"]) == (
+        "RFC-0001",
+        "UNIT-0001",
+    )
+    assert nav["specs"]["RFC-0001"]["prev"] is None
+    assert nav["components"] == {
+        "compiler": ["RFC-0001", "RFC-0002"],
+        "cli": [],
+        "parser": ["RFC-0002"],
+    }
+    assert nav["statuses"]["draft"] == ["RFC-0001", "UNIT-0001"]
+    assert nav["statuses"]["stable"] == []
@@ -0,0 +1,101 @@
+import pytest
+
+from docs.auto.query import QueryError, SpecIndex, version_key
+from docs.auto.types import Spec, SpecStatus, SpecUpdate
+
+
+def spec(kind, number, status, components, created, after, before=None) -> Spec:
+    return Spec(
+        kind=kind,
+        number=number,
+        title=f"{kind} {number}",
+        author="testgh",
+        created=created,
+        status=status,
+        components=components,
+        updates=[SpecUpdate(author="testgh", date=created, description="Created")],
+        version_after=after,
+        version_before=before,
+    )
+
+
+@pytest.fixture
+def index() -> SpecIndex:
+    return SpecIndex.build(
+        [
+            spec("RFC", 1, SpecStatus.Draft, ["compiler"], "2025-10-30", "0.1.0"),
+            spec("SPEC", 1, SpecStatus.Draft, ["parser"], "2025-11-02", "0.1.0"),
+            spec(
+                "SPEC",
+                2,
+                SpecStatus.Accepted,
+                ["compiler"],
+                "2025-12-25",
+                "0.1.0",
+                "0.2.0",
+            ),
+            spec(
+                "SPEC",
+                3,
+                SpecStatus.Proposed,
+                ["compiler", "cli"],
+                "2026-01-05",
+                "0.2.0",
+            ),
+        ]
+    )
+
+
+def ids(index: SpecIndex, query: str) -> list[str]:
+    return [s.qualified_id() for s in index.query(query)]
+
+
+def test_equality_and_implicit_and(index):
+    assert ids(index, "kind=spec components=compiler") == ["SPEC-0002", "SPEC-0003"]
+    assert ids(index, "status:draft,proposed") == ["RFC-0001", "SPEC-0001", "SPEC-0003"]
+    assert ids(index, "") == ids(index, "number>=1")
+
+
+def test_boolean_operators(index):
+    assert ids(index, "kind=RFC or (status=accepted and not components=parser)") == [
+        "RFC-0001",
+        "SPEC-0002",
+    ]
+    assert ids(index, "components!=compiler") == ["SPEC-0001"]
+
+
+def test_ranges(index):
+    assert ids(index, "created>=2025-11-01 created<2026-01-01") == [
+        "SPEC-0001",
+        "SPEC-0002",
+    ]
+    assert ids(index, "version_after>0.1.0") == ["SPEC-0003"]
+    assert ids(index, "version_before<=0.2.0") == ["SPEC-0002"]
+    assert ids(index, "version=0.2.0") == ["RFC-0001", "SPEC-0001", "SPEC-0003"]
+    assert ids(index, "version=0.1.5") == ["RFC-0001", "SPEC-0001", "SPEC-0002"]
+
+
+def test_errors(index):
+    with pytest.raises(QueryError, match="Unknown field"):
+        index.query("colour=red")
+    with pytest.raises(QueryError, match="only supports"):
+        index.query("kind>RFC")
+    with pytest.raises(QueryError, match="parenthesis"):
+        index.query("(kind=RFC")
+
+
+def test_version_key_follows_semver():
+    ordered = [
+        "0.1.0-alpha",
+        "0.1.0-alpha.1",
+        "0.1.0-alpha.beta",
+        "0.1.0-beta.2",
+        "0.1.0-beta.11",
+        "0.1.0-rc.1",
+        "0.1.0",
+        "0.1.1",
+        "0.2.0",
+        "0.10.0",
+    ]
+    assert sorted(reversed(ordered), key=version_key) == ordered
+    assert version_key("1.0.0+build.5") == version_key("1.0.0")
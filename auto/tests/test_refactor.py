@@ -0,0 +1,74 @@
+from docs.auto.refactor import (
+    Automaton,
+    Mapping,
+    apply,
+    component_spans,
+    plan,
+    replacements,
+    rewrite,
+)
+
+SPEC = """---
+components:
+  - parser
+kind: RFC
+number: 19
+---
+
+# RFC-0019: Manifest
+
+The parser reads [RFC-0020](/specs/rfc/rfc-0020), not RFC-00190.
+"""
+
+
+def test_automaton_finds_overlapping_patterns():
+    automaton = Automaton(["he", "she", "his", "hers"])
+    found = sorted(
+        (s, e, automaton.patterns[i]) for s, e, i in automaton.find("ushers")
+    )
+    assert found == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+
+def test_rewrite_swaps_in_one_pass():
+    targets = replacements(
+        [
+            Mapping("RFC-0019", "RFC-0020", "spec"),
+            Mapping("RFC-0020", "RFC-0019", "spec"),
+            Mapping("parser", "syntax", "component"),
+        ]
+    )
+    text, count = rewrite(
+        SPEC, Automaton(list(targets)), list(targets.values()), component_spans(SPEC)
+    )
+
+    assert count == 4
+    assert "  - syntax\n" in text
+    assert "# RFC-0020: Manifest" in text
+    assert "The parser reads [RFC-0019](/specs/rfc/rfc-0019), not RFC-00190." in text
+
+
+def test_plan_moves_specs_across_kinds(tmp_path):
+    (tmp_path / "specs" / "rfc").mkdir(parents=True)
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "specs" / "rfc" / "RFC-0019.md").write_text(SPEC)
+    (tmp_path / "docs" / "index.md").write_text("See ../rfc/RFC-0019.md\n")
+    registry = tmp_path / "components.yaml"
+    registry.write_text("- id: parser\n  name: Parser\n")
+
+    result = plan(
+        [
+            Mapping("RFC-0019", "SPEC-0003", "spec"),
+            Mapping("parser", "syntax", "component"),
+        ],
+        tmp_path,
+        registry,
+    )
+    apply(result)
+
+    assert len(result.moves) == 1
+    assert not (tmp_path / "specs" / "rfc" / "RFC-0019.md").exists()
+    moved = (tmp_path / "specs" / "spec" / "SPEC-0003.md").read_text()
+    assert "kind: SPEC\nnumber: 3\n" in moved
+    assert "# SPEC-0003: Manifest" in moved
+    assert (tmp_path / "docs" / "index.md").read_text() == "See ../spec/SPEC-0003.md\n"
+    assert registry.read_text() == "- id: syntax\n  name: Parser\n"
@@ -0,0 +1,80 @@
+from pathlib import Path
+
+from docs.auto.search import (
+    decode_postings,
+    encode_postings,
+    index_file,
+    shard_of,
+    tokens,
+    url_for,
+)
+
+
+def test_tokens_keep_compounds():
+    assert tokens("Set `version_after` to 0.1.0, see RFC-0019.") == [
+        "set",
+        "version_after",
+        "to",
+        "0.1.0",
+        "see",
+        "rfc-0019",
+    ]
+
+
+def test_postings_round_trip():
+    postings = [(0, [1, 5, 9]), (3, [0]), (10, [2, 4])]
+
+    assert decode_postings(encode_postings(postings)) == postings
+
+
+def test_index_spec():
+    md = """---
+kind: RFC
+number: 1
+status: draft
+title: Builtin Types
+---
+
+## The `str` type
+
+A [string](../spec/SPEC-0001.md) of type-registry entries.
+
+```rust
+let code = indexed;
+```
+"""
+    entry = index_file(Path("specs/rfc/RFC-0001.md"), md)
+
+    assert entry.url == "/specs/rfc/RFC-0001"
+    assert entry.title_length == 2
+    assert entry.sections == [[2, "The str type", "the-str-type"]]
+    assert entry.terms["kind:rfc"] == entry.terms["status:draft"] == []
+    assert "the" not in entry.terms
+    assert entry.terms["string"] == [6]
+    assert entry.terms["type-registry"] == entry.terms["registry"] == [8]
+    assert entry.terms["type"] == [4, 8]
+    assert "let" in entry.terms
+
+
+def test_index_mixed_fences():
+    md = """# Title
+
+```md
+~~~
+## not a heading
+```
+
+## Heading
+"""
+    entry = index_file(Path("docs/page.md"), md)
+
+    assert [s[1] for s in entry.sections] == ["Title", "Heading"]
+    # code keeps its text, the real heading follows it
+    assert entry.terms["heading"] == [4, 5]
+
+
+def test_urls_and_shards():
+    assert url_for(Path("docs/index.mdx")) == "/"
+    assert url_for(Path("docs/syntax/Builtin.md")) == "/syntax/builtin/"
+    assert shard_of("kind:rfc") == "ki"
+    assert shard_of("é") == "_"
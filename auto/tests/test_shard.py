@@ -0,0 +1,62 @@
+import pytest
+
+from docs.auto.shard import (
+    Shard,
+    ShardReport,
+    load_costs,
+    merge,
+    partition,
+    select,
+    store_costs,
+)
+
+
+def test_parse_shard():
+    assert Shard.parse("2/4") == Shard(2, 4)
+    assert str(Shard(2, 4)) == "2/4"
+    for bad in ("0/4", "5/4", "2", "a/b"):
+        with pytest.raises(ValueError):
+            Shard.parse(bad)
+
+
+def test_partition_balances_costs():
+    costs = {"a": 8.0, "b": 4.0, "c": 3.0, "d": 1.0}
+    shards = partition(["d", "c", "b", "a", "e"], costs, 2)
+
+    # "e" has no recorded cost and counts as the mean (4.0)
+    assert shards == [["a", "c"], ["b", "d", "e"]]
+    # independent of the input order
+    assert partition(["a", "b", "c", "d", "e"], costs, 2) == shards
+
+
+def test_select_keeps_item_order():
+    items = ["x", "y", "z"]
+    selected = [select(items, Shard(i, 2), {}) for i in (1, 2)]
+
+    assert sorted(selected[0] + selected[1]) == items
+    assert all(s == [i for i in items if i in s] for s in selected)
+
+
+def test_merge_reports():
+    items = ["a", "b", "c"]
+    reports = [
+        ShardReport.new("t", Shard(i, 2), items, costs={k: 1.0 for k in part})
+        for i, part in enumerate(partition(items, {}, 2), start=1)
+    ]
+
+    assert merge(reports).costs == {"a": 1.0, "b": 1.0, "c": 1.0}
+    with pytest.raises(ValueError, match="missing shards 2/2"):
+        merge(reports[:1])
+    other = ShardReport.new("t", Shard(2, 2), ["a", "b"], costs={"b": 1.0})
+    with pytest.raises(ValueError, match="different item lists"):
+        merge([reports[0], other])
+
+
+def test_store_costs(tmp_path):
+    path = tmp_path / ".cache" / "shard-costs.json"
+    assert load_costs(path) == {}
+
+    store_costs(path, {"a": 1.23456, "b": 2.0})
+    store_costs(path, {"b": 3.0})
+
+    assert load_costs(path) == {"a": 1.2346, "b": 3.0}
@@ -0,0 +1,50 @@
+import pytest
+
+from docs.auto import similar as similar_module
+from docs.auto.similar import (
+    band_rows,
+    body,
+    shingles,
+    signature,
+    similar,
+    similarity,
+)
+from docs.auto.types import SpecDocument
+
+TEXT = " ".join(f"word{i}" for i in range(200))
+
+
+def test_signature_estimates_jaccard():
+    first, second = shingles(TEXT), shingles(TEXT.replace("word100 ", ""))
+    exact = len(first & second) / len(first | second)
+
+    assert abs(similarity(signature(first), signature(second)) - exact) < 0.1
+
+
+def test_numpy_signature_matches_python(monkeypatch):
+    pytest.importorskip("numpy")
+    hashes = shingles(TEXT) | {0, 2**32 - 1}
+    vectorized = signature(hashes)
+    monkeypatch.setattr(similar_module, "np", None)
+
+    assert vectorized == signature(hashes)
+
+
+def test_similar_finds_near_duplicates():
+    signatures = {
+        "a": signature(shingles(TEXT)),
+        "b": signature(shingles(TEXT.replace("word150", "other"))),
+        "c": signature(shingles(TEXT.replace("word", "term"))),
+    }
+    pairs = similar(signatures, 0.5)
+
+    assert [(p.first, p.second) for p in pairs] == [("a", "b")]
+    assert band_rows(0.8) > band_rows(0.3)
+
+
+def test_body_skips_frontmatter_and_references():
+    doc = SpecDocument.parse(
+        "---\nkind: RFC\n---\n# RFC-0001\n\n## Abstract\n\nText.\n\n"
+        "## References\n\n- [RFC-0002](./RFC-0002.md)\n\n## Appendix\n\nMore.\n"
+    )
+    assert body(doc) == "# RFC-0001\n\n## Abstract\n\nText.\n\n## Appendix\n\nMore."
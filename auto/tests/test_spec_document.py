@@ -0,0 +1,59 @@
+from docs.auto.types import SpecDocument
+
+MD = """---
+kind: RFC
+number: 7
+---
+
+# RFC-0007: Example
+
+## Abstract
+
+Short.
+
+## Specification
+
+| Field | Type   |
+| ----- | ------ |
+| name  | string |
+
+### Syntax
+
+```kintsu
+# not a heading
+struct A {}
+```
+
+## References
+"""
+
+
+def test_headings_and_sections():
+    doc = SpecDocument.parse(MD)
+
+    assert doc.frontmatter == {"kind": "RFC", "number": 7}
+    assert [h.title for h in doc.tree] == ["RFC-0007: Example"]
+    assert [h.title for h in doc.tree[0].children] == [
+        "Abstract",
+        "Specification",
+        "References",
+    ]
+    assert [h.title for h in doc.sections["Specification"].children] == ["Syntax"]
+    assert doc.section("Abstract") == "Short."
+    assert doc.section("Missing") is None
+
+
+def test_tables_and_code_blocks():
+    doc = SpecDocument.parse(MD)
+
+    assert doc.tables_in("Specification")[0].records() == [
+        {"Field": "name", "Type": "string"}
+    ]
+    assert doc.tables_in("Abstract") == []
+    (block,) = doc.code_blocks_in("Syntax")
+    assert (block.language, block.code) == ("kintsu", "# not a heading\nstruct A {}")
+
+
+def test_parse_is_cached_per_content():
+    assert SpecDocument.parse(MD) is SpecDocument.parse(MD)
+    assert SpecDocument.parse(MD + "\n") is not SpecDocument.parse(MD)
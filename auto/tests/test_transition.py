@@ -0,0 +1,85 @@
+from datetime import date
+
+from docs.auto.transition import run, transition_head
+from docs.auto.types import SpecStatus, SpecUpdate
+
+UPDATE = SpecUpdate(author="octocat", date=date(2026, 1, 2), description="Ready")
+
+SPEC = b"""---
+kind: RFC
+status: draft
+updates:
+  - author: testgh
+    date: 2025-10-30
+    description: Created
+---
+
+# RFC-0001
+
+status: draft is not frontmatter\r
+"""
+
+
+def test_transition_head_appends_update():
+    assert transition_head(
+        "status: draft\nupdates: []\n", SpecStatus.Proposed, UPDATE
+    ) == (
+        "status: proposed\nupdates:\n"
+        "  - author: octocat\n    date: 2026-01-02\n    description: Ready\n"
+    )
+
+
+def test_run_only_rewrites_frontmatter(tmp_path):
+    first, second = tmp_path / "RFC-0001.md", tmp_path / "RFC-0002.md"
+    first.write_bytes(SPEC)
+    second.write_bytes(SPEC)
+
+    changes = run([first, second], SpecStatus.Proposed, UPDATE)
+
+    assert [c.old for c in changes] == [SpecStatus.Draft, SpecStatus.Draft]
+    head, body = first.read_bytes().split(b"---\n\n", 1)
+    assert b"status: proposed\n" in head
+    assert head.endswith(
+        b"    description: Created\n  - author: octocat\n"
+        b"    date: 2026-01-02\n    description: Ready\n"
+    )
+    assert body == SPEC.split(b"---\n\n", 1)[1]
+
+
+def test_unindented_updates(tmp_path):
+    path = tmp_path / "RFC-0001.md"
+    path.write_bytes(SPEC.replace(b"\n  ", b"\n"))
+
+    [change] = run([path], SpecStatus.Accepted, UPDATE)
+
+    assert change.error is None
+    assert b"\n- author: testgh\n  date: 2025-10-30\n" in path.read_bytes()
+    assert b"\n- author: octocat\n  date: 2026-01-02\n" in path.read_bytes()
+
+
+def test_invalid_transition_writes_nothing(tmp_path):
+    draft, accepted = tmp_path / "RFC-0001.md", tmp_path / "RFC-0002.md"
+    draft.write_bytes(SPEC)
+    original = SPEC.replace(b"status: draft\nupdates", b"status: accepted\nupdates")
+    accepted.write_bytes(original)
+
+    changes = run([draft, accepted], SpecStatus.Unstable, UPDATE)
+
+    assert changes[0].error == "cannot move from draft to unstable"
+    assert changes[1].error is None
+    assert draft.read_bytes() == SPEC
+    assert accepted.read_bytes() == original
+
+
+def test_unsupported_updates_are_reported(tmp_path):
+    flow, draft = tmp_path / "RFC-0001.md", tmp_path / "RFC-0002.md"
+    original = b"---\nstatus: draft\nupdates: [{author: a, date: 2025-10-30}]\n---\n"
+    flow.write_bytes(original)
+    draft.write_bytes(SPEC)
+
+    changes = run([flow, draft], SpecStatus.Proposed, UPDATE)
+
+    assert changes[0].error.startswith("cannot update frontmatter")
+    assert changes[1].error is None
+    assert flow.read_bytes() == original
+    assert draft.read_bytes() == SPEC
@@ -0,0 +1,140 @@
+"""
+Bulk spec status transitions that only touch the frontmatter.
+
+For every selected spec the byte range between the opening and closing
+``---`` is located, its ``status`` line replaced and a ``SpecUpdate`` entry
+appended to ``updates`` (matching the list indentation already used). The
+document body is copied through as bytes, never re-split or re-rendered as
+``Spec.update_markdown_head`` does.
+
+Specs are prepared in parallel and checked against ``STATUS_TRANSITIONS``
+before anything is written; each file is then written to a temporary sibling
+and moved into place with ``os.replace``.
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from yaml import YAMLError
+from yaml import safe_dump as write_yaml
+from yaml import safe_load as load_yaml
+
+from auto.types import SpecStatus, SpecUpdate
+
+_FRONTMATTER = re.compile(rb"\A---\r?\n(.*?\r?\n)---[ \t]*\r?$", re.S | re.M)
+_STATUS = re.compile(r"^status:.*$", re.M)
+# block list items may be indented or start at the key's column
+_UPDATES = re.compile(r"^updates:[ \t]*(\[\])?[ \t]*\n((?:(?:[ \t]+|- ).*\n)*)", re.M)
+_ITEM = re.compile(r"^([ \t]*)- ", re.M)
+
+
+class TransitionError(ValueError):
+    pass
+
+
+def frontmatter_range(data: bytes) -> tuple[int, int]:
+    """Byte offsets of the YAML between the frontmatter fences."""
+    m = _FRONTMATTER.match(data)
+    if m is None:
+        raise TransitionError("no frontmatter")
+    return m.span(1)
+
+
+def update_entry(update: SpecUpdate, indent: str) -> str:
+    lines = write_yaml([asdict(update)], sort_keys=False).splitlines()
+    return "".join(f"{indent}{line}\n" for line in lines)
+
+
+def transition_head(head: str, status: SpecStatus, update: SpecUpdate) -> str:
+    """Frontmatter ``head`` moved to ``status`` with ``update`` appended."""
+    if _STATUS.search(head):
+        head = _STATUS.sub(f"status: {status.value}", head, count=1)
+    else:
+        head += f"status: {status.value}\n"
+
+    m = _UPDATES.search(head)
+    if m is None:
+        if re.search(r"^updates:", head, re.M):
+            raise TransitionError("updates is not a block list")
+        return head + "updates:\n" + update_entry(update, "  ")
+    item = _ITEM.search(m.group(2))
+    indent = item.group(1) if item else "  "
+    entries = "" if m.group(1) else m.group(2)
+    return (
+        head[: m.start()]
+        + "updates:\n"
+        + entries
+        + update_entry(update, indent)
+        + head[m.end() :]
+    )
+
+
+@dataclass
+class Change:
+    path: Path
+    spec: str
+    old: SpecStatus | None
+    new: SpecStatus
+    data: bytes = b""
+    error: str | None = None
+
+    @property
+    def skipped(self) -> bool:
+        return self.old == self.new
+
+
+def prepare(path: Path, status: SpecStatus, update: SpecUpdate) -> Change:
+    """Read ``path`` and build its transitioned content, without writing."""
+    change = Change(path, path.stem, None, status)
+    data = path.read_bytes()
+    try:
+        start, end = frontmatter_range(data)
+        head = data[start:end].decode()
+        current = (load_yaml(head) or {}).get("status")
+        change.old = SpecStatus(current)
+    except (TransitionError, YAMLError, ValueError) as e:
+        change.error = f"cannot read status: {e}"
+        return change
+
+    if change.skipped:
+        return change
+    if not change.old.can_become(status):
+        change.error = f"cannot move from {change.old} to {status}"
+        return change
+
+    try:
+        new_head = transition_head(head, status, update)
+        parsed = load_yaml(new_head)
+    except (TransitionError, YAMLError) as e:
+        change.error = f"cannot update frontmatter: {e}"
+        return change
+    if parsed.get("status") != status.value or not parsed.get("updates"):
+        change.error = "frontmatter could not be updated"
+        return change
+    change.data = data[:start] + new_head.encode() + data[end:]
+    return change
+
+
+def write(change: Change):
+    tmp = change.path.with_name(change.path.name + ".tmp")
+    tmp.write_bytes(change.data)
+    os.replace(tmp, change.path)
+
+
+def run(
+    paths: list[Path],
+    status: SpecStatus,
+    update: SpecUpdate,
+    dry_run: bool = False,
+    workers: int | None = None,
+) -> list[Change]:
+    """Transition every spec in ``paths``, or none if any move is invalid."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        changes = list(pool.map(lambda p: prepare(p, status, update), paths))
+        if dry_run or any(c.error for c in changes):
+            return changes
+        list(pool.map(write, [c for c in changes if not c.skipped]))
+    return changes
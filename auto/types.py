@@ -1,8 +1,12 @@
-from dataclasses import asdict, dataclass
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
 from datetime import date
 from enum import StrEnum
+from functools import cached_property
+import hashlib
 from json import dumps as write_json
 import os
+import re
 from pathlib import Path
 from shutil import copy2
 from typing import Callable, ParamSpec, TypeVar
@@ -45,6 +49,25 @@ class SpecStatus(StrEnum):
 
     Deprecated = "deprecated"
 
+    def can_become(self, status: "SpecStatus") -> bool:
+        return status in STATUS_TRANSITIONS[self]
+
+
+# allowed lifecycle moves, checked by `doc-manager transition`
+STATUS_TRANSITIONS: dict[SpecStatus, set[SpecStatus]] = {
+    SpecStatus.Draft: {SpecStatus.Proposed, SpecStatus.Accepted, SpecStatus.Rejected},
+    SpecStatus.Proposed: {SpecStatus.Draft, SpecStatus.Accepted, SpecStatus.Rejected},
+    SpecStatus.Accepted: {
+        SpecStatus.Unstable,
+        SpecStatus.Stable,
+        SpecStatus.Deprecated,
+    },
+    SpecStatus.Rejected: {SpecStatus.Draft},
+    SpecStatus.Unstable: {SpecStatus.Stable, SpecStatus.Deprecated},
+    SpecStatus.Stable: {SpecStatus.Deprecated},
+    SpecStatus.Deprecated: set(),
+}
+
 
 class Serde:
     @classmethod
@@ -251,6 +274,13 @@ class Language:
             specs.extend(kind_specs)
         return specs
 
+    def spec_paths(self) -> list[Path]:
+        """Every spec file, sorted by path."""
+        paths = []
+        for kind in self.spec_kinds:
+            paths.extend(SPEC_DIR.glob(f"{kind.id.lower()}/{kind.id}*.md"))
+        return sorted(paths)
+
 
 @dataclass
 class SpecUpdate(Serde):
@@ -338,8 +368,223 @@ class Spec(Serde):
             return 1
         return nums[-1] + 1
 
+    @classmethod
+    def load_from_dict(cls, data: dict) -> "Spec":
+        data = dict(data)
+        updates = [SpecUpdate(**u) for u in data.pop("updates", [])]
+        if "status" in data:
+            data["status"] = SpecStatus(data["status"])
+        return cls(**data, updates=updates)
+
     @classmethod
     def write_to_dict(cls, instance: "Spec") -> dict:
         instance_dict = super().write_to_dict(instance)
         instance_dict["status"] = str(instance.status.value)
         return instance_dict
+
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.+?)(?:\s+#+)?\s*$")
+_FENCE = re.compile(r"^\s{0,3}(`{3,}|~{3,})\s*([^\s`]*)")
+_TABLE_DELIMITER = re.compile(r"^\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$")
+
+
+def _cells(line: str) -> list[str]:
+    return [c.strip() for c in line.strip().strip("|").split("|")]
+
+
+@dataclass
+class Heading:
+    level: int
+    title: str
+    # 1-based line of the heading, and the line its section ends before
+    line: int
+    end: int
+    children: list["Heading"] = field(default_factory=list)
+
+
+@dataclass
+class Table:
+    line: int
+    header: list[str]
+    rows: list[list[str]]
+
+    def records(self) -> list[dict[str, str]]:
+        return [dict(zip(self.header, row)) for row in self.rows]
+
+
+@dataclass
+class CodeBlock:
+    line: int
+    language: str
+    code: str
+
+
+class SpecDocument:
+    """
+    A parsed spec (or any content file), shared by the tools reading it.
+
+    Nothing is parsed up front: the frontmatter, headings, tables and code
+    blocks are each scanned on first access. Documents are cached per content
+    hash, so every tool calling ``SpecDocument.read`` on an unchanged file
+    reuses the same parse. Line numbers are 1-based lines of the whole file.
+    """
+
+    CACHE_SIZE = 512
+    _cache: "OrderedDict[str, SpecDocument]" = OrderedDict()
+
+    def __init__(self, text: str, sha256: str | None = None):
+        self.text = text
+        self.sha256 = sha256 or hashlib.sha256(text.encode()).hexdigest()
+
+    @classmethod
+    def parse(cls, text: str) -> "SpecDocument":
+        sha256 = hashlib.sha256(text.encode()).hexdigest()
+        if (document := cls._cache.get(sha256)) is not None:
+            cls._cache.move_to_end(sha256)
+            return document
+        document = cls._cache[sha256] = cls(text, sha256)
+        if len(cls._cache) > cls.CACHE_SIZE:
+            cls._cache.popitem(last=False)
+        return document
+
+    @classmethod
+    def read(cls, path: Path) -> "SpecDocument":
+        return cls.parse(path.read_text())
+
+    @cached_property
+    def lines(self) -> list[str]:
+        return self.text.splitlines()
+
+    @cached_property
+    def body_start(self) -> int:
+        """Index into ``lines`` of the first line after the frontmatter."""
+        if not self.lines or self.lines[0].strip() != "---":
+            return 0
+        for i, line in enumerate(self.lines[1:], start=1):
+            if line.strip() == "---":
+                return i + 1
+        return 0
+
+    @cached_property
+    def frontmatter(self) -> dict:
+        if not self.body_start:
+            return {}
+        head = load_yaml("\n".join(self.lines[1 : self.body_start - 1]))
+        return head if isinstance(head, dict) else {}
+
+    @cached_property
+    def spec(self) -> "Spec":
+        return Spec.load_from_dict(self.frontmatter)
+
+    @cached_property
+    def _blocks(self) -> tuple[list[CodeBlock], list[bool]]:
+        blocks, fenced = [], [False] * len(self.lines)
+        fence, start = None, 0
+        for i in range(self.body_start, len(self.lines)):
+            m = _FENCE.match(self.lines[i])
+            if fence is None:
+                if m:
+                    fence, start, language = m.group(1), i, m.group(2)
+                    fenced[i] = True
+                continue
+            fenced[i] = True
+            if m and m.group(1)[0] == fence[0] and len(m.group(1)) >= len(fence):
+                if not m.group(2):
+                    code = "\n".join(self.lines[start + 1 : i])
+                    blocks.append(CodeBlock(start + 1, language, code))
+                    fence = None
+        if fence is not None:
+            # unclosed, runs to the end of the file
+            code = "\n".join(self.lines[start + 1 :])
+            blocks.append(CodeBlock(start + 1, language, code))
+        return blocks, fenced
+
+    @property
+    def code_blocks(self) -> list[CodeBlock]:
+        return self._blocks[0]
+
+    @property
+    def fenced(self) -> list[bool]:
+        """Per line, whether it belongs to a fenced code block (fences included)."""
+        return self._blocks[1]
+
+    @cached_property
+    def headings(self) -> list[Heading]:
+        """Every heading in document order, outside fenced code."""
+        fenced = self.fenced
+        found: list[Heading] = []
+        for i in range(self.body_start, len(self.lines)):
+            if not fenced[i] and (m := _HEADING.match(self.lines[i])):
+                found.append(Heading(len(m.group(1)), m.group(2), i + 1, 0))
+        for i, heading in enumerate(found):
+            heading.end = len(self.lines) + 1
+            for later in found[i + 1 :]:
+                if later.level <= heading.level:
+                    heading.end = later.line
+                    break
+        return found
+
+    @cached_property
+    def tree(self) -> list[Heading]:
+        """Top-level headings, with nested headings as their children."""
+        roots: list[Heading] = []
+        stack: list[Heading] = []
+        for heading in self.headings:
+            heading.children = []
+            while stack and stack[-1].level >= heading.level:
+                stack.pop()
+            (stack[-1].children if stack else roots).append(heading)
+            stack.append(heading)
+        return roots
+
+    @cached_property
+    def sections(self) -> dict[str, Heading]:
+        """Heading title -> heading, the first one for repeated titles."""
+        found = {}
+        for heading in self.headings:
+            found.setdefault(heading.title, heading)
+        return found
+
+    def section(self, name: str) -> str | None:
+        """Text under heading ``name``, subsections included."""
+        heading = self.sections.get(name)
+        if heading is None:
+            return None
+        return self.text_under(heading)
+
+    def text_under(self, heading: Heading) -> str:
+        """Text under ``heading``, subsections included."""
+        return "\n".join(self.lines[heading.line : heading.end - 1]).strip("\n")
+
+    @cached_property
+    def tables(self) -> list[Table]:
+        fenced = self.fenced
+        found, i = [], self.body_start
+        while i < len(self.lines) - 1:
+            line = self.lines[i]
+            if (
+                fenced[i]
+                or not line.lstrip().startswith("|")
+                or not _TABLE_DELIMITER.match(self.lines[i + 1])
+            ):
+                i += 1
+                continue
+            table = Table(i + 1, _cells(line), [])
+            i += 2
+            while i < len(self.lines) and self.lines[i].lstrip().startswith("|"):
+                table.rows.append(_cells(self.lines[i]))
+                i += 1
+            found.append(table)
+        return found
+
+    def _within(self, name: str, items: list) -> list:
+        heading = self.sections.get(name)
+        if heading is None:
+            return []
+        return [item for item in items if heading.line < item.line < heading.end]
+
+    def tables_in(self, name: str) -> list[Table]:
+        return self._within(name, self.tables)
+
+    def code_blocks_in(self, name: str) -> list[CodeBlock]:
+        return self._within(name, self.code_blocks)
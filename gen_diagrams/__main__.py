@@ -0,0 +1,215 @@
+import os
+from pathlib import Path
+
+import typer
+
+from gen_diagrams import manifest
+from gen_diagrams.assets import DEFAULT_TARGETS, optimize_assets
+from gen_diagrams.benchmark import measure, table, violations, write_report
+from gen_diagrams.common import benchmark_max_nodes, benchmark_max_seconds
+from gen_diagrams.declarative import DefinitionError, load_all
+from gen_diagrams.references import DIAGRAM_DIR, diagram_outputs, scan
+from gen_diagrams.render import OPTIONS
+from gen_diagrams.runner import (
+    definition_paths,
+    diagram_modules,
+    run_batch,
+    source_path,
+)
+from gen_diagrams.shard import Shard, load_costs, merge_reports, select, store_costs
+from gen_diagrams.shard import write_report as write_shard_report
+from gen_diagrams.watch import watch
+
+app = typer.Typer(
+    name="gen-diagrams",
+    help="Render and profile the Kintsu documentation diagrams.",
+)
+
+# recorded seconds per diagram module, see shard.py
+SHARD_COSTS = OPTIONS.cache_dir / "shard-costs.json"
+
+
+def parse_shard(value: str) -> Shard:
+    try:
+        return Shard.parse(value)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+
+@app.command()
+def render(
+    modules: list[str] = typer.Argument(
+        None, help="Diagram modules to render (default: all)"
+    ),
+    referenced_only: bool = typer.Option(
+        False, help="Only render diagrams embedded somewhere under src/content"
+    ),
+    shard: Shard = typer.Option(
+        None,
+        parser=parse_shard,
+        help="Only render shard i/n of the diagrams (e.g. 2/4), see merge-shards",
+    ),
+    shard_dir: Path = typer.Option(
+        None, help="Directory for shard reports (default: <cache_dir>/shards)"
+    ),
+):
+    modules = modules or diagram_modules()
+    if referenced_only:
+        used = set(scan().referenced_modules)
+        modules = [m for m in modules if m in used]
+    selected = modules
+    if shard is not None:
+        selected = select(modules, shard, load_costs(SHARD_COSTS))
+    try:
+        seconds = run_batch(selected)
+    except DefinitionError as e:
+        print(e)
+        raise typer.Exit(code=1)
+    if shard is not None:
+        path = write_shard_report(
+            shard_dir or OPTIONS.cache_dir / "shards", shard, modules, seconds
+        )
+        print(f"Rendered {len(selected)} of {len(modules)} diagrams, report in {path}")
+
+
+@app.command("merge-shards")
+def merge_shards(
+    shard_dir: Path = typer.Option(
+        None, help="Directory for shard reports (default: <cache_dir>/shards)"
+    ),
+):
+    """Check a sharded render is complete, then write the diagram manifest.
+
+    The images of every shard must already be collected under diagrams/.
+    """
+    shard_dir = shard_dir or OPTIONS.cache_dir / "shards"
+    try:
+        costs = merge_reports(shard_dir)
+    except ValueError as e:
+        print(e)
+        raise typer.Exit(code=1)
+    missing = [
+        name
+        for name, module in diagram_outputs().items()
+        if module in costs and not any(DIAGRAM_DIR.glob(f"{name}.*"))
+    ]
+    if missing:
+        print(f"Missing outputs of rendered diagrams: {', '.join(sorted(missing))}")
+        raise typer.Exit(code=1)
+    store_costs(SHARD_COSTS, costs)
+    print(f"Merged {len(costs)} rendered diagrams")
+    manifest_command()
+
+
+@app.command()
+def check():
+    """Validate every declarative diagram definition without rendering."""
+    paths = list(definition_paths().values())
+    try:
+        load_all(paths)
+    except DefinitionError as e:
+        print(e)
+        raise typer.Exit(code=1)
+    print(f"{len(paths)} definitions valid")
+
+
+@app.command()
+def refs():
+    """Report unreferenced diagrams and references to missing ones."""
+    report = scan()
+    print(f"{len(report.used)} diagrams referenced, {len(report.produced)} generated")
+
+    if report.unreferenced:
+        print("\nUnreferenced diagrams:")
+        for name in report.unreferenced:
+            print(f"- {name} ({os.path.relpath(source_path(report.produced[name]))})")
+
+    if report.missing:
+        print("\nReferences to missing diagrams:")
+        for ref in report.missing:
+            print(f"- {ref.source}:{ref.line}: {ref.target}")
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def benchmark(
+    engine: list[str] = typer.Option(["dot"], help="Layout engines to time"),
+    format: list[str] = typer.Option(["png", "svg"], help="Output formats to time"),
+    max_nodes: int = typer.Option(
+        benchmark_max_nodes, help="Fail when a diagram has more nodes"
+    ),
+    max_seconds: float = typer.Option(
+        benchmark_max_seconds, help="Fail when a layout takes longer (seconds)"
+    ),
+    output: Path = typer.Option(
+        None, help="JSON report path (default: <cache_dir>/benchmark.json)"
+    ),
+):
+    stats = []
+    for module in diagram_modules():
+        stats.extend(measure(module, engine, format, max_seconds))
+
+    output = output or OPTIONS.cache_dir / "benchmark.json"
+    write_report(stats, output)
+    print(table(stats))
+    print(f"\nWrote benchmark report to {output}")
+
+    problems = violations(stats, max_nodes, max_seconds)
+    if problems:
+        print("\nOver budget:")
+        for problem in problems:
+            print(f"- {problem}")
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def optimize(
+    targets: list[Path] = typer.Argument(
+        None,
+        help="Files or directories to optimize (default: diagrams and kintsu.json)",
+    ),
+    brotli: bool = typer.Option(False, help="Also write .br siblings"),
+    workers: int = typer.Option(None, help="Worker processes (default: CPU count)"),
+):
+    results = optimize_assets(
+        targets or DEFAULT_TARGETS,
+        OPTIONS.cache_dir / "assets.json",
+        use_brotli=brotli,
+        workers=workers,
+    )
+    changed = [r for r in results if not r.skipped]
+    saved = sum(r.size_before - r.size_after for r in changed)
+    written = sum(len(r.written) for r in changed)
+    print(
+        f"Optimized {len(changed)} of {len(results)} assets "
+        f"({len(results) - len(changed)} unchanged), "
+        f"wrote {written} files, saved {saved} bytes"
+    )
+
+
+@app.command("manifest")
+def manifest_command():
+    """Write diagrams/manifest.json with image sizes and hashes for srcset."""
+    path, changed = manifest.write()
+    print(f"{'Wrote' if changed else 'Unchanged'} {path}")
+
+
+@app.command("watch")
+def watch_command(
+    interval: float = typer.Option(0.3, help="Polling interval in seconds"),
+    layout_cache: bool = typer.Option(
+        True, help="Reuse cached layouts while iterating"
+    ),
+):
+    if layout_cache:
+        # set in the environment so reloads of the render pipeline keep it
+        os.environ["GEN_DIAGRAMS_LAYOUT_CACHE"] = "1"
+        OPTIONS.layout_cache = True
+    try:
+        watch(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    app()
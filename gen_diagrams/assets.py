@@ -0,0 +1,131 @@
+"""
+Post-build optimization of generated assets.
+
+PNGs are recompressed losslessly and text assets (SVG, JSON, markdown) get
+precompressed ``.gz`` (and optionally ``.br``) siblings so static hosting can
+serve them without compressing on the fly. Work is spread over a process
+pool, and files whose content hash matches the previous run are skipped.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from gen_diagrams.images import recompress_png
+
+try:
+    import brotli
+except ImportError:  # optional, only needed for .br siblings
+    brotli = None
+
+DEFAULT_TARGETS = [Path("diagrams"), Path("src/assets/kintsu.json")]
+
+RASTER_SUFFIXES = frozenset({".png"})
+PRECOMPRESS_SUFFIXES = frozenset(
+    {".svg", ".json", ".md", ".html", ".css", ".js", ".xml"}
+)
+
+
+@dataclass
+class AssetResult:
+    path: str
+    digest: str
+    size_before: int
+    size_after: int
+    written: list[str] = field(default_factory=list)
+    skipped: bool = False
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def siblings(path: Path, use_brotli: bool) -> list[Path]:
+    if path.suffix not in PRECOMPRESS_SUFFIXES:
+        return []
+    out = [path.with_name(path.name + ".gz")]
+    if use_brotli:
+        out.append(path.with_name(path.name + ".br"))
+    return out
+
+
+def process(path: Path, use_brotli: bool) -> AssetResult:
+    data = path.read_bytes()
+    result = AssetResult(str(path), "", len(data), len(data))
+
+    if path.suffix in RASTER_SUFFIXES:
+        optimized = recompress_png(data)
+        if optimized != data:
+            _write_atomic(path, optimized)
+            data = optimized
+            result.written.append(str(path))
+
+    for sibling in siblings(path, use_brotli):
+        if sibling.suffix == ".gz":
+            packed = gzip.compress(data, compresslevel=9, mtime=0)
+        else:
+            packed = brotli.compress(data, quality=11)
+        _write_atomic(sibling, packed)
+        result.written.append(str(sibling))
+
+    result.size_after = len(data)
+    result.digest = _digest(data)
+    return result
+
+
+def collect(targets: list[Path]) -> list[Path]:
+    suffixes = RASTER_SUFFIXES | PRECOMPRESS_SUFFIXES
+    files = []
+    for target in targets:
+        candidates = sorted(target.rglob("*")) if target.is_dir() else [target]
+        files.extend(p for p in candidates if p.is_file() and p.suffix in suffixes)
+    return files
+
+
+def optimize_assets(
+    targets: list[Path],
+    state_path: Path,
+    use_brotli: bool = False,
+    workers: int | None = None,
+) -> list[AssetResult]:
+    """Optimize every asset under ``targets`` that changed since the last run."""
+    if use_brotli and brotli is None:
+        raise RuntimeError("Writing .br files requires the 'brotli' package")
+
+    state: dict[str, str] = {}
+    if state_path.exists():
+        state = json.loads(state_path.read_text())
+
+    results, pending = [], []
+    for path in collect(targets):
+        data = path.read_bytes()
+        digest = _digest(data)
+        if state.get(str(path)) == digest and all(
+            s.exists() for s in siblings(path, use_brotli)
+        ):
+            results.append(
+                AssetResult(str(path), digest, len(data), len(data), skipped=True)
+            )
+        else:
+            pending.append(path)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results.extend(pool.map(process, pending, [use_brotli] * len(pending)))
+
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    state_path.write_text(
+        json.dumps(
+            {r.path: r.digest for r in sorted(results, key=lambda r: r.path)}, indent=2
+        )
+    )
+    return results
@@ -0,0 +1,132 @@
+"""
+Complexity and timing report for every diagram.
+
+For each diagram the report records its size (nodes, edges, clusters, DOT
+bytes), the layout time per engine and the drawing time per output format.
+Diagrams over the node or time budget are reported as violations so they can
+be split before they slow the docs build down.
+"""
+
+import json
+import subprocess
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from gen_diagrams import dot
+from gen_diagrams.render import capture, draw, run_layout
+from gen_diagrams.runner import run
+
+
+@dataclass
+class DiagramStats:
+    diagram: str
+    module: str
+    nodes: int
+    edges: int
+    clusters: int
+    dot_bytes: int
+    # engine -> seconds, None when the layout ran past the time budget
+    layout_seconds: dict[str, float | None] = field(default_factory=dict)
+    # format -> seconds, drawn from the first engine's layout
+    render_seconds: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def total_seconds(self) -> float:
+        layouts = [s for s in self.layout_seconds.values() if s is not None]
+        return sum(layouts[:1]) + sum(self.render_seconds.values())
+
+    def write_to_dict(self) -> dict:
+        return {**asdict(self), "total_seconds": self.total_seconds}
+
+
+def measure(
+    module: str, engines: list[str], formats: list[str], timeout: float
+) -> list[DiagramStats]:
+    with capture() as built:
+        run(module)
+
+    stats = []
+    for diagram in built:
+        source = diagram.dot.source
+        graph = dot.parse(source)
+        entry = DiagramStats(
+            diagram=Path(diagram.filename).name,
+            module=module,
+            nodes=len(graph.nodes),
+            edges=len(graph.edges),
+            clusters=len(graph.clusters),
+            dot_bytes=len(source.encode()),
+        )
+        positioned = None
+        for engine in engines:
+            start = time.perf_counter()
+            try:
+                laid_out = run_layout(source, engine, timeout)
+            except subprocess.TimeoutExpired:
+                entry.layout_seconds[engine] = None
+                continue
+            entry.layout_seconds[engine] = time.perf_counter() - start
+            positioned = positioned or laid_out
+        if positioned is not None:
+            for fmt in formats:
+                start = time.perf_counter()
+                draw(positioned, fmt)
+                entry.render_seconds[fmt] = time.perf_counter() - start
+        stats.append(entry)
+    return stats
+
+
+def violations(
+    stats: list[DiagramStats], max_nodes: int, max_seconds: float
+) -> list[str]:
+    out = []
+    for s in stats:
+        if s.nodes > max_nodes:
+            out.append(f"{s.diagram}: {s.nodes} nodes (budget {max_nodes})")
+        for engine, seconds in s.layout_seconds.items():
+            if seconds is None or seconds > max_seconds:
+                took = "timed out" if seconds is None else f"took {seconds:.2f}s"
+                out.append(
+                    f"{s.diagram}: {engine} layout {took} (budget {max_seconds:.2f}s)"
+                )
+    return out
+
+
+def table(stats: list[DiagramStats]) -> str:
+    """Plain-text table, slowest diagram first."""
+    engines = list(dict.fromkeys(e for s in stats for e in s.layout_seconds))
+    formats = list(dict.fromkeys(f for s in stats for f in s.render_seconds))
+    header = ["diagram", "nodes", "edges", "clusters", "dot bytes"]
+    header += [f"{e} layout" for e in engines] + [f"{f} render" for f in formats]
+    header.append("total")
+
+    def seconds(value: float | None) -> str:
+        return "timeout" if value is None else f"{value:.3f}s"
+
+    rows = [header]
+    for s in sorted(stats, key=lambda s: s.total_seconds, reverse=True):
+        rows.append(
+            [s.diagram, str(s.nodes), str(s.edges), str(s.clusters), str(s.dot_bytes)]
+            + [
+                seconds(s.layout_seconds.get(e)) if e in s.layout_seconds else "-"
+                for e in engines
+            ]
+            + [
+                seconds(s.render_seconds[f]) if f in s.render_seconds else "-"
+                for f in formats
+            ]
+            + [seconds(s.total_seconds)]
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    lines = [
+        "  ".join(cell.ljust(w) for cell, w in zip(row, widths)).rstrip()
+        for row in rows
+    ]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    return "\n".join(lines)
+
+
+def write_report(stats: list[DiagramStats], path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps([s.write_to_dict() for s in stats], indent=2))
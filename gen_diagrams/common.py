@@ -5,9 +5,72 @@ graph_attr = {
     "splines": "ortho",
     "nodesep": "0.8",
     "ranksep": "1.2",
-    # "dpi": "900",
 }
 
+# raster outputs (png/jpg) are drawn at the first dpi under the plain
+# ``<name>.png`` filename the docs link to; with GEN_DIAGRAMS_RASTER_VARIANTS
+# the others are drawn too, from the same layout
+raster_dpi = [96, 192]
+
+# extra raster widths (pixels) drawn with GEN_DIAGRAMS_RASTER_VARIANTS for
+# responsive ``srcset`` images, written as ``<name>@<width>w.png``; widths
+# needing more than max(raster_dpi) are skipped since the icons would only
+# be upscaled
+raster_widths = [480, 960, 1440]
+
+# color themes diagrams can be drawn in, from the same layout (see
+# themes.py); only the first is drawn unless GEN_DIAGRAMS_THEMES lists more.
+# The first keeps the plain filenames, the others are written as
+# ``<name>@<theme>.png``
+diagram_themes = ["light", "dark"]
+
+themes = {
+    "light": {},
+    "dark": {
+        # matches the Starlight dark background
+        "defaults": {
+            "graph": {"bgcolor": "#17181c", "fontcolor": "#e6e6e6"},
+            "node": {"fontcolor": "#e6e6e6"},
+            "edge": {"color": "#aab2bb", "fontcolor": "#e6e6e6"},
+        },
+        "colors": {"white": "#17181c", "#ffffff": "#17181c", "#fff": "#17181c"},
+        "lightness": [0.1, 0.9],
+    },
+}
+
+# layout configurations tried in order whenever the previous one runs past the
+# diagram's layout budget; the last entry always runs to completion
+layout_fallbacks = [
+    {"name": "declared", "engine": None, "graph_attr": {}},
+    {
+        "name": "polyline",
+        "engine": "dot",
+        "graph_attr": {"splines": "polyline", "newrank": "true"},
+    },
+    {
+        "name": "straight",
+        "engine": "dot",
+        "graph_attr": {
+            "splines": "line",
+            "newrank": "true",
+            "mclimit": "0.5",
+            "nslimit": "2",
+        },
+    },
+]
+
+# seconds a single layout attempt may take, overridable per diagram name
+layout_budget = 15.0
+layout_budgets: dict[str, float] = {}
+
+# complexity budgets enforced by ``python -m gen_diagrams benchmark``
+benchmark_max_nodes = 100
+benchmark_max_seconds = 10.0
+
+# the spec dependency graph collapses to one node per (level, kind) group
+# once the corpus has more specs than this
+spec_graph_max_nodes = 60
+
 node_attr = {
     "fontsize": "11",
     "fontname": "Helvetica",
@@ -28,3 +91,12 @@ OPTS = dict(
 
 def diag_path(name: str) -> str:
     return f"diagrams/{name}"
+
+
+def themed_name(name: str, theme: str) -> str:
+    """Output name of ``name`` drawn in ``theme``.
+
+    The first of ``diagram_themes`` keeps the plain name whichever themes a
+    run renders, the others append ``@<theme>``.
+    """
+    return name if theme == diagram_themes[0] else f"{name}@{theme}"
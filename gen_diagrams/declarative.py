@@ -0,0 +1,346 @@
+"""
+Declarative diagram definitions.
+
+A definition is a YAML (or JSON) file under ``gen_diagrams/definitions``
+describing one diagram as data::
+
+    title: Phase Ordering
+    direction: LR
+    preset: OPTS                  # Diagram options from common.py
+    graph_attr: [graph_attr, {rankdir: TB}]
+    clusters:
+      - label: Sequential Execution
+        nodes:
+          - {id: parse, type: Action, label: "Parse"}
+          - {id: check, type: Rust, label: "Check"}
+    edges:
+      - {from: parse, to: check, label: "then"}
+      - {chain: [parse, check], style: dashed}
+
+``preset`` names a dict of ``Diagram`` keyword arguments in ``common.py``;
+``graph_attr``, ``node_attr`` and ``edge_attr`` take a mapping or a list of
+mappings and ``common.py`` dict names, merged in order. Node types are the
+class names in ``native.ICONS`` or a dotted ``diagrams`` class path. ``from``
+and ``to`` accept a single id or a list; ``chain`` connects consecutive ids.
+
+Definitions are validated as a whole before anything is drawn, so a batch
+either renders completely or reports every problem at once.
+"""
+
+import importlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+
+from gen_diagrams import common
+from gen_diagrams.native import ICONS
+
+DEFINITION_SUFFIXES = (".yaml", ".yml", ".json")
+
+DIRECTIONS = frozenset({"TB", "BT", "LR", "RL"})
+EDGE_DIRECTIONS = frozenset({"forward", "back", "both", "none"})
+
+DIAGRAM_KEYS = frozenset(
+    {
+        "title",
+        "filename",
+        "direction",
+        "curvestyle",
+        "outformat",
+        "preset",
+        "graph_attr",
+        "node_attr",
+        "edge_attr",
+        "nodes",
+        "clusters",
+        "edges",
+    }
+)
+CLUSTER_KEYS = frozenset({"label", "direction", "graph_attr", "nodes", "clusters"})
+NODE_KEYS = frozenset({"id", "type", "label", "attrs"})
+EDGE_KEYS = frozenset(
+    {"from", "to", "chain", "label", "color", "style", "dir", "attrs"}
+)
+
+# short node type name -> provider module
+NODE_TYPES = {name: module for module, icons in ICONS.items() for name in icons}
+
+
+class DefinitionError(ValueError):
+    def __init__(self, problems: list[str]):
+        self.problems = problems
+        super().__init__("\n".join(problems))
+
+
+@dataclass
+class NodeDef:
+    id: str
+    type: str
+    label: str = ""
+    attrs: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class ClusterDef:
+    label: str
+    direction: str = "LR"
+    graph_attr: dict[str, str] = field(default_factory=dict)
+    nodes: list[NodeDef] = field(default_factory=list)
+    clusters: list["ClusterDef"] = field(default_factory=list)
+
+
+@dataclass
+class EdgeDef:
+    tails: list[str]
+    heads: list[str]
+    dir: str = "forward"
+    attrs: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class Definition:
+    name: str
+    title: str
+    filename: str
+    # Diagram keyword arguments, presets already merged
+    options: dict
+    nodes: list[NodeDef] = field(default_factory=list)
+    clusters: list[ClusterDef] = field(default_factory=list)
+    edges: list[EdgeDef] = field(default_factory=list)
+
+
+def _read(path: Path) -> dict:
+    text = path.read_text()
+    data = json.loads(text) if path.suffix == ".json" else yaml.safe_load(text)
+    return data or {}
+
+
+class _Loader:
+    """Builds a :class:`Definition`, collecting problems instead of raising."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.problems: list[str] = []
+        self.node_ids: set[str] = set()
+
+    def problem(self, where: str, message: str):
+        self.problems.append(f"{self.path}: {where}: {message}")
+
+    def keys(self, where: str, data, allowed: frozenset) -> dict:
+        if not isinstance(data, dict):
+            self.problem(where, f"expected a mapping, got {type(data).__name__}")
+            return {}
+        for key in sorted(set(data) - allowed):
+            self.problem(where, f"unknown key {key!r}")
+        return data
+
+    def attrs(self, where: str, value) -> dict[str, str]:
+        if value is None:
+            return {}
+        merged = {}
+        for item in value if isinstance(value, list) else [value]:
+            if isinstance(item, str):
+                preset = getattr(common, item, None)
+                if not isinstance(preset, dict):
+                    self.problem(where, f"common.py has no attribute dict {item!r}")
+                    continue
+                item = preset
+            if not isinstance(item, dict):
+                self.problem(where, f"expected a mapping or preset name, got {item!r}")
+                continue
+            merged.update({str(k): str(v) for k, v in item.items()})
+        return merged
+
+    def direction(self, where: str, value) -> str:
+        if value not in DIRECTIONS:
+            self.problem(where, f"direction must be one of {sorted(DIRECTIONS)}")
+        return value
+
+    def node(self, where: str, data) -> NodeDef | None:
+        data = self.keys(where, data, NODE_KEYS)
+        node_id, node_type = data.get("id"), data.get("type")
+        if not isinstance(node_id, str):
+            self.problem(where, "node needs a string 'id'")
+            return None
+        where = f"node {node_id!r}"
+        if node_id in self.node_ids:
+            self.problem(where, "duplicate node id")
+        self.node_ids.add(node_id)
+        if node_type not in NODE_TYPES and "." not in str(node_type):
+            self.problem(where, f"unknown node type {node_type!r}")
+        elif node_type not in NODE_TYPES:
+            try:
+                _node_class(node_type)
+            except (ImportError, AttributeError) as e:
+                self.problem(where, f"cannot import node type {node_type!r}: {e}")
+        return NodeDef(
+            id=node_id,
+            type=str(node_type),
+            label=str(data.get("label", "")),
+            attrs=self.attrs(where, data.get("attrs")),
+        )
+
+    def nodes(self, where: str, data) -> list[NodeDef]:
+        nodes = [self.node(f"{where} node {i}", n) for i, n in enumerate(data or [])]
+        return [n for n in nodes if n is not None]
+
+    def cluster(self, where: str, data) -> ClusterDef:
+        data = self.keys(where, data, CLUSTER_KEYS)
+        label = str(data.get("label", "cluster"))
+        where = f"cluster {label!r}"
+        return ClusterDef(
+            label=label,
+            direction=self.direction(where, data.get("direction", "LR")),
+            graph_attr=self.attrs(where, data.get("graph_attr")),
+            nodes=self.nodes(where, data.get("nodes")),
+            clusters=self.clusters(where, data.get("clusters")),
+        )
+
+    def clusters(self, where: str, data) -> list[ClusterDef]:
+        return [
+            self.cluster(f"{where} cluster {i}", c) for i, c in enumerate(data or [])
+        ]
+
+    def edges(self, data) -> list[EdgeDef]:
+        edges = []
+        for i, item in enumerate(data or []):
+            where = f"edge {i}"
+            item = self.keys(where, item, EDGE_KEYS)
+            if "chain" in item:
+                if "from" in item or "to" in item:
+                    self.problem(where, "use either 'chain' or 'from'/'to'")
+                chain = item["chain"]
+                if not isinstance(chain, list) or len(chain) < 2:
+                    self.problem(where, "'chain' needs a list of at least two ids")
+                    chain = []
+                chain = [str(node_id) for node_id in chain]
+                pairs = [([a], [b]) for a, b in zip(chain, chain[1:])]
+            else:
+                pairs = [(self.ids(item.get("from")), self.ids(item.get("to")))]
+            direction = item.get("dir", "forward")
+            if direction not in EDGE_DIRECTIONS:
+                self.problem(where, f"dir must be one of {sorted(EDGE_DIRECTIONS)}")
+            attrs = self.attrs(where, item.get("attrs"))
+            attrs.update(
+                {k: str(item[k]) for k in ("label", "color", "style") if k in item}
+            )
+            for tails, heads in pairs:
+                for node_id in tails + heads:
+                    if node_id not in self.node_ids:
+                        self.problem(where, f"unknown node {node_id!r}")
+                if not tails or not heads:
+                    self.problem(where, "needs both 'from' and 'to'")
+                edges.append(EdgeDef(tails, heads, direction, attrs))
+        return edges
+
+    @staticmethod
+    def ids(value) -> list[str]:
+        if value is None:
+            return []
+        return [str(v) for v in value] if isinstance(value, list) else [str(value)]
+
+    def definition(self, data) -> Definition:
+        data = self.keys("diagram", data, DIAGRAM_KEYS)
+        options = {"show": False}
+        if "preset" in data:
+            preset = getattr(common, str(data["preset"]), None)
+            if isinstance(preset, dict):
+                options.update(preset)
+            else:
+                self.problem("preset", f"common.py has no preset {data['preset']!r}")
+        for key in ("graph_attr", "node_attr", "edge_attr"):
+            if key in data:
+                options[key] = {**options.get(key, {}), **self.attrs(key, data[key])}
+        for key in ("curvestyle", "outformat"):
+            if key in data:
+                options[key] = data[key]
+        options["direction"] = self.direction("diagram", data.get("direction", "LR"))
+
+        nodes = self.nodes("diagram", data.get("nodes"))
+        clusters = self.clusters("diagram", data.get("clusters"))
+        # edges last: every node id is known by now
+        edges = self.edges(data.get("edges"))
+        return Definition(
+            name=self.path.stem,
+            title=str(data.get("title", "")),
+            filename=str(data.get("filename", self.path.stem)),
+            options=options,
+            nodes=nodes,
+            clusters=clusters,
+            edges=edges,
+        )
+
+
+def load(path: Path) -> Definition:
+    """Read and validate one definition, raising every problem at once."""
+    loader = _Loader(path)
+    try:
+        data = _read(path)
+    except (ValueError, yaml.YAMLError) as e:
+        raise DefinitionError([f"{path}: {e}"]) from e
+    definition = loader.definition(data)
+    if loader.problems:
+        raise DefinitionError(loader.problems)
+    return definition
+
+
+def load_all(paths: list[Path]) -> list[Definition]:
+    """Validate a whole batch before anything is rendered."""
+    definitions, problems = [], []
+    for path in paths:
+        try:
+            definitions.append(load(path))
+        except DefinitionError as e:
+            problems.extend(e.problems)
+    if problems:
+        raise DefinitionError(problems)
+    return definitions
+
+
+def _node_class(node_type: str):
+    module, _, name = node_type.rpartition(".")
+    return getattr(importlib.import_module(module or NODE_TYPES[name]), name)
+
+
+def build(definition: Definition):
+    """Build (and render) the diagram through the active ``diagrams`` backend."""
+    # imported here so a definition always uses the backend installed last
+    from diagrams import Cluster, Diagram, Edge
+
+    nodes = {}
+
+    def add_nodes(defs: list[NodeDef]):
+        for node in defs:
+            nodes[node.id] = _node_class(node.type)(node.label, **node.attrs)
+
+    def add_clusters(defs: list[ClusterDef]):
+        for cluster in defs:
+            with Cluster(
+                cluster.label,
+                direction=cluster.direction,
+                graph_attr=cluster.graph_attr,
+            ):
+                add_nodes(cluster.nodes)
+                add_clusters(cluster.clusters)
+
+    with Diagram(
+        definition.title,
+        filename=common.diag_path(definition.filename),
+        **definition.options,
+    ):
+        add_nodes(definition.nodes)
+        add_clusters(definition.clusters)
+        for edge in definition.edges:
+            for tail in edge.tails:
+                for head in edge.heads:
+                    nodes[tail].connect(
+                        nodes[head],
+                        Edge(
+                            nodes[tail],
+                            forward=edge.dir in ("forward", "both"),
+                            reverse=edge.dir in ("back", "both"),
+                            **edge.attrs,
+                        ),
+                    )
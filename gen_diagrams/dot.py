@@ -0,0 +1,369 @@
+"""
+Minimal DOT reader / writer.
+
+Covers the subset of the DOT language emitted by the ``graphviz`` package
+(and by ``dot -Tdot`` once a graph has been laid out): nested subgraphs,
+default attribute statements, node and edge statements with attribute lists.
+Attribute values are kept verbatim (escape sequences such as ``\\n`` or ``\\l``
+are not interpreted) so a parsed graph can be written back without changing
+how graphviz draws it.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+KEYWORDS = frozenset({"strict", "graph", "digraph", "node", "edge", "subgraph"})
+
+_TOKEN = re.compile(
+    r"""
+    (?P<ws>\s+|//[^\n]*|^\#[^\n]*|/\*.*?\*/)
+  | (?P<str>"(?:\\.|[^"\\])*")
+  | (?P<html><)
+  | (?P<op>->|--)
+  | (?P<punct>[{}\[\];,=:+])
+  | (?P<id>-?(?:\.\d+|\d+(?:\.\d*)?)|[A-Za-z_\x80-\U0010ffff][\w\x80-\U0010ffff]*)
+    """,
+    re.S | re.X | re.M,
+)
+
+_PLAIN_ID = re.compile(r"^(?:[A-Za-z_][A-Za-z0-9_]*|-?(?:\.\d+|\d+(?:\.\d*)?))$")
+_UNESCAPED_QUOTE = re.compile(r'(?<!\\)"')
+
+
+class HTML(str):
+    """An HTML-like label (``<...>``), written back without quotes."""
+
+
+def quote(value: str) -> str:
+    if isinstance(value, HTML):
+        return f"<{value}>"
+    value = str(value)
+    if _PLAIN_ID.match(value) and value.lower() not in KEYWORDS:
+        return value
+    return '"' + _UNESCAPED_QUOTE.sub(r"\"", value) + '"'
+
+
+def attr_list(attrs: dict[str, str]) -> str:
+    return " ".join(f"{quote(k)}={quote(v)}" for k, v in attrs.items())
+
+
+@dataclass
+class Subgraph:
+    name: str
+    parent: str | None = None
+    attrs: dict[str, str] = field(default_factory=dict)
+    node_defaults: dict[str, str] = field(default_factory=dict)
+    edge_defaults: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def is_cluster(self) -> bool:
+        return self.name.startswith("cluster")
+
+
+@dataclass
+class Node:
+    id: str
+    attrs: dict[str, str] = field(default_factory=dict)
+    subgraph: str | None = None
+
+
+@dataclass
+class Edge:
+    tail: str
+    head: str
+    attrs: dict[str, str] = field(default_factory=dict)
+    subgraph: str | None = None
+
+
+@dataclass
+class Graph:
+    name: str = ""
+    directed: bool = True
+    strict: bool = False
+    attrs: dict[str, str] = field(default_factory=dict)
+    node_defaults: dict[str, str] = field(default_factory=dict)
+    edge_defaults: dict[str, str] = field(default_factory=dict)
+    subgraphs: dict[str, Subgraph] = field(default_factory=dict)
+    nodes: dict[str, Node] = field(default_factory=dict)
+    edges: list[Edge] = field(default_factory=list)
+
+    def lineage(self, subgraph: str | None) -> list[Subgraph]:
+        """Subgraphs enclosing ``subgraph``, outermost first."""
+        chain = []
+        while subgraph is not None:
+            sg = self.subgraphs[subgraph]
+            chain.append(sg)
+            subgraph = sg.parent
+        return chain[::-1]
+
+    def node_attrs(self, node: Node) -> dict[str, str]:
+        """Effective attributes of ``node`` after applying scoped defaults."""
+        attrs = dict(self.node_defaults)
+        for sg in self.lineage(node.subgraph):
+            attrs.update(sg.node_defaults)
+        attrs.update(node.attrs)
+        return attrs
+
+    def edge_attrs(self, edge: Edge) -> dict[str, str]:
+        attrs = dict(self.edge_defaults)
+        for sg in self.lineage(edge.subgraph):
+            attrs.update(sg.edge_defaults)
+        attrs.update(edge.attrs)
+        return attrs
+
+    def subgraph_attrs(self, subgraph: Subgraph) -> dict[str, str]:
+        attrs = dict(self.attrs)
+        for sg in self.lineage(subgraph.name):
+            attrs.update(sg.attrs)
+        return attrs
+
+    @property
+    def clusters(self) -> list[Subgraph]:
+        return [sg for sg in self.subgraphs.values() if sg.is_cluster]
+
+    def source(self) -> str:
+        kind = "digraph" if self.directed else "graph"
+        head = f"{'strict ' if self.strict else ''}{kind}"
+        if self.name:
+            head += f" {quote(self.name)}"
+        lines = [head + " {"]
+        self._write_body(None, lines, 1)
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+    def _write_body(self, scope: str | None, lines: list[str], depth: int):
+        indent = "\t" * depth
+        op = " -> " if self.directed else " -- "
+        if scope is None:
+            attrs, node_defaults, edge_defaults = (
+                self.attrs,
+                self.node_defaults,
+                self.edge_defaults,
+            )
+        else:
+            sg = self.subgraphs[scope]
+            attrs, node_defaults, edge_defaults = (
+                sg.attrs,
+                sg.node_defaults,
+                sg.edge_defaults,
+            )
+        for keyword, values in (
+            ("graph", attrs),
+            ("node", node_defaults),
+            ("edge", edge_defaults),
+        ):
+            if values:
+                lines.append(f"{indent}{keyword} [{attr_list(values)}]")
+        for sg in self.subgraphs.values():
+            if sg.parent == scope:
+                lines.append(f"{indent}subgraph {quote(sg.name)} {{")
+                self._write_body(sg.name, lines, depth + 1)
+                lines.append(f"{indent}}}")
+        for node in self.nodes.values():
+            if node.subgraph == scope:
+                stmt = f"{indent}{quote(node.id)}"
+                if node.attrs:
+                    stmt += f" [{attr_list(node.attrs)}]"
+                lines.append(stmt)
+        for edge in self.edges:
+            if edge.subgraph == scope:
+                stmt = f"{indent}{quote(edge.tail)}{op}{quote(edge.head)}"
+                if edge.attrs:
+                    stmt += f" [{attr_list(edge.attrs)}]"
+                lines.append(stmt)
+
+
+def _tokenize(source: str) -> list[tuple[str, str]]:
+    tokens = []
+    pos = 0
+    while pos < len(source):
+        m = _TOKEN.match(source, pos)
+        if m is None:
+            raise ValueError(f"Unexpected character {source[pos]!r} at {pos}")
+        kind = m.lastgroup
+        if kind == "html":
+            depth, end = 0, pos
+            while True:
+                if end >= len(source):
+                    raise ValueError(f"Unterminated HTML string at {pos}")
+                if source[end] == "<":
+                    depth += 1
+                elif source[end] == ">":
+                    depth -= 1
+                    if depth == 0:
+                        break
+                end += 1
+            tokens.append(("html", source[pos + 1 : end]))
+            pos = end + 1
+            continue
+        if kind == "str":
+            # graphviz wraps long strings with a backslash-newline continuation
+            tokens.append(("str", m.group()[1:-1].replace("\\\n", "")))
+        elif kind != "ws":
+            tokens.append((kind, m.group()))
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, source: str):
+        self.tokens = _tokenize(source)
+        self.pos = 0
+        self.graph = Graph()
+        self._anonymous = 0
+        self._members: list[list[str]] = []
+
+    def peek(self, offset: int = 0) -> tuple[str, str] | None:
+        i = self.pos + offset
+        return self.tokens[i] if i < len(self.tokens) else None
+
+    def take(self) -> tuple[str, str]:
+        tok = self.peek()
+        if tok is None:
+            raise ValueError("Unexpected end of DOT source")
+        self.pos += 1
+        return tok
+
+    def expect(self, value: str):
+        kind, text = self.take()
+        if text != value or kind == "str":
+            raise ValueError(f"Expected {value!r}, found {text!r}")
+
+    def at(self, value: str) -> bool:
+        tok = self.peek()
+        return tok is not None and tok[0] in ("punct", "op") and tok[1] == value
+
+    def at_keyword(self, keyword: str) -> bool:
+        tok = self.peek()
+        return tok is not None and tok[0] == "id" and tok[1].lower() == keyword
+
+    def ident(self) -> str:
+        kind, text = self.take()
+        if kind not in ("id", "str", "html"):
+            raise ValueError(f"Expected identifier, found {text!r}")
+        if kind == "html":
+            return HTML(text)
+        while kind == "str" and self.at("+"):
+            self.take()
+            kind, more = self.take()
+            text += more
+        return text
+
+    def parse(self) -> Graph:
+        if self.at_keyword("strict"):
+            self.take()
+            self.graph.strict = True
+        _, kind = self.take()
+        self.graph.directed = kind.lower() == "digraph"
+        if not self.at("{"):
+            self.graph.name = self.ident()
+        self.expect("{")
+        self.statements(None)
+        self.expect("}")
+        return self.graph
+
+    def statements(self, scope: str | None):
+        while not self.at("}"):
+            self.statement(scope)
+            if self.at(";") or self.at(","):
+                self.take()
+
+    def scope_attrs(self, scope: str | None, keyword: str) -> dict[str, str]:
+        owner = self.graph if scope is None else self.graph.subgraphs[scope]
+        return {
+            "graph": owner.attrs,
+            "node": owner.node_defaults,
+            "edge": owner.edge_defaults,
+        }[keyword]
+
+    def attributes(self) -> dict[str, str]:
+        attrs = {}
+        while self.at("["):
+            self.take()
+            while not self.at("]"):
+                key = self.ident()
+                value = "true"
+                if self.at("="):
+                    self.take()
+                    value = self.ident()
+                attrs[key] = value
+                if self.at(",") or self.at(";"):
+                    self.take()
+            self.take()
+        return attrs
+
+    def statement(self, scope: str | None):
+        for keyword in ("graph", "node", "edge"):
+            if self.at_keyword(keyword) and self.peek(1) == ("punct", "["):
+                self.take()
+                self.scope_attrs(scope, keyword).update(self.attributes())
+                return
+        if self.at_keyword("subgraph") or self.at("{"):
+            operand = self.subgraph(scope)
+        else:
+            ident = self.ident()
+            if self.at("="):
+                self.take()
+                self.scope_attrs(scope, "graph")[ident] = self.ident()
+                return
+            operand = self.endpoint(ident, scope)
+        if self.peek() is not None and self.peek()[0] == "op":
+            self.edge_chain(operand, scope)
+        elif operand[1] is not None:
+            # a plain node statement; ports on node statements are ignored
+            self.graph.nodes[operand[0][0]].attrs.update(self.attributes())
+
+    def endpoint(self, ident: str, scope: str | None) -> tuple[list[str], str]:
+        port = ""
+        if self.at(":"):
+            self.take()
+            port = self.ident()
+            if self.at(":"):
+                self.take()
+                port += ":" + self.ident()
+        if ident not in self.graph.nodes:
+            self.graph.nodes[ident] = Node(ident, subgraph=scope)
+        for members in self._members:
+            members.append(ident)
+        return [ident], port
+
+    def subgraph(self, scope: str | None) -> tuple[list[str], None]:
+        name = None
+        if self.at_keyword("subgraph"):
+            self.take()
+            if not self.at("{"):
+                name = self.ident()
+        if name is None:
+            self._anonymous += 1
+            name = f"%{self._anonymous}"
+        if name not in self.graph.subgraphs:
+            self.graph.subgraphs[name] = Subgraph(name, parent=scope)
+        self._members.append([])
+        self.expect("{")
+        self.statements(name)
+        self.expect("}")
+        return list(dict.fromkeys(self._members.pop())), None
+
+    def edge_chain(self, operand: tuple[list[str], str | None], scope: str | None):
+        operands = [operand]
+        while self.peek() is not None and self.peek()[0] == "op":
+            self.take()
+            if self.at_keyword("subgraph") or self.at("{"):
+                operands.append(self.subgraph(scope))
+            else:
+                operands.append(self.endpoint(self.ident(), scope))
+        attrs = self.attributes()
+        for (tails, tailport), (heads, headport) in zip(operands, operands[1:]):
+            for tail in tails:
+                for head in heads:
+                    edge_attrs = dict(attrs)
+                    if tailport:
+                        edge_attrs.setdefault("tailport", tailport)
+                    if headport:
+                        edge_attrs.setdefault("headport", headport)
+                    self.graph.edges.append(Edge(tail, head, edge_attrs, scope))
+
+
+def parse(source: str) -> Graph:
+    """Parse a single DOT graph."""
+    return _Parser(source).parse()
@@ -0,0 +1,119 @@
+"""
+Helpers for the raster files the pipeline reads and writes.
+"""
+
+import io
+import shutil
+import struct
+import subprocess
+import zlib
+
+try:
+    from PIL import Image, ImageChops
+except ImportError:  # optional, enables pixel comparison of re-encoded PNGs
+    Image = None
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def is_png(data: bytes) -> bool:
+    return data.startswith(PNG_SIGNATURE)
+
+
+def png_size(data: bytes) -> tuple[int, int]:
+    """(width, height) in pixels, read from the IHDR chunk."""
+    if not is_png(data) or data[12:16] != b"IHDR":
+        raise ValueError("Not a PNG image")
+    return struct.unpack(">II", data[16:24])
+
+
+# ancillary chunks that only carry metadata; everything else is kept as is
+DROPPED_CHUNKS = frozenset({b"tEXt", b"zTXt", b"iTXt", b"tIME"})
+
+
+def _chunks(data: bytes):
+    pos = len(PNG_SIGNATURE)
+    while pos < len(data):
+        if pos + 12 > len(data):
+            raise ValueError("Truncated PNG chunk")
+        (length,) = struct.unpack(">I", data[pos : pos + 4])
+        if pos + 12 + length > len(data):
+            raise ValueError("Truncated PNG chunk")
+        kind = data[pos + 4 : pos + 8]
+        yield kind, data[pos + 8 : pos + 8 + length]
+        pos += 12 + length
+
+
+def _chunk(kind: bytes, body: bytes) -> bytes:
+    crc = zlib.crc32(kind + body) & 0xFFFFFFFF
+    return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", crc)
+
+
+def recompress_png(data: bytes) -> bytes:
+    """Losslessly shrink a PNG.
+
+    Uses ``oxipng`` when it is installed; otherwise the image data is
+    re-deflated at maximum compression into a single IDAT chunk and metadata
+    chunks are dropped. The original bytes are returned when nothing is gained.
+    """
+    if not is_png(data):
+        raise ValueError("Not a PNG image")
+
+    oxipng = shutil.which("oxipng")
+    if oxipng:
+        proc = subprocess.run(
+            [oxipng, "--opt", "4", "--strip", "safe", "--stdout", "-"],
+            input=data,
+            capture_output=True,
+            check=True,
+        )
+        out = proc.stdout
+    else:
+        head, idat, tail = [], [], []
+        for kind, body in _chunks(data):
+            if kind == b"IDAT":
+                idat.append(body)
+            elif kind in DROPPED_CHUNKS:
+                continue
+            else:
+                (tail if idat else head).append(_chunk(kind, body))
+        pixels = zlib.decompress(b"".join(idat))
+        compressor = zlib.compressobj(9, zlib.DEFLATED, zlib.MAX_WBITS, 9)
+        packed = compressor.compress(pixels) + compressor.flush()
+        out = PNG_SIGNATURE + b"".join(head) + _chunk(b"IDAT", packed) + b"".join(tail)
+    return out if len(out) < len(data) else data
+
+
+def png_scanlines(data: bytes) -> tuple[bytes, bytes]:
+    """(IHDR body, decompressed image data) of a PNG."""
+    header, idat = b"", []
+    for kind, body in _chunks(data):
+        if kind == b"IHDR":
+            header = body
+        elif kind == b"IDAT":
+            idat.append(body)
+    return header, zlib.decompress(b"".join(idat))
+
+
+def same_png(a: bytes, b: bytes, tolerance: int = 2) -> bool:
+    """Whether two PNGs show the same picture.
+
+    Files differing only in compression or metadata are always detected.
+    With Pillow installed, images whose pixels differ by at most
+    ``tolerance`` per channel (anti-aliasing noise) also count as the same.
+    """
+    if a == b:
+        return True
+    header_a, pixels_a = png_scanlines(a)
+    header_b, pixels_b = png_scanlines(b)
+    if header_a[:8] != header_b[:8]:
+        # different dimensions
+        return False
+    if header_a == header_b and pixels_a == pixels_b:
+        return True
+    if Image is None:
+        return False
+    image_a = Image.open(io.BytesIO(a)).convert("RGBA")
+    image_b = Image.open(io.BytesIO(b)).convert("RGBA")
+    extrema = ImageChops.difference(image_a, image_b).getextrema()
+    return max(high for _, high in extrema) <= tolerance
@@ -0,0 +1,243 @@
+"""
+Layout caching.
+
+Most diagram edits only touch colors, fonts or label text, none of which move
+anything on the canvas. A layout is keyed by the graph *topology*: the
+cluster tree, the nodes and edges in declaration order, and the attributes
+that graphviz feeds into positioning. Node ids are not part of the key since
+``diagrams`` generates a fresh uuid for every node on each run; nodes,
+clusters and edges are addressed by their declaration index instead.
+
+When a cached layout matches, the positions are written back onto the newly
+built graph and the drawing is done with ``neato -n2``, which skips layout
+entirely and uses the ``pos``/``bb`` attributes as given.
+"""
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from gen_diagrams import dot
+
+# graph attributes read by the dot layout (drawing-only ones such as bgcolor,
+# pad or fontcolor are deliberately absent)
+GRAPH_LAYOUT_ATTRS = frozenset(
+    {
+        "rankdir",
+        "ranksep",
+        "nodesep",
+        "splines",
+        "newrank",
+        "ordering",
+        "compound",
+        "concentrate",
+        "clusterrank",
+        "nslimit",
+        "nslimit1",
+        "mclimit",
+        "searchsize",
+        "remincross",
+        "ratio",
+        "size",
+        "margin",
+        "label",
+        "labelloc",
+        "labeljust",
+        "fontsize",
+        "fontname",
+    }
+)
+
+NODE_LAYOUT_ATTRS = frozenset(
+    {
+        "shape",
+        "width",
+        "height",
+        "fixedsize",
+        "margin",
+        "peripheries",
+        "orientation",
+        "regular",
+        "sides",
+        "group",
+        "ordering",
+        "xlabel",
+    }
+)
+
+# only change a node's size when the node is not fixed size
+NODE_LABEL_ATTRS = frozenset({"label", "fontsize", "fontname"})
+
+EDGE_LAYOUT_ATTRS = frozenset(
+    {
+        "label",
+        "xlabel",
+        "headlabel",
+        "taillabel",
+        "fontsize",
+        "fontname",
+        "minlen",
+        "weight",
+        "constraint",
+        "headport",
+        "tailport",
+        "samehead",
+        "sametail",
+        "lhead",
+        "ltail",
+    }
+)
+
+SUBGRAPH_LAYOUT_ATTRS = frozenset(
+    {"label", "labelloc", "labeljust", "fontsize", "fontname", "margin", "rank"}
+)
+
+GRAPH_GEOMETRY = ("bb", "lp", "lwidth", "lheight")
+SUBGRAPH_GEOMETRY = ("bb", "lp", "lwidth", "lheight")
+NODE_GEOMETRY = ("pos", "width", "height", "rects")
+EDGE_GEOMETRY = ("pos", "lp", "xlp", "head_lp", "tail_lp")
+
+
+def _pick(attrs: dict[str, str], keys) -> dict[str, str]:
+    return {k: attrs[k] for k in sorted(keys) if k in attrs}
+
+
+def _edge_slots(graph: dot.Graph) -> list[tuple[str, str, int]]:
+    """(tail, head, occurrence) per edge, stable across a graphviz round trip."""
+    seen: dict[tuple[str, str], int] = {}
+    slots = []
+    for edge in graph.edges:
+        pair = (edge.tail, edge.head)
+        seen[pair] = seen.get(pair, -1) + 1
+        slots.append((edge.tail, edge.head, seen[pair]))
+    return slots
+
+
+def topology_key(graph: dot.Graph, engine: str = "dot") -> str:
+    """Hash of everything in ``graph`` that can move nodes or edges."""
+    node_index = {node_id: i for i, node_id in enumerate(graph.nodes)}
+    subgraph_index = {name: i for i, name in enumerate(graph.subgraphs)}
+
+    def node_key(node: dot.Node):
+        attrs = graph.node_attrs(node)
+        keys = NODE_LAYOUT_ATTRS
+        if attrs.get("fixedsize", "false").lower() not in ("true", "shape"):
+            keys = keys | NODE_LABEL_ATTRS
+        return [subgraph_index.get(node.subgraph), _pick(attrs, keys)]
+
+    topology = {
+        "engine": engine,
+        "directed": graph.directed,
+        "strict": graph.strict,
+        "graph": _pick(graph.attrs, GRAPH_LAYOUT_ATTRS),
+        "subgraphs": [
+            [
+                subgraph_index.get(sg.parent),
+                sg.is_cluster,
+                _pick(graph.subgraph_attrs(sg), SUBGRAPH_LAYOUT_ATTRS),
+            ]
+            for sg in graph.subgraphs.values()
+        ],
+        "nodes": [node_key(node) for node in graph.nodes.values()],
+        "edges": [
+            [
+                node_index[edge.tail],
+                node_index[edge.head],
+                _pick(graph.edge_attrs(edge), EDGE_LAYOUT_ATTRS),
+            ]
+            for edge in graph.edges
+        ],
+    }
+    encoded = json.dumps(topology, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+@dataclass
+class Layout:
+    key: str
+    graph: dict[str, str] = field(default_factory=dict)
+    subgraphs: list[dict[str, str]] = field(default_factory=list)
+    nodes: list[dict[str, str]] = field(default_factory=list)
+    edges: list[dict[str, str]] = field(default_factory=list)
+
+    @classmethod
+    def extract(cls, key: str, original: dot.Graph, positioned: dot.Graph) -> "Layout":
+        """Collect the geometry graphviz computed for ``original``.
+
+        ``positioned`` is the output of ``dot -Tdot`` for ``original``; both
+        are walked in the declaration order of ``original``.
+        """
+        positioned_edges = dict(zip(_edge_slots(positioned), positioned.edges))
+        return cls(
+            key=key,
+            graph=_pick(positioned.attrs, GRAPH_GEOMETRY),
+            subgraphs=[
+                (
+                    _pick(positioned.subgraphs[name].attrs, SUBGRAPH_GEOMETRY)
+                    if name in positioned.subgraphs
+                    else {}
+                )
+                for name in original.subgraphs
+            ],
+            nodes=[
+                _pick(positioned.nodes[node_id].attrs, NODE_GEOMETRY)
+                for node_id in original.nodes
+            ],
+            edges=[
+                (
+                    _pick(positioned_edges[slot].attrs, EDGE_GEOMETRY)
+                    if slot in positioned_edges
+                    else {}
+                )
+                for slot in _edge_slots(original)
+            ],
+        )
+
+    def apply(self, graph: dot.Graph) -> dot.Graph:
+        """Write the cached geometry onto ``graph`` (in place)."""
+        graph.attrs.update(self.graph)
+        for sg, geometry in zip(graph.subgraphs.values(), self.subgraphs):
+            sg.attrs.update(geometry)
+        for node, geometry in zip(graph.nodes.values(), self.nodes):
+            node.attrs.update(geometry)
+        for edge, geometry in zip(graph.edges, self.edges):
+            edge.attrs.update(geometry)
+        return graph
+
+    def write_to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def load_from_dict(cls, data: dict) -> "Layout":
+        return cls(**data)
+
+
+class LayoutCache:
+    """One JSON layout per diagram, stored under ``root``."""
+
+    def __init__(self, root: Path, version: str = ""):
+        self.root = root
+        self.version = version
+
+    def path_for(self, name: str) -> Path:
+        return self.root / f"{name}.layout.json"
+
+    def load(self, name: str, key: str) -> Layout | None:
+        path = self.path_for(name)
+        if not path.exists():
+            return None
+        try:
+            data = json.loads(path.read_text())
+        except ValueError:
+            return None
+        if data.get("version") != self.version or data["layout"]["key"] != key:
+            return None
+        return Layout.load_from_dict(data["layout"])
+
+    def store(self, name: str, layout: Layout):
+        path = self.path_for(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps({"version": self.version, "layout": layout.write_to_dict()})
+        )
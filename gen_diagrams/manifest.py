@@ -0,0 +1,101 @@
+"""
+Size manifest for the rendered diagram images.
+
+``diagrams/manifest.json`` maps every diagram to its PNG files (the plain
+``<name>.png`` plus the ``@<dpi>dpi`` and ``@<width>w`` variants) with their
+intrinsic dimensions, byte sizes and content hashes, so the site can emit
+``srcset`` images with a fixed aspect ratio instead of shifting the layout
+once each image loads. Images of the other themes (``<name>@dark.png`` and
+its variants) are listed under ``themes``::
+
+    {
+      "phase_ordering": {
+        "src": "phase_ordering.png",
+        "width": 1532, "height": 412, "bytes": 48213, "sha256": "...",
+        "variants": [{"src": "phase_ordering@480w.png", "width": 480, ...}, ...],
+        "themes": {"dark": {"src": "phase_ordering@dark.png", ...}}
+      }
+    }
+
+Run it after ``optimize`` so the sizes and hashes describe the files that
+are deployed.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from gen_diagrams.common import diagram_themes, themed_name
+from gen_diagrams.common import themes as theme_presets
+from gen_diagrams.images import png_size
+from gen_diagrams.references import DIAGRAM_DIR, VARIANT
+
+MANIFEST_NAME = "manifest.json"
+
+
+def image_entry(path: Path, root: Path) -> dict:
+    data = path.read_bytes()
+    width, height = png_size(data)
+    return {
+        "src": path.relative_to(root).as_posix(),
+        "width": width,
+        "height": height,
+        "bytes": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+
+
+def theme_of(path: Path) -> str:
+    """Theme an image is drawn in, the inverse of ``common.themed_name``."""
+    for token in path.stem.split("@")[1:]:
+        if token in theme_presets and token != diagram_themes[0]:
+            return token
+    return diagram_themes[0]
+
+
+def themed_entry(name: str, theme: str, entries: list[dict]) -> dict | None:
+    """Base image entry with every variant, smallest first."""
+    src = f"{themed_name(name, theme)}.png"
+    base = next((e for e in entries if e["src"] == src), None)
+    if base is None:
+        return None
+    return {
+        **base,
+        "variants": sorted(entries, key=lambda e: (e["width"], e["src"])),
+    }
+
+
+def build(root: Path = DIAGRAM_DIR) -> dict[str, dict]:
+    """Diagram name -> base image entry of the first theme, with the others."""
+    images: dict[str, dict[str, list[dict]]] = {}
+    for path in sorted(root.rglob("*.png")):
+        name = VARIANT.sub("", path.relative_to(root).with_suffix("").as_posix())
+        themes = images.setdefault(name, {})
+        themes.setdefault(theme_of(path), []).append(image_entry(path, root))
+
+    manifest = {}
+    for name, themes in sorted(images.items()):
+        entry = themed_entry(name, diagram_themes[0], themes.get(diagram_themes[0], []))
+        if entry is None:
+            continue
+        others = {
+            theme: themed_entry(name, theme, themes[theme])
+            for theme in theme_presets
+            if theme != diagram_themes[0] and theme in themes
+        }
+        others = {theme: e for theme, e in others.items() if e is not None}
+        manifest[name] = {**entry, "themes": others} if others else entry
+    return manifest
+
+
+def write(root: Path = DIAGRAM_DIR) -> tuple[Path, bool]:
+    """Write ``<root>/manifest.json``; returns (path, whether it changed)."""
+    path = root / MANIFEST_NAME
+    data = json.dumps(build(root), indent=2) + "\n"
+    if path.exists() and path.read_text() == data:
+        return path, False
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(data)
+    os.replace(tmp, path)
+    return path, True
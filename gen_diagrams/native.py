@@ -0,0 +1,512 @@
+"""
+Native diagram builder.
+
+Implements the part of the ``diagrams`` API the scripts use (``Diagram``,
+``Cluster``, ``Edge``, the ``>>``/``<<``/``-`` operators and the node classes
+listed in :data:`ICONS`) and writes the DOT source directly instead of going
+through ``graphviz.Digraph``. Importing ``diagrams`` pulls in every provider
+module and resolves each icon path per node; here icons come from a
+precomputed map resolved once against the installed ``diagrams`` resources.
+
+The generated source matches what ``diagrams`` produces statement for
+statement (same attributes, same ordering), apart from node ids: nodes are
+numbered per diagram instead of getting a random uuid, which also makes the
+DOT output reproducible.
+
+Enabled with ``GEN_DIAGRAMS_BACKEND=native``: :func:`install` registers the
+builder under the ``diagrams`` module names, so the scripts run unchanged.
+"""
+
+import importlib.util
+import sys
+import types
+from contextvars import ContextVar
+from functools import cache
+from pathlib import Path
+
+from gen_diagrams import dot
+
+# provider module -> node class -> icon, relative to the resources directory
+# shipped with the ``diagrams`` package
+ICONS = {
+    "diagrams.generic.blank": {"Blank": "generic/blank/blank.png"},
+    "diagrams.generic.compute": {"Rack": "generic/compute/rack.png"},
+    "diagrams.generic.storage": {"Storage": "generic/storage/storage.png"},
+    "diagrams.programming.flowchart": {
+        "Action": "programming/flowchart/action.png",
+        "Database": "programming/flowchart/database.png",
+        "Decision": "programming/flowchart/decision.png",
+        "Document": "programming/flowchart/document.png",
+        "InputOutput": "programming/flowchart/input-output.png",
+        "InternalStorage": "programming/flowchart/internal-storage.png",
+        "PredefinedProcess": "programming/flowchart/predefined-process.png",
+    },
+    "diagrams.programming.language": {"Rust": "programming/language/rust.png"},
+}
+
+_diagram: ContextVar["Diagram | None"] = ContextVar("diagram", default=None)
+_cluster: ContextVar["Cluster | None"] = ContextVar("cluster", default=None)
+
+
+@cache
+def resources_dir() -> Path | None:
+    """The ``resources`` directory of the installed ``diagrams`` package.
+
+    Located without importing the package; None when it is not installed, in
+    which case nodes are drawn without their icon.
+    """
+    spec = importlib.util.find_spec("diagrams")
+    if spec is None or spec.origin is None:
+        return None
+    return Path(spec.origin).parent.parent / "resources"
+
+
+def _attrs(attrs: dict[str, str]) -> str:
+    # graphviz sorts attribute lists, keep the same order
+    return " ".join(f"{dot.quote(k)}={dot.quote(v)}" for k, v in sorted(attrs.items()))
+
+
+def _attr_list(label: str | None, attrs: dict[str, str]) -> str:
+    items = [f"label={dot.quote(label)}"] if label is not None else []
+    if attrs:
+        items.append(_attrs(attrs))
+    return f" [{' '.join(items)}]" if items else ""
+
+
+class Graph:
+    """DOT statements of a diagram or cluster, in declaration order."""
+
+    engine = "dot"
+
+    def __init__(self, name: str, strict: bool = False):
+        self.name = name
+        self.strict = strict
+        self.graph_attr: dict[str, str] = {}
+        self.node_attr: dict[str, str] = {}
+        self.edge_attr: dict[str, str] = {}
+        self.body: list[str] = []
+
+    def node(self, nodeid: str, label: str | None = None, **attrs):
+        self.body.append(f"\t{dot.quote(nodeid)}{_attr_list(label, attrs)}\n")
+
+    def edge(self, tail: str, head: str, label: str | None = None, **attrs):
+        edge = f"{dot.quote(tail)} -> {dot.quote(head)}"
+        self.body.append(f"\t{edge}{_attr_list(label, attrs)}\n")
+
+    def subgraph(self, graph: "Graph"):
+        self.body += [f"\t{line}" for line in graph.lines(subgraph=True)]
+
+    def lines(self, subgraph: bool = False) -> list[str]:
+        name = f"{dot.quote(self.name)} " if self.name else ""
+        if subgraph:
+            head = f"subgraph {name}{{\n"
+        else:
+            head = f"{'strict ' if self.strict else ''}digraph {name}{{\n"
+        out = [head]
+        for keyword in ("graph", "node", "edge"):
+            attrs = getattr(self, f"{keyword}_attr")
+            if attrs:
+                out.append(f"\t{keyword} [{_attrs(attrs)}]\n")
+        return out + self.body + ["}\n"]
+
+    @property
+    def source(self) -> str:
+        return "".join(self.lines())
+
+
+class Diagram:
+    __directions = ("TB", "BT", "LR", "RL")
+    __curvestyles = ("ortho", "curved")
+    __outformats = ("png", "jpg", "svg", "pdf", "dot")
+
+    _default_graph_attrs = {
+        "pad": "2.0",
+        "splines": "ortho",
+        "nodesep": "0.60",
+        "ranksep": "0.75",
+        "fontname": "Sans-Serif",
+        "fontsize": "15",
+        "fontcolor": "#2D3436",
+    }
+    _default_node_attrs = {
+        "shape": "box",
+        "style": "rounded",
+        "fixedsize": "true",
+        "width": "1.4",
+        "height": "1.4",
+        "labelloc": "b",
+        "imagescale": "true",
+        "fontname": "Sans-Serif",
+        "fontsize": "13",
+        "fontcolor": "#2D3436",
+    }
+    _default_edge_attrs = {"color": "#7B8894"}
+
+    def __init__(
+        self,
+        name: str = "",
+        filename: str = "",
+        direction: str = "LR",
+        curvestyle: str = "ortho",
+        outformat: str | list[str] = "png",
+        autolabel: bool = False,
+        show: bool = True,
+        strict: bool = False,
+        graph_attr: dict | None = None,
+        node_attr: dict | None = None,
+        edge_attr: dict | None = None,
+    ):
+        self.name = name
+        if not name and not filename:
+            filename = "diagrams_image"
+        elif not filename:
+            filename = "_".join(name.split()).lower()
+        self.filename = filename
+
+        if direction.upper() not in self.__directions:
+            raise ValueError(f'"{direction}" is not a valid direction')
+        if curvestyle.lower() not in self.__curvestyles:
+            raise ValueError(f'"{curvestyle}" is not a valid curvestyle')
+        for fmt in outformat if isinstance(outformat, list) else [outformat]:
+            if fmt.lower() not in self.__outformats:
+                raise ValueError(f'"{fmt}" is not a valid output format')
+
+        self.dot = Graph(name, strict=strict)
+        self.dot.graph_attr.update(self._default_graph_attrs)
+        self.dot.graph_attr["label"] = name
+        self.dot.graph_attr["rankdir"] = direction
+        self.dot.graph_attr["splines"] = curvestyle
+        self.dot.graph_attr.update(graph_attr or {})
+        self.dot.node_attr.update(self._default_node_attrs)
+        self.dot.node_attr.update(node_attr or {})
+        self.dot.edge_attr.update(self._default_edge_attrs)
+        self.dot.edge_attr.update(edge_attr or {})
+
+        self.outformat = outformat
+        self.show = show
+        self.autolabel = autolabel
+        self._next_id = 0
+
+    def __str__(self) -> str:
+        return self.dot.source
+
+    def __enter__(self):
+        self._token = _diagram.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.render()
+        finally:
+            _diagram.reset(self._token)
+
+    def render(self) -> None:
+        # imported here, the pipeline imports this module
+        from gen_diagrams import render
+
+        render.render(self)
+
+    def node_id(self) -> str:
+        self._next_id += 1
+        return f"n{self._next_id}"
+
+    def node(self, nodeid: str, label: str, **attrs):
+        self.dot.node(nodeid, label, **attrs)
+
+    def connect(self, node: "Node", node2: "Node", edge: "Edge"):
+        self.dot.edge(node.nodeid, node2.nodeid, **edge.attrs)
+
+    def subgraph(self, graph: Graph):
+        self.dot.subgraph(graph)
+
+
+class Cluster:
+    __directions = ("TB", "BT", "LR", "RL")
+    __bgcolors = ("#E5F5FD", "#EBF3E7", "#ECE8F6", "#FDF7E3")
+
+    _default_graph_attrs = {
+        "shape": "box",
+        "style": "rounded",
+        "labeljust": "l",
+        "pencolor": "#AEB6BE",
+        "fontname": "Sans-Serif",
+        "fontsize": "12",
+    }
+
+    def __init__(
+        self,
+        label: str = "cluster",
+        direction: str = "LR",
+        graph_attr: dict | None = None,
+    ):
+        self.label = label
+        self.name = "cluster_" + label
+        self._diagram = _diagram.get()
+        if self._diagram is None:
+            raise EnvironmentError("Global diagrams context not set up")
+        if direction.upper() not in self.__directions:
+            raise ValueError(f'"{direction}" is not a valid direction')
+        self._parent = _cluster.get()
+        self.depth = self._parent.depth + 1 if self._parent else 0
+
+        self.dot = Graph(self.name)
+        self.dot.graph_attr.update(self._default_graph_attrs)
+        self.dot.graph_attr["label"] = label
+        self.dot.graph_attr["rankdir"] = direction
+        self.dot.graph_attr["bgcolor"] = self.__bgcolors[
+            self.depth % len(self.__bgcolors)
+        ]
+        self.dot.graph_attr.update(graph_attr or {})
+
+    def __enter__(self):
+        self._token = _cluster.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        (self._parent or self._diagram).subgraph(self.dot)
+        _cluster.reset(self._token)
+
+    def node(self, nodeid: str, label: str, **attrs):
+        self.dot.node(nodeid, label, **attrs)
+
+    def subgraph(self, graph: Graph):
+        self.dot.subgraph(graph)
+
+
+class Node:
+    _provider = None
+    _type = None
+    # path relative to resources_dir(), see ICONS
+    _icon: str | None = None
+    _height = 1.9
+
+    def __init__(self, label: str = "", *, nodeid: str | None = None, **attrs):
+        self._diagram = _diagram.get()
+        if self._diagram is None:
+            raise EnvironmentError("Global diagrams context not set up")
+        self._id = nodeid or self._diagram.node_id()
+        self.label = label
+        if self._diagram.autolabel:
+            prefix = type(self).__name__
+            self.label = f"{prefix}\n{label}" if label else prefix
+
+        self._attrs = {}
+        icon = self._icon and resources_dir()
+        if icon:
+            self._attrs = {
+                "shape": "none",
+                "height": str(self._height + 0.4 * self.label.count("\n")),
+                "image": str(icon / self._icon),
+            }
+        self._attrs.update(attrs)
+
+        self._cluster = _cluster.get()
+        (self._cluster or self._diagram).node(self._id, self.label, **self._attrs)
+
+    def __repr__(self):
+        return f"<{self._provider}.{self._type}.{type(self).__name__}>"
+
+    @property
+    def nodeid(self) -> str:
+        return self._id
+
+    def connect(self, node: "Node", edge: "Edge") -> "Node":
+        self._diagram.connect(self, node, edge)
+        return node
+
+    def __sub__(self, other):
+        if isinstance(other, list):
+            for node in other:
+                self.connect(node, Edge(self))
+            return other
+        if isinstance(other, Node):
+            return self.connect(other, Edge(self))
+        other.node = self
+        return other
+
+    def __rsub__(self, other):
+        for o in other:
+            if isinstance(o, Edge):
+                o.connect(self)
+            else:
+                o.connect(self, Edge(self))
+        return self
+
+    def __rshift__(self, other):
+        if isinstance(other, list):
+            for node in other:
+                self.connect(node, Edge(self, forward=True))
+            return other
+        if isinstance(other, Node):
+            return self.connect(other, Edge(self, forward=True))
+        other.forward = True
+        other.node = self
+        return other
+
+    def __lshift__(self, other):
+        if isinstance(other, list):
+            for node in other:
+                self.connect(node, Edge(self, reverse=True))
+            return other
+        if isinstance(other, Node):
+            return self.connect(other, Edge(self, reverse=True))
+        other.reverse = True
+        return other.connect(self)
+
+    def __rrshift__(self, other):
+        for o in other:
+            if isinstance(o, Edge):
+                o.forward = True
+                o.connect(self)
+            else:
+                o.connect(self, Edge(self, forward=True))
+        return self
+
+    def __rlshift__(self, other):
+        for o in other:
+            if isinstance(o, Edge):
+                o.reverse = True
+                o.connect(self)
+            else:
+                o.connect(self, Edge(self, reverse=True))
+        return self
+
+
+class Edge:
+    _default_edge_attrs = {
+        "fontcolor": "#2D3436",
+        "fontname": "Sans-Serif",
+        "fontsize": "13",
+    }
+
+    def __init__(
+        self,
+        node: Node | None = None,
+        forward: bool = False,
+        reverse: bool = False,
+        label: str = "",
+        color: str = "",
+        style: str = "",
+        **attrs,
+    ):
+        self.node = node
+        self.forward = forward
+        self.reverse = reverse
+        self._attrs = dict(self._default_edge_attrs)
+        if label:
+            self._attrs["label"] = label
+        if color:
+            self._attrs["color"] = color
+        if style:
+            self._attrs["style"] = style
+        self._attrs.update(attrs)
+
+    @property
+    def attrs(self) -> dict[str, str]:
+        if self.forward and self.reverse:
+            direction = "both"
+        elif self.forward:
+            direction = "forward"
+        elif self.reverse:
+            direction = "back"
+        else:
+            direction = "none"
+        return {**self._attrs, "dir": direction}
+
+    def __sub__(self, other):
+        return self.connect(other)
+
+    def __rsub__(self, other):
+        return self.append(other)
+
+    def __rshift__(self, other):
+        self.forward = True
+        return self.connect(other)
+
+    def __lshift__(self, other):
+        self.reverse = True
+        return self.connect(other)
+
+    def __rrshift__(self, other):
+        return self.append(other, forward=True)
+
+    def __rlshift__(self, other):
+        return self.append(other, reverse=True)
+
+    def append(self, other, forward=None, reverse=None) -> list["Edge"]:
+        result = []
+        for o in other:
+            if isinstance(o, Edge):
+                o.forward = forward or o.forward
+                o.reverse = reverse or o.reverse
+                self._attrs = o.attrs.copy()
+                result.append(o)
+            else:
+                result.append(Edge(o, forward=forward, reverse=reverse, **self._attrs))
+        return result
+
+    def connect(self, other):
+        if isinstance(other, list):
+            for node in other:
+                self.node.connect(node, self)
+            return other
+        if isinstance(other, Edge):
+            self._attrs = other._attrs.copy()
+            return self
+        if self.node is not None:
+            return self.node.connect(other, self)
+        self.node = other
+        return self
+
+
+Group = Cluster
+
+
+def _module(name: str, **attrs) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    return module
+
+
+def install():
+    """Serve ``import diagrams...`` from this module.
+
+    Registers ``diagrams`` and every provider module in :data:`ICONS` in
+    ``sys.modules``; the real package is never imported.
+    """
+    # resolved before the real package is shadowed
+    resources_dir()
+    modules = {
+        "diagrams": _module(
+            "diagrams",
+            Diagram=Diagram,
+            Cluster=Cluster,
+            Group=Group,
+            Edge=Edge,
+            Node=Node,
+        )
+    }
+    for provider, icons in ICONS.items():
+        _, category, type_ = provider.split(".")
+        classes = {
+            name: type(
+                name,
+                (Node,),
+                {
+                    "__module__": provider,
+                    "_provider": category,
+                    "_type": type_,
+                    "_icon": icon,
+                },
+            )
+            for name, icon in icons.items()
+        }
+        modules.setdefault(f"diagrams.{category}", _module(f"diagrams.{category}"))
+        modules[provider] = _module(provider, **classes)
+
+    for name, module in modules.items():
+        parent, _, child = name.rpartition(".")
+        if parent:
+            setattr(modules[parent], child, module)
+    sys.modules.update(modules)
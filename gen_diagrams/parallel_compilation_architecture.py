@@ -15,7 +15,6 @@ graph_attr = {
 with Diagram(
     "Parallel Compilation Architecture",
     filename=diag_path("parallel_compilation_architecture"),
-    outformat="png",
     graph_attr=graph_attr,
     direction="TB",
     show=False,
@@ -0,0 +1,123 @@
+"""
+Which diagrams the documentation actually uses.
+
+Every markdown page under ``src/content`` is scanned once for image
+references (markdown images, ``<img src>`` and MDX imports) pointing into the
+``diagrams`` output directory, and for ``<Diagram name="...">`` components,
+which embed a diagram by name. The index is matched against the outputs each
+diagram script declares through ``diag_path(...)`` to find diagrams nobody
+embeds and references to diagrams that are never generated.
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import gen_diagrams
+from gen_diagrams import declarative
+from gen_diagrams.runner import definition_paths, diagram_modules
+
+CONTENT_DIR = Path("src/content")
+DIAGRAM_DIR = Path("diagrams")
+
+CONTENT_SUFFIXES = frozenset({".md", ".mdx"})
+
+_IMAGE_REF = re.compile(
+    r"""
+    !\[[^\]]*\]\(\s*<?(?P<md>[^)\s>]+)
+  | <img\b[^>]*?\bsrc=["'](?P<html>[^"']+)["']
+  | \bfrom\s+["'](?P<mdx>[^"']+)["']
+  | <Diagram\b[^>]*?\bname=["'](?P<component>[^"']+)["']
+    """,
+    re.X,
+)
+_DIAG_PATH = re.compile(r"""diag_path\(\s*["']([^"']+)["']""")
+# raster variants written next to the main output, e.g. ``name@192dpi.png``
+# or ``name@480w.png``
+VARIANT = re.compile(r"@[^.]+$")
+
+
+@dataclass
+class Reference:
+    source: str
+    target: str
+    line: int
+
+
+@dataclass
+class ReferenceReport:
+    # diagram name -> references embedding it
+    used: dict[str, list[Reference]] = field(default_factory=dict)
+    # diagram name -> module producing it
+    produced: dict[str, str] = field(default_factory=dict)
+    missing: list[Reference] = field(default_factory=list)
+
+    @property
+    def unreferenced(self) -> list[str]:
+        return sorted(name for name in self.produced if name not in self.used)
+
+    @property
+    def referenced_modules(self) -> list[str]:
+        return sorted({m for name, m in self.produced.items() if name in self.used})
+
+
+def diagram_outputs() -> dict[str, str]:
+    """Output name -> diagram module.
+
+    Read from each script's ``diag_path`` calls and each definition's
+    ``filename``.
+    """
+    package = Path(gen_diagrams.__file__).parent
+    definitions = definition_paths()
+    outputs = {}
+    for module in diagram_modules():
+        if module in definitions:
+            outputs[declarative.load(definitions[module]).filename] = module
+            continue
+        source = (package / f"{module}.py").read_text()
+        for name in _DIAG_PATH.findall(source) or [module]:
+            outputs[name] = module
+    return outputs
+
+
+def diagram_name(target: str, source: Path, root: Path) -> str | None:
+    """The diagram a reference points at, or None when it is not a diagram."""
+    if "://" in target:
+        return None
+    path = Path(target.split("#")[0].split("?")[0])
+    resolved = (
+        (source.parent / path).resolve()
+        if not path.is_absolute()
+        else root / path.relative_to("/")
+    )
+    try:
+        relative = resolved.relative_to((root / DIAGRAM_DIR).resolve())
+    except ValueError:
+        return None
+    return VARIANT.sub("", relative.with_suffix("").as_posix())
+
+
+def scan(root: Path = Path(".")) -> ReferenceReport:
+    report = ReferenceReport(produced=diagram_outputs())
+    root = root.resolve()
+    for path in sorted((root / CONTENT_DIR).rglob("*")):
+        if path.suffix not in CONTENT_SUFFIXES or not path.is_file():
+            continue
+        text = path.read_text()
+        for m in _IMAGE_REF.finditer(text):
+            if m.group("component"):
+                target = name = m.group("component")
+            else:
+                target = m.group("md") or m.group("html") or m.group("mdx")
+                name = diagram_name(target, path, root)
+            if name is None:
+                continue
+            ref = Reference(
+                source=path.relative_to(root).as_posix(),
+                target=target,
+                line=text.count("\n", 0, m.start()) + 1,
+            )
+            report.used.setdefault(name, []).append(ref)
+            if name not in report.produced:
+                report.missing.append(ref)
+    return report
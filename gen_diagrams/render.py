@@ -0,0 +1,407 @@
+"""
+Rendering pipeline shared by every diagram script.
+
+``install()`` swaps ``diagrams.Diagram.render`` for :func:`render`, so the
+scripts keep using the plain ``with Diagram(...)`` API while the pipeline
+decides how the graph is laid out and drawn; the runner calls it before
+building any diagram. Each graph is laid out once; every requested output
+(theme, format, raster dpi and raster width) is then drawn from that single
+layout, in parallel. By default that is one file per format in the first
+of ``common.diagram_themes``; the deploy workflow opts into the variants.
+Options are read from the environment so they also apply to
+``python -m gen_diagrams render <name>``:
+
+- ``GEN_DIAGRAMS_FORMATS=png,svg,pdf`` adds output formats to the one the
+  diagram asks for
+- ``GEN_DIAGRAMS_LAYOUT_CACHE=1`` reuses cached layouts (see ``layout.py``)
+  and skips drawing outputs whose themed source is unchanged
+- ``GEN_DIAGRAMS_LAYOUT_BUDGET`` overrides ``common.layout_budget`` (seconds)
+- ``GEN_DIAGRAMS_FORCE_WRITE=1`` rewrites outputs even when the existing
+  file already shows the same picture
+- ``GEN_DIAGRAMS_CACHE_DIR`` overrides the cache location
+- ``GEN_DIAGRAMS_BACKEND=native`` builds the graphs with ``native.py``
+  instead of the ``diagrams`` package
+- ``GEN_DIAGRAMS_THEMES=light,dark`` sets the themes drawn (default: the
+  first of ``common.diagram_themes``); filenames still follow
+  ``common.diagram_themes`` (see ``common.themed_name``)
+- ``GEN_DIAGRAMS_RASTER_VARIANTS=1`` also draws raster formats at every
+  ``common.raster_dpi`` and ``common.raster_widths`` entry
+"""
+
+import copy
+import hashlib
+import json
+import os
+import subprocess
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from gen_diagrams import dot, native, themes
+from gen_diagrams.common import (
+    diagram_themes,
+    layout_budget,
+    layout_budgets,
+    layout_fallbacks,
+    raster_dpi,
+    raster_widths,
+    themed_name,
+)
+from gen_diagrams.common import themes as theme_presets
+from gen_diagrams.images import same_png
+from gen_diagrams.layout import Layout, LayoutCache, topology_key
+from gen_diagrams.svg import optimize as optimize_svg
+from gen_diagrams.svg import same as same_svg
+
+if TYPE_CHECKING:
+    from diagrams import Diagram
+
+RASTER_FORMATS = frozenset({"png", "jpg"})
+BACKENDS = ("diagrams", "native")
+
+
+def _flag(name: str) -> bool:
+    return os.environ.get(name, "").lower() in ("1", "true", "yes", "on")
+
+
+def _list(name: str) -> list[str]:
+    return [v.strip() for v in os.environ.get(name, "").split(",") if v.strip()]
+
+
+@dataclass
+class RenderOptions:
+    formats: list[str] = field(default_factory=list)
+    layout_cache: bool = False
+    layout_budget: float | None = None
+    force_write: bool = False
+    cache_dir: Path = Path(".cache/gen_diagrams")
+    backend: str = "diagrams"
+    themes: list[str] = field(default_factory=list)
+    raster_variants: bool = False
+
+    @classmethod
+    def from_env(cls) -> "RenderOptions":
+        return cls(
+            formats=_list("GEN_DIAGRAMS_FORMATS"),
+            layout_cache=_flag("GEN_DIAGRAMS_LAYOUT_CACHE"),
+            layout_budget=(
+                float(os.environ["GEN_DIAGRAMS_LAYOUT_BUDGET"])
+                if "GEN_DIAGRAMS_LAYOUT_BUDGET" in os.environ
+                else None
+            ),
+            force_write=_flag("GEN_DIAGRAMS_FORCE_WRITE"),
+            cache_dir=Path(os.environ.get("GEN_DIAGRAMS_CACHE_DIR", cls.cache_dir)),
+            backend=os.environ.get("GEN_DIAGRAMS_BACKEND", cls.backend),
+            themes=_list("GEN_DIAGRAMS_THEMES"),
+            raster_variants=_flag("GEN_DIAGRAMS_RASTER_VARIANTS"),
+        )
+
+
+OPTIONS = RenderOptions.from_env()
+
+# diagrams collected instead of rendered, see capture()
+_captured: list["Diagram"] | None = None
+
+
+@cache
+def graphviz_version() -> str:
+    import graphviz
+
+    return ".".join(map(str, graphviz.version()))
+
+
+def output_formats(diagram: "Diagram") -> list[str]:
+    formats = diagram.outformat
+    if not isinstance(formats, list):
+        formats = [formats]
+    return list(dict.fromkeys([*formats, *OPTIONS.formats]))
+
+
+def render_themes() -> list[str]:
+    return OPTIONS.themes or diagram_themes[:1]
+
+
+def dpi_for_width(graph: dot.Graph, width: int) -> float:
+    """Dpi at which the positioned ``graph`` is drawn ``width`` pixels wide."""
+    x0, _, x1, _ = map(float, graph.attrs["bb"].split(","))
+    # pad is in inches on each side, graphviz defaults to 4 points
+    pad = float(graph.attrs.get("pad", "0.0555").split(",")[0])
+    return width / ((x1 - x0) / 72 + 2 * pad)
+
+
+def outputs(
+    diagram: "Diagram", graph: dot.Graph | None = None, theme: str | None = None
+) -> list[tuple[Path, str, float | None]]:
+    """(path, format, dpi) for every file the diagram produces in ``theme``.
+
+    Raster formats are drawn at the first ``common.raster_dpi`` under the
+    plain ``<name>.<fmt>`` filename the docs link to. With
+    ``raster_variants`` they also get one file per other dpi and, once the
+    positioned ``graph`` is known, one per entry of ``common.raster_widths``.
+    Every theme but the first of ``common.diagram_themes`` inserts
+    ``@<theme>`` after the name.
+    """
+    base = diagram.filename
+    if theme is not None:
+        base = themed_name(base, theme)
+    out = []
+    for fmt in output_formats(diagram):
+        if fmt not in RASTER_FORMATS:
+            out.append((Path(f"{base}.{fmt}"), fmt, None))
+            continue
+        out.append((Path(f"{base}.{fmt}"), fmt, raster_dpi[0]))
+        if not OPTIONS.raster_variants:
+            continue
+        for dpi in raster_dpi[1:]:
+            out.append((Path(f"{base}@{dpi}dpi.{fmt}"), fmt, dpi))
+        if graph is None or "bb" not in graph.attrs:
+            continue
+        for width in raster_widths:
+            dpi = dpi_for_width(graph, width)
+            if dpi <= max(raster_dpi):
+                out.append((Path(f"{base}@{width}w.{fmt}"), fmt, round(dpi, 3)))
+    return out
+
+
+@dataclass
+class LayoutAttempt:
+    config: str
+    engine: str
+    seconds: float
+    timed_out: bool
+
+
+def run_layout(source: str, engine: str, timeout: float | None = None) -> dot.Graph:
+    proc = subprocess.run(
+        [engine, "-Tdot"],
+        input=source.encode(),
+        capture_output=True,
+        timeout=timeout,
+        check=True,
+    )
+    return dot.parse(proc.stdout.decode())
+
+
+def budget_for(name: str) -> float:
+    if OPTIONS.layout_budget is not None:
+        return OPTIONS.layout_budget
+    return layout_budgets.get(name, layout_budget)
+
+
+def record_choice(name: str, attempts: list[LayoutAttempt]):
+    path = OPTIONS.cache_dir / "choices" / f"{name}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(
+            {
+                "diagram": name,
+                "config": attempts[-1].config,
+                "attempts": [asdict(a) for a in attempts],
+            },
+            indent=2,
+        )
+    )
+
+
+def budgeted_layout(name: str, graph: dot.Graph, source: str, engine: str) -> dot.Graph:
+    """Lay out ``graph``, falling back through ``common.layout_fallbacks``.
+
+    Every configuration but the last is killed once it exceeds the diagram's
+    budget; the configuration that produced the layout is recorded under
+    ``<cache_dir>/choices``.
+    """
+    budget = budget_for(name)
+    attempts = []
+    for i, config in enumerate(layout_fallbacks):
+        last = i == len(layout_fallbacks) - 1
+        config_engine = config["engine"] or engine
+        config_source = source
+        if config["graph_attr"]:
+            variant = copy.deepcopy(graph)
+            variant.attrs.update(config["graph_attr"])
+            config_source = variant.source()
+
+        start = time.perf_counter()
+        try:
+            positioned = run_layout(
+                config_source, config_engine, None if last else budget
+            )
+        except subprocess.TimeoutExpired:
+            attempts.append(
+                LayoutAttempt(
+                    config["name"], config_engine, time.perf_counter() - start, True
+                )
+            )
+            print(
+                f"{name}: layout '{config['name']}' exceeded {budget:.1f}s, falling back"
+            )
+            continue
+        attempts.append(
+            LayoutAttempt(
+                config["name"], config_engine, time.perf_counter() - start, False
+            )
+        )
+        record_choice(name, attempts)
+        return positioned
+    raise ValueError("common.layout_fallbacks must not be empty")
+
+
+def layout(diagram: "Diagram") -> dot.Graph:
+    """Positioned graph for ``diagram``, from the layout cache when enabled."""
+    source = diagram.dot.source
+    engine = diagram.dot.engine
+    name = Path(diagram.filename).name
+    graph = dot.parse(source)
+    if not OPTIONS.layout_cache:
+        return budgeted_layout(name, graph, source, engine)
+
+    key = topology_key(graph, engine)
+    layouts = LayoutCache(OPTIONS.cache_dir / "layouts", graphviz_version())
+
+    cached = layouts.load(name, key)
+    if cached is not None:
+        return cached.apply(graph)
+
+    positioned = budgeted_layout(name, graph, source, engine)
+    layouts.store(name, Layout.extract(key, graph, positioned))
+    return positioned
+
+
+def draw(graph: dot.Graph, fmt: str, dpi: float | None = None) -> bytes:
+    """Draw an already positioned graph without running a layout."""
+    if fmt == "dot":
+        return graph.source().encode()
+    if dpi is not None:
+        graph = copy.deepcopy(graph)
+        graph.attrs["dpi"] = str(dpi)
+    # neato -n2 draws at the given positions without running a layout
+    data = subprocess.run(
+        ["neato", "-n2", f"-T{fmt}"],
+        input=graph.source().encode(),
+        capture_output=True,
+        check=True,
+    ).stdout
+    if fmt == "svg":
+        data = optimize_svg(data)
+    return data
+
+
+def unchanged(path: Path, data: bytes) -> bool:
+    """Whether ``path`` already holds a picture identical to ``data``.
+
+    Graphviz and the PNG encoder do not produce byte-stable output, so
+    keeping the existing file avoids churning unchanged images in git and
+    in downstream caches.
+    """
+    if OPTIONS.force_write or not path.exists():
+        return False
+    existing = path.read_bytes()
+    try:
+        if path.suffix == ".svg":
+            return same_svg(existing, data)
+        if path.suffix == ".png":
+            return same_png(existing, data)
+    except (ValueError, zlib.error):
+        return False
+    return existing == data
+
+
+def draw_key(source: str, fmt: str, dpi: float | None) -> str:
+    """Render cache key of one output drawn from a themed, positioned source."""
+    key = f"{graphviz_version()}\0{fmt}\0{dpi}\0{source}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class RenderCache:
+    """Output path -> :func:`draw_key` of what it was last drawn from.
+
+    One file per diagram under ``<cache_dir>/renders``, covering every theme,
+    so editing only a theme redraws only that theme's outputs.
+    """
+
+    def __init__(self, directory: Path, name: str):
+        self.path = directory / f"{name}.json"
+        try:
+            self.keys: dict[str, str] = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self.keys = {}
+
+    def fresh(self, path: Path, key: str) -> bool:
+        return self.keys.get(path.as_posix()) == key and path.exists()
+
+    def store(self, drawn: dict[Path, str]):
+        self.keys.update({path.as_posix(): key for path, key in drawn.items()})
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.keys, indent=2, sort_keys=True))
+
+
+@contextmanager
+def capture():
+    """Collect the diagrams built inside the block instead of rendering them."""
+    global _captured
+    previous, _captured = _captured, []
+    try:
+        yield _captured
+    finally:
+        _captured = previous
+
+
+def render(diagram: "Diagram") -> None:
+    if _captured is not None:
+        _captured.append(diagram)
+        return
+    positioned = layout(diagram)
+    cache = None
+    if OPTIONS.layout_cache:
+        cache = RenderCache(OPTIONS.cache_dir / "renders", Path(diagram.filename).name)
+
+    # (path, themed graph, format, dpi, cache key)
+    jobs = []
+    for theme in render_themes():
+        if theme not in theme_presets:
+            raise ValueError(f"Unknown diagram theme {theme!r}")
+        themed = themes.apply(positioned, theme_presets[theme])
+        source = themed.source() if cache is not None else ""
+        for path, fmt, dpi in outputs(diagram, positioned, theme):
+            key = draw_key(source, fmt, dpi) if cache is not None else None
+            if cache is None or not cache.fresh(path, key):
+                jobs.append((path, themed, fmt, dpi, key))
+
+    # every draw is an independent neato process
+    with ThreadPoolExecutor() as pool:
+        drawn = list(pool.map(lambda job: draw(*job[1:4]), jobs))
+    for (path, _, _, _, _), data in zip(jobs, drawn):
+        if not unchanged(path, data):
+            path.write_bytes(data)
+        if diagram.show:
+            import graphviz
+
+            graphviz.view(path)
+    if cache is not None:
+        cache.store({path: key for path, _, _, _, key in jobs})
+
+
+def render_saved(diagram: "Diagram") -> None:
+    # diagrams' Diagram.__exit__ removes the DOT source once rendering is done
+    diagram.dot.save()
+    render(diagram)
+
+
+def install():
+    if OPTIONS.backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown GEN_DIAGRAMS_BACKEND {OPTIONS.backend!r}, "
+            f"expected one of {', '.join(BACKENDS)}"
+        )
+    if OPTIONS.backend == "native":
+        native.install()
+        return
+
+    from diagrams import Diagram
+
+    Diagram.render = render_saved
@@ -0,0 +1,95 @@
+"""
+Discovery and execution of the diagrams.
+
+Every module in ``gen_diagrams`` that is not part of the tooling itself is a
+diagram script: importing it builds (and renders) its diagrams. Every file in
+``gen_diagrams/definitions`` is a declarative diagram (see ``declarative.py``)
+named after its file stem.
+
+:func:`run` and :func:`run_batch` install the rendering pipeline (see
+``render.py``) before building anything, so diagrams are rendered through it
+when run with ``python -m gen_diagrams render <name>``.
+"""
+
+import pkgutil
+import runpy
+import time
+from pathlib import Path
+
+import gen_diagrams
+from gen_diagrams import declarative, render
+
+DEFINITIONS_DIR = Path(gen_diagrams.__file__).parent / "definitions"
+
+SUPPORT_MODULES = frozenset(
+    {
+        "assets",
+        "benchmark",
+        "common",
+        "declarative",
+        "dot",
+        "images",
+        "layout",
+        "manifest",
+        "native",
+        "references",
+        "render",
+        "runner",
+        "spec_graph",
+        "svg",
+        "themes",
+        "watch",
+    }
+)
+
+
+def definition_paths() -> dict[str, Path]:
+    return {
+        path.stem: path
+        for path in sorted(DEFINITIONS_DIR.glob("*"))
+        if path.suffix in declarative.DEFINITION_SUFFIXES
+    }
+
+
+def diagram_modules() -> list[str]:
+    """Names of every diagram, scripts and definitions alike."""
+    scripts = {
+        m.name
+        for m in pkgutil.iter_modules(gen_diagrams.__path__)
+        if not m.ispkg and not m.name.startswith("_") and m.name not in SUPPORT_MODULES
+    }
+    return sorted(scripts | set(definition_paths()))
+
+
+def source_path(module: str) -> Path:
+    return definition_paths().get(module) or DEFINITIONS_DIR.parent / f"{module}.py"
+
+
+def run(module: str):
+    """Build a diagram; scripts run as ``python -m gen_diagrams.<module>`` would."""
+    render.install()
+    definitions = definition_paths()
+    if module in definitions:
+        declarative.build(declarative.load(definitions[module]))
+        return
+    runpy.run_module(f"gen_diagrams.{module}", run_name="__main__")
+
+
+def run_batch(modules: list[str]) -> dict[str, float]:
+    """Build many diagrams, validating every definition before drawing any.
+
+    Returns the seconds each module took.
+    """
+    render.install()
+    definitions = definition_paths()
+    batch = declarative.load_all([definitions[m] for m in modules if m in definitions])
+    built = {d.name: d for d in batch}
+    seconds = {}
+    for module in modules:
+        start = time.perf_counter()
+        if module in built:
+            declarative.build(built[module])
+        else:
+            runpy.run_module(f"gen_diagrams.{module}", run_name="__main__")
+        seconds[module] = time.perf_counter() - start
+    return seconds
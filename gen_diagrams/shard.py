@@ -0,0 +1,114 @@
+"""
+Sharded renders: ``render --shard i/n`` then ``merge-shards``.
+
+Every shard computes the partition of the diagram modules independently, so
+it is a pure function of the module list and the recorded costs: modules are
+assigned longest first to the least loaded shard (ties broken by name and
+shard index). The costs are the seconds each module took to render in earlier
+runs, recorded by ``merge-shards`` under ``.cache`` (which CI restores before
+the shards start); modules without a recorded cost count as the mean of the
+known ones.
+
+This is the partition ``auto/shard.py`` uses for doc-manager, kept local so
+the diagram tool does not depend on that package.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class Shard:
+    index: int
+    count: int
+
+    @classmethod
+    def parse(cls, value: str) -> "Shard":
+        index, sep, count = value.partition("/")
+        if not sep or not index.isdigit() or not count.isdigit():
+            raise ValueError(f"Expected a shard like 2/4, got {value!r}")
+        shard = cls(int(index), int(count))
+        if not 1 <= shard.index <= shard.count:
+            raise ValueError(f"Shard index must be between 1 and {shard.count}")
+        return shard
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def select(modules: list[str], shard: Shard, costs: dict[str, float]) -> list[str]:
+    """The modules ``shard`` renders, in their original order."""
+    known = [costs[m] for m in modules if m in costs]
+    default = sum(known) / len(known) if known else 1.0
+    loads = [0.0] * shard.count
+    mine = set()
+    for module in sorted(set(modules), key=lambda m: (-costs.get(m, default), m)):
+        target = min(range(shard.count), key=lambda s: (loads[s], s))
+        loads[target] += costs.get(module, default)
+        if target == shard.index - 1:
+            mine.add(module)
+    return [m for m in modules if m in mine]
+
+
+def load_costs(path: Path) -> dict[str, float]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def store_costs(path: Path, costs: dict[str, float]):
+    """Merge ``costs`` into the recorded ones and write them atomically."""
+    merged = {**load_costs(path), **{k: round(v, 4) for k, v in costs.items()}}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(merged, indent=2, sort_keys=True) + "\n")
+    os.replace(tmp, path)
+
+
+def write_report(
+    directory: Path, shard: Shard, modules: list[str], seconds: dict[str, float]
+) -> Path:
+    """Record the modules of the run and the seconds this shard's took."""
+    path = directory / f"render-{shard.index}of{shard.count}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {"shard": str(shard), "modules": sorted(set(modules)), "costs": seconds}
+    path.write_text(json.dumps(data))
+    return path
+
+
+def merge_reports(directory: Path) -> dict[str, float]:
+    """Seconds per module of a complete sharded run.
+
+    Raises ``ValueError`` when shards are missing, come from different runs,
+    or do not render every module exactly once.
+    """
+    reports = [
+        json.loads(path.read_text())
+        for path in sorted(directory.glob("render-*of*.json"))
+    ]
+    if not reports:
+        raise ValueError("No shard reports to merge")
+    modules = reports[0]["modules"]
+    shards = {Shard.parse(r["shard"]) for r in reports}
+    count = Shard.parse(reports[0]["shard"]).count
+    problems = []
+    if any(r["modules"] != modules for r in reports):
+        problems.append("shard reports come from different module lists")
+    if {s.count for s in shards} != {count}:
+        problems.append("shard reports disagree on the shard count")
+    if missing := sorted(set(range(1, count + 1)) - {s.index for s in shards}):
+        problems.append(f"missing shards {', '.join(f'{i}/{count}' for i in missing)}")
+
+    costs: dict[str, float] = {}
+    for report in reports:
+        if overlap := sorted(costs.keys() & report["costs"].keys()):
+            problems.append(f"modules rendered twice: {', '.join(overlap)}")
+        costs.update(report["costs"])
+    if not problems and sorted(costs) != modules:
+        problems.append(f"shards rendered {len(costs)} of {len(modules)} modules")
+    if problems:
+        raise ValueError("; ".join(problems))
+    return costs
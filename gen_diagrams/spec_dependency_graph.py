@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Spec Dependency Graph Diagram
+
+Generated from the spec corpus (see spec_graph.py):
+- One cluster per topological level, level 0 links to no other spec
+- Specs linking each other in a cycle are grouped in a nested cluster
+- Dashed edges link to a kind outside the spec kind's references
+- Past common.spec_graph_max_nodes specs, each level shows one node per kind
+"""
+
+from itertools import groupby
+
+from diagrams.programming.flowchart import Document
+
+from diagrams import Cluster, Diagram, Edge
+from gen_diagrams.common import diag_path, spec_graph_max_nodes
+from gen_diagrams.spec_graph import load
+
+graph_attr = {
+    "fontsize": "16",
+    "bgcolor": "white",
+    "pad": "0.5",
+    "rankdir": "TB",
+    "splines": "polyline",
+}
+
+node_attr = {
+    "fontsize": "12",
+}
+
+graph = load()
+collapse = len(graph.specs) > spec_graph_max_nodes
+
+with Diagram(
+    "Spec Dependency Graph",
+    filename=diag_path("spec_dependency_graph"),
+    graph_attr=graph_attr,
+    node_attr=node_attr,
+    direction="TB",
+    show=False,
+):
+    if collapse:
+        collapsed = graph.collapsed()
+        nodes = {}
+        for level, groups in groupby(collapsed.groups.items(), lambda g: g[0][0]):
+            with Cluster(f"Level {level}"):
+                for (_, kind), members in groups:
+                    nodes[level, kind] = Document(f"{kind}\n({len(members)} specs)")
+
+        # arrows point from the referenced spec to the spec linking to it
+        for (spec, dep), count in sorted(collapsed.edges.items()):
+            nodes[dep] >> Edge(label=str(count)) >> nodes[spec]
+    else:
+        cycle_of = {spec: cycle for cycle in graph.cycles for spec in cycle}
+        nodes = {}
+
+        def add(spec_id: str):
+            nodes[spec_id] = Document(f"{spec_id}\n{graph.specs[spec_id].title}")
+
+        for level, specs in enumerate(graph.by_level()):
+            with Cluster(f"Level {level}"):
+                for spec_id in specs:
+                    cycle = cycle_of.get(spec_id)
+                    if cycle is None:
+                        add(spec_id)
+                    elif spec_id == cycle[0]:
+                        with Cluster(f"Cycle: {', '.join(cycle)}"):
+                            for member in cycle:
+                                add(member)
+
+        for spec_id, deps in sorted(graph.edges.items()):
+            for dep in sorted(deps):
+                style = "dashed" if (spec_id, dep) in graph.disallowed else ""
+                nodes[dep] >> Edge(style=style) >> nodes[spec_id]
+
+print("Generated spec_dependency_graph.png")
@@ -0,0 +1,220 @@
+"""
+Dependency graph of the specification corpus.
+
+Nodes are the specs under ``src/content/specs``; an edge ``A -> B`` means the
+body of ``A`` links to ``B`` (``/specs/rfc/RFC-0019``, ``../rfc/RFC-0019.md``
+and so on). Links to another kind that is not listed in the source kind's
+``references`` in ``spec-kinds.yaml`` are kept but flagged.
+
+Strongly connected components are found with an iterative Tarjan pass and
+every component gets a topological level (0 for specs that reference nothing,
+otherwise one more than the deepest spec they reference), both in
+``O(specs + links)``. Graphs with more specs than fit in a readable diagram
+are collapsed to one node per (level, kind) group.
+
+The kinds and the spec frontmatter are read directly rather than through
+``auto.types``, so rendering diagrams does not depend on the doc-manager's
+checkout checks.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+
+import yaml
+
+DOCS_ROOT = Path(__file__).parent.parent
+SPEC_KINDS = DOCS_ROOT / "auto" / "resource" / "spec-kinds.yaml"
+SPEC_DIR = DOCS_ROOT / "src" / "content" / "specs"
+
+# markdown link whose target ends in a qualified spec id
+_SPEC_LINK = re.compile(
+    r"""
+    \]\(\s*<?[^)\s>]*?
+    \b(?P<kind>[A-Za-z]+)-(?P<number>\d{4})
+    (?:\.md)?(?:\#[^)\s>]*)?>?\s*\)
+    """,
+    re.X,
+)
+
+
+def spec_links(body: str, kinds: set[str]) -> set[str]:
+    """Qualified ids of the specs linked from ``body``."""
+    links = set()
+    for m in _SPEC_LINK.finditer(body):
+        kind = m.group("kind").upper()
+        if kind in kinds:
+            links.add(f"{kind}-{m.group('number')}")
+    return links
+
+
+def strongly_connected(edges: dict[str, set[str]]) -> list[list[str]]:
+    """Tarjan's algorithm without recursion.
+
+    Components are returned in reverse topological order: every component
+    comes after all the components it has edges into.
+    """
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    components = []
+
+    for root in sorted(edges):
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(sorted(edges[root])))]
+        while work:
+            node, successors = work[-1]
+            for succ in successors:
+                if succ not in index:
+                    index[succ] = low[succ] = len(index)
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(sorted(edges.get(succ, ())))))
+                    break
+                if succ in on_stack:
+                    low[node] = min(low[node], index[succ])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(sorted(component))
+    return components
+
+
+@dataclass
+class SpecKind:
+    id: str
+    # kinds this kind's specs may link to
+    references: list[str] = field(default_factory=list)
+
+
+@dataclass
+class SpecNode:
+    kind: str
+    number: int
+    title: str
+
+    @classmethod
+    def from_markdown(cls, md: str) -> "SpecNode":
+        head = yaml.safe_load(md.split("---")[1])
+        return cls(head["kind"], head["number"], head["title"])
+
+    def qualified_id(self) -> str:
+        return f"{self.kind}-{self.number:04d}"
+
+
+def load_kinds(path: Path = SPEC_KINDS) -> dict[str, SpecKind]:
+    return {
+        kind["id"]: SpecKind(kind["id"], kind.get("references", []))
+        for kind in yaml.safe_load(path.read_text())
+    }
+
+
+@dataclass
+class SpecGraph:
+    specs: dict[str, SpecNode] = field(default_factory=dict)
+    # qualified id -> qualified ids it links to
+    edges: dict[str, set[str]] = field(default_factory=dict)
+    # links to another kind missing from the source kind's references
+    disallowed: set[tuple[str, str]] = field(default_factory=set)
+    # qualified id -> linked ids that do not exist in the corpus
+    unresolved: dict[str, set[str]] = field(default_factory=dict)
+
+    @cached_property
+    def components(self) -> list[list[str]]:
+        return strongly_connected(self.edges)
+
+    @cached_property
+    def levels(self) -> dict[str, int]:
+        """Topological level of every spec; a cycle shares one level."""
+        levels: dict[str, int] = {}
+        # dependencies come first in Tarjan's output
+        for component in self.components:
+            members = set(component)
+            level = max(
+                (
+                    levels[dep] + 1
+                    for spec in component
+                    for dep in self.edges[spec]
+                    if dep not in members
+                ),
+                default=0,
+            )
+            for spec in component:
+                levels[spec] = level
+        return levels
+
+    @property
+    def cycles(self) -> list[list[str]]:
+        return [c for c in self.components if len(c) > 1]
+
+    def by_level(self) -> list[list[str]]:
+        out: list[list[str]] = [
+            [] for _ in range(max(self.levels.values(), default=-1) + 1)
+        ]
+        for spec, level in sorted(self.levels.items()):
+            out[level].append(spec)
+        return out
+
+    def collapsed(self) -> "CollapsedGraph":
+        group_of = {
+            spec: (level, self.specs[spec].kind) for spec, level in self.levels.items()
+        }
+        groups: dict[tuple[int, str], list[str]] = {}
+        for spec, group in sorted(group_of.items(), key=lambda item: item[1]):
+            groups.setdefault(group, []).append(spec)
+        edges = Counter(
+            (group_of[spec], group_of[dep])
+            for spec, deps in self.edges.items()
+            for dep in deps
+            if group_of[spec] != group_of[dep]
+        )
+        return CollapsedGraph(groups=groups, edges=dict(edges))
+
+
+@dataclass
+class CollapsedGraph:
+    # (level, kind) -> member specs, ordered by level then kind
+    groups: dict[tuple[int, str], list[str]]
+    # (group, group) -> number of links between them
+    edges: dict[tuple[tuple[int, str], tuple[int, str]], int]
+
+
+def load(spec_dir: Path = SPEC_DIR, kinds_path: Path = SPEC_KINDS) -> SpecGraph:
+    kinds = load_kinds(kinds_path)
+    graph = SpecGraph()
+    bodies = {}
+    for kind in kinds:
+        for path in sorted(spec_dir.glob(f"{kind.lower()}/{kind}-*.md")):
+            md = path.read_text()
+            spec = SpecNode.from_markdown(md)
+            graph.specs[spec.qualified_id()] = spec
+            bodies[spec.qualified_id()] = md.split("---", 2)[-1]
+
+    for spec_id, body in bodies.items():
+        links = spec_links(body, set(kinds)) - {spec_id}
+        graph.edges[spec_id] = {link for link in links if link in graph.specs}
+        if missing := links - graph.edges[spec_id]:
+            graph.unresolved[spec_id] = missing
+        kind = kinds[graph.specs[spec_id].kind]
+        for dep in graph.edges[spec_id]:
+            dep_kind = graph.specs[dep].kind
+            if dep_kind != kind.id and dep_kind not in kind.references:
+                graph.disallowed.add((spec_id, dep))
+    return graph
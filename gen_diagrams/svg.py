@@ -0,0 +1,150 @@
+"""
+SVG post-processing.
+
+Graphviz writes one ``<image>`` element per node icon, pointing at the icon's
+absolute path inside the ``diagrams`` package. That path is meaningless on the
+site and the same icon is usually repeated many times. :func:`optimize` embeds
+every distinct icon once as a ``<symbol>`` and replaces each image with a
+``<use>`` reference, drops comments and the ``<title>`` tooltips graphviz
+generates from (random) node ids, and removes element ids nothing refers to.
+"""
+
+import base64
+import hashlib
+import mimetypes
+import re
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+from gen_diagrams.images import is_png, png_size
+
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
+
+ET.register_namespace("", SVG_NS)
+ET.register_namespace("xlink", XLINK_NS)
+
+_SVG = f"{{{SVG_NS}}}"
+_HREF = f"{{{XLINK_NS}}}href"
+
+# graphviz object groups whose <title> only repeats the DOT id
+_GRAPHVIZ_GROUPS = frozenset({"node", "edge", "cluster"})
+_FRAGMENT_REF = re.compile(r"#([^\s\"')]+)")
+_NUMBER = re.compile(r"(?<![\w.#-])-?(?:\d+\.\d*|\.\d+|\d+)")
+
+
+def _href(el: ET.Element) -> str | None:
+    return el.get(_HREF) or el.get("href")
+
+
+def _symbol_for(
+    path: Path, image: ET.Element, defs: ET.Element, symbols: dict[str, str]
+) -> str | None:
+    if not path.is_file():
+        return None
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    if digest in symbols:
+        return symbols[digest]
+
+    if is_png(data):
+        width, height = png_size(data)
+    else:
+        width = int(float(image.get("width", "0").rstrip("px")))
+        height = int(float(image.get("height", "0").rstrip("px")))
+    mime = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+    symbol_id = f"icon-{digest}"
+    symbol = ET.SubElement(
+        defs,
+        f"{_SVG}symbol",
+        {
+            "id": symbol_id,
+            "viewBox": f"0 0 {width} {height}",
+            "preserveAspectRatio": image.get("preserveAspectRatio", "xMidYMid meet"),
+        },
+    )
+    ET.SubElement(
+        symbol,
+        f"{_SVG}image",
+        {
+            "width": str(width),
+            "height": str(height),
+            "href": f"data:{mime};base64,{base64.b64encode(data).decode()}",
+        },
+    )
+    symbols[digest] = symbol_id
+    return symbol_id
+
+
+def optimize(svg: bytes, base: Path = Path(".")) -> bytes:
+    """Make a graphviz SVG self-contained and smaller.
+
+    Image paths are resolved against ``base`` when relative. Images that do
+    not point at a readable local file are left untouched.
+    """
+    # comments are dropped by the default tree builder
+    root = ET.fromstring(svg)
+    parents = {child: parent for parent in root.iter() for child in parent}
+
+    defs = ET.Element(f"{_SVG}defs")
+    symbols: dict[str, str] = {}
+    for image in list(root.iter(f"{_SVG}image")):
+        href = _href(image)
+        if not href or href.startswith(("data:", "http:", "https:", "#")):
+            continue
+        symbol_id = _symbol_for(base / href, image, defs, symbols)
+        if symbol_id is None:
+            continue
+        use = ET.Element(
+            f"{_SVG}use",
+            {"href": f"#{symbol_id}"}
+            | {k: image.get(k) for k in ("x", "y", "width", "height") if image.get(k)},
+        )
+        parent = parents[image]
+        parent[list(parent).index(image)] = use
+    if len(defs):
+        root.insert(0, defs)
+
+    for group in root.iter(f"{_SVG}g"):
+        if group.get("class") in _GRAPHVIZ_GROUPS:
+            for title in group.findall(f"{_SVG}title"):
+                group.remove(title)
+
+    referenced = set()
+    for el in root.iter():
+        for value in el.attrib.values():
+            referenced.update(_FRAGMENT_REF.findall(value))
+    for el in root.iter():
+        if el.tag != f"{_SVG}symbol" and el.get("id") not in referenced:
+            el.attrib.pop("id", None)
+
+    return ET.tostring(root, encoding="utf-8", xml_declaration=False)
+
+
+def _canonical(el: ET.Element, precision: int) -> tuple:
+    def normalize(value: str) -> str:
+        return _NUMBER.sub(lambda m: f"{float(m.group()):.{precision}f}", value)
+
+    return (
+        el.tag,
+        tuple(sorted((k, normalize(v)) for k, v in el.attrib.items() if k != "id")),
+        (el.text or "").strip(),
+        tuple(_canonical(child, precision) for child in el),
+    )
+
+
+def same(a: bytes, b: bytes, precision: int = 2) -> bool:
+    """Whether two SVGs draw the same thing.
+
+    Compares the element trees, ignoring attribute order, whitespace, comments,
+    element ids and coordinate noise below ``precision`` decimals.
+    """
+    if a == b:
+        return True
+    try:
+        return _canonical(ET.fromstring(a), precision) == _canonical(
+            ET.fromstring(b), precision
+        )
+    except ET.ParseError:
+        return False
@@ -0,0 +1,5 @@
+from pathlib import Path
+from sys import path
+
+project = str(Path(__file__).parent.parent.parent.parent)
+path.insert(0, project)
@@ -0,0 +1,114 @@
+import pytest
+
+from docs.gen_diagrams.declarative import DefinitionError, load, load_all
+
+VALID = """
+title: Phases
+preset: OPTS
+graph_attr: [graph_attr, {rankdir: TB}]
+clusters:
+  - label: Phases
+    nodes:
+      - {id: parse, type: Action, label: Parse}
+      - {id: check, type: Rust}
+nodes:
+  - {id: emit, type: diagrams.programming.flowchart.Document}
+edges:
+  - {chain: [parse, check, emit], style: dashed}
+  - {from: parse, to: [check, emit], dir: both}
+"""
+
+
+def write(tmp_path, name: str, text: str):
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+def test_load(tmp_path):
+    definition = load(write(tmp_path, "phases.yaml", VALID))
+
+    assert definition.name == definition.filename == "phases"
+    assert definition.options["graph_attr"]["rankdir"] == "TB"
+    assert [n.id for n in definition.clusters[0].nodes] == ["parse", "check"]
+    assert [(e.tails, e.heads) for e in definition.edges] == [
+        (["parse"], ["check"]),
+        (["check"], ["emit"]),
+        (["parse"], ["check", "emit"]),
+    ]
+    assert definition.edges[0].attrs == {"style": "dashed"}
+
+
+def test_load_reports_every_problem(tmp_path):
+    path = write(
+        tmp_path,
+        "bad.yaml",
+        """
+direction: up
+colour: red
+preset: NOPE
+nodes:
+  - {id: a, type: Spaceship}
+  - {id: a, type: Action}
+  - {type: Action}
+edges:
+  - {from: a, to: b}
+  - {from: a, dir: sideways}
+""",
+    )
+    with pytest.raises(DefinitionError) as e:
+        load(path)
+
+    problems = [p.removeprefix(f"{path}: ") for p in e.value.problems]
+    assert problems == [
+        "diagram: unknown key 'colour'",
+        "preset: common.py has no preset 'NOPE'",
+        "diagram: direction must be one of ['BT', 'LR', 'RL', 'TB']",
+        "node 'a': unknown node type 'Spaceship'",
+        "node 'a': duplicate node id",
+        "diagram node 2: node needs a string 'id'",
+        "edge 0: unknown node 'b'",
+        "edge 1: dir must be one of ['back', 'both', 'forward', 'none']",
+        "edge 1: needs both 'from' and 'to'",
+    ]
+
+
+def test_load_all_collects_problems(tmp_path):
+    paths = [
+        write(tmp_path, "ok.yaml", VALID),
+        write(tmp_path, "broken.yaml", "nodes: [{id: a, type: Action}"),
+        write(tmp_path, "empty.json", '{"edges": [{"from": "x", "to": "y"}]}'),
+    ]
+    with pytest.raises(DefinitionError) as e:
+        load_all(paths)
+
+    assert len(e.value.problems) == 3
+    assert str(paths[1]) in e.value.problems[0]
+
+
+def test_load_validates_chains_and_node_types(tmp_path):
+    path = write(
+        tmp_path,
+        "bad.yaml",
+        """
+nodes:
+  - {id: a, type: Action}
+  - {id: b, type: diagrams.programming.flowchart.Spaceship}
+  - {id: c, type: diagrams.nowhere.Rack}
+edges:
+  - {chain: ab}
+  - {chain: 3}
+  - {chain: [a]}
+""",
+    )
+    with pytest.raises(DefinitionError) as e:
+        load(path)
+
+    problems = [p.removeprefix(f"{path}: ") for p in e.value.problems]
+    assert problems[0].startswith(
+        "node 'b': cannot import node type 'diagrams.programming.flowchart.Spaceship'"
+    )
+    assert problems[1].startswith("node 'c': cannot import node type")
+    assert problems[2:] == [
+        f"edge {i}: 'chain' needs a list of at least two ids" for i in range(3)
+    ]
@@ -0,0 +1,69 @@
+from docs.gen_diagrams.dot import HTML, parse
+from docs.gen_diagrams.layout import topology_key
+
+SOURCE = """digraph "G" {
+  graph [rankdir=LR bgcolor=white]
+  node [shape=box]
+  subgraph cluster_a { label="A"; a [label="first"]; b }
+  a -> b -> c [label=x]
+  c [label=<<b>html</b>> color="#ff0000"]
+}"""
+
+
+def test_parse():
+    graph = parse(SOURCE)
+
+    assert graph.name == "G"
+    assert graph.attrs == {"rankdir": "LR", "bgcolor": "white"}
+    assert graph.node_defaults == {"shape": "box"}
+    assert graph.subgraphs["cluster_a"].attrs == {"label": "A"}
+    assert graph.subgraphs["cluster_a"].is_cluster
+    assert [n.subgraph for n in graph.nodes.values()] == [
+        "cluster_a",
+        "cluster_a",
+        None,
+    ]
+    # edge chains expand to one edge per pair, sharing the attributes
+    assert [(e.tail, e.head, e.attrs) for e in graph.edges] == [
+        ("a", "b", {"label": "x"}),
+        ("b", "c", {"label": "x"}),
+    ]
+    assert isinstance(graph.nodes["c"].attrs["label"], HTML)
+    assert graph.node_attrs(graph.nodes["a"]) == {"shape": "box", "label": "first"}
+
+
+def test_source_round_trip():
+    graph = parse(SOURCE)
+    source = graph.source()
+
+    assert 'c [label=<<b>html</b>> color="#ff0000"]' in source
+    assert parse(source) == graph
+
+
+def test_topology_key_ignores_drawing_attributes():
+    key = topology_key(parse(SOURCE))
+
+    recolored = SOURCE.replace("bgcolor=white", "bgcolor=black").replace(
+        "#ff0000", "#00ff00"
+    )
+    assert topology_key(parse(recolored)) == key
+    assert topology_key(parse(SOURCE), engine="neato") != key
+
+
+def test_topology_key_tracks_layout_changes():
+    key = topology_key(parse(SOURCE))
+    changed = [
+        SOURCE.replace("rankdir=LR", "rankdir=TB"),
+        SOURCE.replace('label="first"', 'label="a longer label"'),
+        SOURCE.replace("a -> b -> c", "a -> c -> b"),
+        SOURCE.replace("node [shape=box]", "node [shape=ellipse]"),
+    ]
+    assert len({topology_key(parse(source)) for source in changed} | {key}) == 5
+
+
+def test_topology_key_fixed_size_labels():
+    fixed = SOURCE.replace("node [shape=box]", "node [shape=box fixedsize=true]")
+    relabeled = fixed.replace('label="first"', 'label="a longer label"')
+
+    # a fixed size node keeps its size whatever the label
+    assert topology_key(parse(relabeled)) == topology_key(parse(fixed))
@@ -0,0 +1,80 @@
+import struct
+import zlib
+
+import pytest
+
+from docs.gen_diagrams import images
+from docs.gen_diagrams.images import (
+    PNG_SIGNATURE,
+    png_scanlines,
+    png_size,
+    recompress_png,
+    same_png,
+)
+
+
+def chunk(kind: bytes, body: bytes) -> bytes:
+    crc = zlib.crc32(kind + body)
+    return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", crc)
+
+
+def png(width: int, height: int, color: bytes = b"\x10\x20\x30", **options) -> bytes:
+    """An 8-bit RGB PNG of one ``color``, deflated at ``level``."""
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    pixels = (b"\x00" + color * width) * height
+    idat = zlib.compress(pixels, options.get("level", 9))
+    # optionally split the image data over several IDAT chunks
+    parts = options.get("parts", 1)
+    size = -(-len(idat) // parts)
+    chunks = [chunk(b"IDAT", idat[i : i + size]) for i in range(0, len(idat), size)]
+    text = [chunk(b"tEXt", b"Software\x00graphviz")] if options.get("text") else []
+    return (
+        PNG_SIGNATURE
+        + chunk(b"IHDR", header)
+        + b"".join(text)
+        + b"".join(chunks)
+        + chunk(b"IEND", b"")
+    )
+
+
+@pytest.fixture
+def no_oxipng(monkeypatch):
+    # oxipng may change the color type, compare the built-in recompression
+    monkeypatch.setattr(images.shutil, "which", lambda name: None)
+
+
+def test_png_size():
+    assert png_size(png(7, 3)) == (7, 3)
+
+
+def test_recompress_png_is_lossless(no_oxipng):
+    original = png(64, 64, level=0, parts=3, text=True)
+    packed = recompress_png(original)
+
+    assert len(packed) < len(original)
+    assert b"tEXt" not in packed
+    assert png_scanlines(packed) == png_scanlines(original)
+    assert same_png(original, packed)
+
+
+def test_recompress_png_keeps_smaller_original(no_oxipng):
+    original = png(4, 4)
+
+    assert recompress_png(original) is original
+
+
+def test_same_png():
+    image = png(8, 8)
+
+    assert same_png(image, png(8, 8, level=1, text=True))
+    assert not same_png(image, png(8, 8, color=b"\xf0\x20\x30"))
+    # different dimensions
+    assert not same_png(image, png(8, 9))
+
+
+def test_truncated_png():
+    image = png(8, 8, text=True)
+
+    for size in (len(image) - 5, 40, 35):
+        with pytest.raises(ValueError, match="Truncated"):
+            same_png(image, image[:size])
@@ -0,0 +1,60 @@
+import struct
+
+from pathlib import Path
+
+from docs.gen_diagrams.manifest import build, theme_of, write
+
+
+def png(width: int, height: int) -> bytes:
+    # png_size only reads the header
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + header
+
+
+def test_build(tmp_path):
+    for name, size in [
+        ("flow.png", (960, 480)),
+        ("flow@192dpi.png", (1920, 960)),
+        ("flow@480w.png", (480, 240)),
+        ("flow@dark.png", (960, 480)),
+        ("flow@dark@480w.png", (480, 240)),
+        ("nested/tree.png", (100, 50)),
+        # variants without a base image are skipped
+        ("orphan@480w.png", (480, 100)),
+    ]:
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(png(*size))
+
+    manifest = build(tmp_path)
+
+    assert list(manifest) == ["flow", "nested/tree"]
+    flow = manifest["flow"]
+    assert (flow["src"], flow["width"], flow["height"]) == ("flow.png", 960, 480)
+    assert [v["src"] for v in flow["variants"]] == [
+        "flow@480w.png",
+        "flow.png",
+        "flow@192dpi.png",
+    ]
+    dark = flow["themes"]["dark"]
+    assert dark["src"] == "flow@dark.png"
+    assert [v["src"] for v in dark["variants"]] == [
+        "flow@dark@480w.png",
+        "flow@dark.png",
+    ]
+    assert "themes" not in manifest["nested/tree"]
+
+
+def test_write_only_on_change(tmp_path):
+    (tmp_path / "a.png").write_bytes(png(2, 2))
+
+    path, changed = write(tmp_path)
+    assert changed and path.name == "manifest.json"
+    assert write(tmp_path) == (path, False)
+
+
+def test_theme_of():
+    assert theme_of(Path("flow.png")) == "light"
+    assert theme_of(Path("flow@480w.png")) == "light"
+    assert theme_of(Path("flow@dark@480w.png")) == "dark"
+    assert theme_of(Path("flow@unknown.png")) == "light"
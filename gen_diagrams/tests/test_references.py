@@ -0,0 +1,52 @@
+from docs.gen_diagrams.references import diagram_name, diagram_outputs, scan
+
+PAGE = """# Compilation
+
+![Compilation](../../../../diagrams/compilation.png)
+
+<img src="/diagrams/phase_ordering@dark.png" alt="Phases" />
+
+![Gone](/diagrams/removed_diagram.png) and ![Logo](/logo.svg)
+
+<Diagram name="handlers" alt="Handlers" />
+"""
+
+
+def test_diagram_outputs():
+    outputs = diagram_outputs()
+
+    assert outputs["compilation"] == "compilation"
+    # definitions are named after their filename
+    assert outputs["phase_ordering"] == "phase_ordering"
+
+
+def test_diagram_name(tmp_path):
+    page = tmp_path / "src" / "content" / "docs" / "page.md"
+
+    assert diagram_name("/diagrams/a@480w.png", page, tmp_path) == "a"
+    assert diagram_name("../../../diagrams/b/c.svg#x", page, tmp_path) == "b/c"
+    assert diagram_name("/images/a.png", page, tmp_path) is None
+    assert diagram_name("https://example.com/diagrams/a.png", page, tmp_path) is None
+
+
+def test_scan(tmp_path):
+    page = tmp_path / "src" / "content" / "docs" / "guide" / "page.mdx"
+    page.parent.mkdir(parents=True)
+    page.write_text(PAGE)
+
+    report = scan(tmp_path)
+
+    assert sorted(report.used) == [
+        "compilation",
+        "handlers",
+        "phase_ordering",
+        "removed_diagram",
+    ]
+    assert report.used["phase_ordering"][0].line == 5
+    assert [(r.source, r.target) for r in report.missing] == [
+        ("src/content/docs/guide/page.mdx", "/diagrams/removed_diagram.png")
+    ]
+    assert "compilation" not in report.unreferenced
+    assert "handlers" not in report.unreferenced
+    assert "struct_types" in report.unreferenced
+    assert report.referenced_modules == ["compilation", "handlers", "phase_ordering"]
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+from docs.gen_diagrams import render
+from docs.gen_diagrams.manifest import theme_of
+from docs.gen_diagrams.render import outputs, unchanged
+from docs.gen_diagrams.tests.test_images import png
+
+
+def test_unchanged(tmp_path):
+    path = tmp_path / "flow.png"
+    image = png(8, 8)
+    path.write_bytes(image)
+
+    assert unchanged(path, png(8, 8, level=1, text=True))
+    assert not unchanged(path, png(8, 8, color=b"\xff\xff\xff"))
+    assert not unchanged(tmp_path / "missing.png", image)
+
+
+def test_unchanged_truncated_image(tmp_path):
+    path = tmp_path / "flow.png"
+    image = png(8, 8)
+
+    # an interrupted earlier write leaves a truncated file behind
+    path.write_bytes(image[:-7])
+    assert not unchanged(path, image)
+    path.write_bytes(image)
+    assert not unchanged(path, image[:-7])
+
+
+def test_outputs_name_themes_like_the_manifest(monkeypatch):
+    diagram = SimpleNamespace(filename="diagrams/flow", outformat="svg")
+    # rendering only the dark theme must not give it the plain names
+    monkeypatch.setattr(render.OPTIONS, "themes", ["dark"])
+
+    for theme in ("light", "dark"):
+        [(path, _, _)] = outputs(diagram, theme=theme)
+        assert theme_of(path) == theme
+    assert outputs(diagram, theme="dark")[0][0].name == "flow@dark.svg"
+    assert outputs(diagram, theme="light")[0][0].name == "flow.svg"
+
+
+def test_outputs_default_to_one_file_per_format(monkeypatch):
+    diagram = SimpleNamespace(filename="diagrams/flow", outformat=["png", "svg"])
+    graph = SimpleNamespace(attrs={"bb": "0,0,720,360", "pad": "0"})
+    monkeypatch.setattr(render.OPTIONS, "themes", [])
+    monkeypatch.setattr(render.OPTIONS, "raster_variants", False)
+
+    assert render.render_themes() == ["light"]
+    assert [path.name for path, _, _ in outputs(diagram, graph)] == [
+        "flow.png",
+        "flow.svg",
+    ]
+
+    monkeypatch.setattr(render.OPTIONS, "raster_variants", True)
+    assert [path.name for path, _, _ in outputs(diagram, graph)] == [
+        "flow.png",
+        "flow@192dpi.png",
+        "flow@480w.png",
+        "flow@960w.png",
+        "flow@1440w.png",
+        "flow.svg",
+    ]
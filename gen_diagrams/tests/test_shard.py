@@ -0,0 +1,29 @@
+import pytest
+
+from docs.gen_diagrams.shard import Shard, merge_reports, select, write_report
+
+MODULES = ["handlers", "compilation", "enum_variants", "struct_types", "union"]
+COSTS = {"compilation": 5.0, "handlers": 3.0, "union": 1.0}
+
+
+def test_select_covers_every_module_once():
+    shards = [select(MODULES, Shard(i, 2), COSTS) for i in (1, 2)]
+
+    assert sorted(shards[0] + shards[1]) == sorted(MODULES)
+    # the two slowest go to different shards
+    assert ("compilation" in shards[0]) != ("handlers" in shards[0])
+    # original order is kept
+    assert shards[0] == [m for m in MODULES if m in shards[0]]
+
+
+def test_merge_reports(tmp_path):
+    for i in (1, 2):
+        shard = Shard(i, 2)
+        seconds = {m: 1.0 for m in select(MODULES, shard, COSTS)}
+        write_report(tmp_path, shard, MODULES, seconds)
+
+    assert sorted(merge_reports(tmp_path)) == sorted(MODULES)
+
+    (tmp_path / "render-2of2.json").unlink()
+    with pytest.raises(ValueError, match="missing shards 2/2"):
+        merge_reports(tmp_path)
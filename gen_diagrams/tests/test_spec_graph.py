@@ -0,0 +1,70 @@
+from docs.gen_diagrams.spec_graph import (
+    SpecGraph,
+    SpecNode,
+    load,
+    spec_links,
+    strongly_connected,
+)
+
+KINDS = """
+- id: RFC
+  references: [AD]
+- id: AD
+  references: []
+- id: ERR
+"""
+
+
+def spec(kind: str, number: int, body: str) -> str:
+    return f"---\nkind: {kind}\nnumber: {number}\ntitle: {kind} {number}\n---\n{body}"
+
+
+def test_spec_links():
+    body = """
+See [the manifest](/specs/rfc/RFC-0019), [AD](../ad/AD-0002.md#goals)
+and [self](<RFC-0001.md>); not a [link](/specs/foo/FOO-0001) or RFC-0003.
+"""
+    assert spec_links(body, {"RFC", "AD"}) == {"RFC-0019", "AD-0002", "RFC-0001"}
+
+
+def test_strongly_connected():
+    edges = {"a": {"b"}, "b": {"c"}, "c": {"b"}, "d": set()}
+
+    # dependencies come first
+    assert strongly_connected(edges) == [["b", "c"], ["a"], ["d"]]
+
+
+def test_levels():
+    graph = SpecGraph(
+        specs={s: SpecNode("RFC", i, s) for i, s in enumerate("abcde")},
+        edges={"a": {"b"}, "b": {"c"}, "c": {"b", "d"}, "d": set(), "e": {"a"}},
+    )
+
+    assert graph.levels == {"d": 0, "b": 1, "c": 1, "a": 2, "e": 3}
+    assert graph.cycles == [["b", "c"]]
+    assert graph.by_level() == [["d"], ["b", "c"], ["a"], ["e"]]
+    collapsed = graph.collapsed()
+    assert list(collapsed.groups) == [(0, "RFC"), (1, "RFC"), (2, "RFC"), (3, "RFC")]
+    assert collapsed.edges[(2, "RFC"), (1, "RFC")] == 1
+
+
+def test_load(tmp_path):
+    kinds = tmp_path / "spec-kinds.yaml"
+    kinds.write_text(KINDS)
+    for kind, number, body in [
+        ("RFC", 1, "[a](/specs/ad/AD-0001) [b](/specs/rfc/RFC-0009)"),
+        ("AD", 1, "[c](/specs/err/ERR-0001)"),
+        ("ERR", 1, "[d](/specs/rfc/RFC-0001)"),
+    ]:
+        path = tmp_path / kind.lower() / f"{kind}-{number:04d}.md"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(spec(kind, number, body))
+
+    graph = load(tmp_path, kinds)
+
+    assert sorted(graph.specs) == ["AD-0001", "ERR-0001", "RFC-0001"]
+    assert graph.specs["AD-0001"].title == "AD 1"
+    assert graph.unresolved == {"RFC-0001": {"RFC-0009"}}
+    # AD does not list ERR in its references
+    assert graph.disallowed == {("AD-0001", "ERR-0001"), ("ERR-0001", "RFC-0001")}
+    assert graph.cycles == [["AD-0001", "ERR-0001", "RFC-0001"]]
@@ -0,0 +1,69 @@
+import struct
+import zlib
+
+from docs.gen_diagrams.svg import optimize, same
+
+SVG_NS = "http://www.w3.org/2000/svg"
+
+
+def icon() -> bytes:
+    header = struct.pack(">IIBBBBB", 2, 3, 8, 2, 0, 0, 0)
+
+    def chunk(kind: bytes, body: bytes) -> bytes:
+        crc = zlib.crc32(kind + body)
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", crc)
+
+    pixels = zlib.compress(b"\x00" + b"\x00" * 6 * 3)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", pixels)
+
+
+def graphviz_svg(href: str) -> bytes:
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<!-- Generated by graphviz -->
+<svg xmlns="{SVG_NS}" xmlns:xlink="http://www.w3.org/1999/xlink" width="100pt" height="50pt">
+<g id="graph0" class="graph">
+<g id="node1" class="node"><title>4f1c2a</title>
+<image xlink:href="{href}" width="20px" height="30px" x="1" y="2"/>
+</g>
+<g id="node2" class="node"><title>9b3e7d</title>
+<image xlink:href="{href}" width="20px" height="30px" x="40" y="2"/>
+</g>
+<g id="edge1" class="edge"><path d="M1.5,2.25 L40.125,2"/></g>
+</g>
+</svg>""".encode()
+
+
+def test_optimize_inlines_icons_once(tmp_path):
+    (tmp_path / "rust.png").write_bytes(icon())
+    out = optimize(graphviz_svg("rust.png"), tmp_path).decode()
+
+    assert out.count("<symbol") == 1
+    assert 'viewBox="0 0 2 3"' in out
+    assert out.count("<use") == 2
+    assert "data:image/png;base64," in out
+    assert "rust.png" not in out
+    assert "<title>" not in out
+    assert "Generated by graphviz" not in out
+    # ids nothing refers to are dropped, the symbol's is kept
+    assert 'id="node1"' not in out
+    assert out.count('id="icon-') == 1
+
+
+def test_optimize_keeps_missing_images(tmp_path):
+    out = optimize(graphviz_svg("missing.png"), tmp_path).decode()
+
+    assert out.count("missing.png") == 2
+    assert "<symbol" not in out
+
+
+def test_same():
+    svg = graphviz_svg("rust.png")
+    reordered = svg.replace(
+        b'width="20px" height="30px" x="1"', b'height="30px" width="20px" x="1.0001"'
+    )
+    moved = svg.replace(b"L40.125,2", b"L41,2")
+
+    assert same(svg, reordered)
+    # ids do not change the picture
+    assert same(svg, svg.replace(b'id="node1"', b'id="node7"'))
+    assert not same(svg, moved)
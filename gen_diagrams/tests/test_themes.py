@@ -0,0 +1,36 @@
+from docs.gen_diagrams.common import themes
+from docs.gen_diagrams.dot import HTML, parse
+from docs.gen_diagrams.themes import apply, convert
+
+INVERT = {"lightness": [0.1, 0.9]}
+
+
+def test_convert_inverts_lightness():
+    assert convert("#000000", INVERT) == "#e6e6e6"
+    assert convert("#ffffff", INVERT) == "#1a1a1a"
+    # alpha and hue are kept, short and named colors are expanded
+    assert convert("#00000080", INVERT) == "#e6e6e680"
+    assert convert("#f00", INVERT) == "#ff0000"
+    assert convert("black", INVERT) == "#e6e6e6"
+
+
+def test_convert_explicit_colors():
+    dark = themes["dark"]
+
+    assert convert("white", dark) == "#17181c"
+    assert convert("#FFFFFF", dark) == "#17181c"
+    # unknown colors are kept
+    assert convert("foo", dark) == "foo"
+    assert convert("#00000080", {}) == "#00000080"
+
+
+def test_apply():
+    graph = parse('digraph { a [color="red:blue" label=<<b>red</b>>] }')
+    themed = apply(graph, INVERT)
+
+    assert themed is not graph
+    assert themed.nodes["a"].attrs["color"] == "#ff0000:#0000ff"
+    assert themed.nodes["a"].attrs["label"] == "<b>red</b>"
+    assert isinstance(themed.nodes["a"].attrs["label"], HTML)
+    assert graph.nodes["a"].attrs["color"] == "red:blue"
+    assert apply(graph, themes["light"]) is graph
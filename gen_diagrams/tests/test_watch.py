@@ -0,0 +1,24 @@
+from docs.gen_diagrams.runner import diagram_modules
+from docs.gen_diagrams.watch import affected, dependency_graph, imports
+
+
+def test_imports():
+    assert imports("manifest") == {"common", "images", "references"}
+
+
+def test_script_change_rebuilds_only_that_diagram():
+    graph = dependency_graph()
+
+    assert affected({"compilation"}, graph) == ["compilation"]
+    assert affected({"phase_ordering"}, graph) == ["phase_ordering"]
+
+
+def test_tooling_change_rebuilds_every_diagram():
+    graph = dependency_graph()
+    scripts = set(diagram_modules())
+
+    for module in ("svg", "layout", "native", "render", "common"):
+        order = affected({module}, graph)
+        assert scripts <= set(order)
+        # reloaded before the modules importing it
+        assert order.index(module) < order.index("render") or module == "render"
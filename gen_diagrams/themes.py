@@ -0,0 +1,108 @@
+"""
+Color themes applied to an already positioned graph.
+
+No color attribute takes part in layout, so every theme is drawn from the
+same layout: a theme only rewrites the colors of the positioned graph before
+it goes to ``neato -n2``. Themes are defined in ``common.themes``:
+
+- ``defaults``: graph/node/edge attributes set on the root graph when the
+  diagram does not set them itself (graphviz falls back to black on
+  transparent otherwise)
+- ``colors``: explicit replacements, keyed by lowercase color
+- ``lightness``: ``[low, high]``; every other color keeps its hue and
+  saturation while its HSL lightness is inverted into that range, so light
+  pastel cluster backgrounds become dark ones and dark text becomes light
+
+A theme without any of these (like ``light``) leaves the graph untouched.
+"""
+
+import colorsys
+import copy
+import re
+
+from gen_diagrams import dot
+
+COLOR_ATTRS = frozenset(
+    {"bgcolor", "color", "fillcolor", "fontcolor", "pencolor", "labelfontcolor"}
+)
+
+# the named colors the diagrams use, graphviz knows many more
+NAMED_COLORS = {
+    "white": "#ffffff",
+    "black": "#000000",
+    "red": "#ff0000",
+    "green": "#00ff00",
+    "blue": "#0000ff",
+    "gray": "#c0c0c0",
+    "grey": "#c0c0c0",
+    "orange": "#ffa500",
+    "purple": "#a020f0",
+    "yellow": "#ffff00",
+}
+
+_COLOR = re.compile(r"#[0-9a-fA-F]{3,8}\b|\b[a-zA-Z]+\b")
+
+
+def _hex(value: str) -> tuple[str, str] | None:
+    """(rrggbb, alpha) of a hex or known named color."""
+    value = NAMED_COLORS.get(value.lower(), value)
+    if not value.startswith("#"):
+        return None
+    digits = value[1:]
+    if len(digits) in (3, 4):
+        digits = "".join(c * 2 for c in digits)
+    if len(digits) not in (6, 8):
+        return None
+    return digits[:6].lower(), digits[6:]
+
+
+def convert(color: str, theme: dict) -> str:
+    """One color under ``theme``; colors it cannot parse are kept."""
+    replaced = theme.get("colors", {}).get(color.lower())
+    if replaced is not None:
+        return replaced
+    lightness = theme.get("lightness")
+    parsed = _hex(color)
+    if lightness is None or parsed is None:
+        return color
+    rgb, alpha = parsed
+    r, g, b = (int(rgb[i : i + 2], 16) / 255 for i in (0, 2, 4))
+    h, lum, s = colorsys.rgb_to_hls(r, g, b)
+    low, high = lightness
+    r, g, b = colorsys.hls_to_rgb(h, low + (high - low) * (1 - lum), s)
+    return "#" + "".join(f"{round(c * 255):02x}" for c in (r, g, b)) + alpha
+
+
+def _recolor(attrs: dict[str, str], theme: dict):
+    for key, value in attrs.items():
+        if key in COLOR_ATTRS and not isinstance(value, dot.HTML):
+            # color lists such as "red:blue" or "red;0.3:blue"
+            attrs[key] = _COLOR.sub(lambda m: convert(m.group(), theme), value)
+
+
+def is_identity(theme: dict) -> bool:
+    return not (theme.get("defaults") or theme.get("colors") or theme.get("lightness"))
+
+
+def apply(graph: dot.Graph, theme: dict) -> dot.Graph:
+    """A copy of ``graph`` drawn in ``theme`` (``graph`` itself when no-op)."""
+    if is_identity(theme):
+        return graph
+    graph = copy.deepcopy(graph)
+    defaults = theme.get("defaults", {})
+    for attrs in (graph.attrs, graph.node_defaults, graph.edge_defaults):
+        _recolor(attrs, theme)
+    for key, value in defaults.get("graph", {}).items():
+        graph.attrs.setdefault(key, value)
+    for key, value in defaults.get("node", {}).items():
+        graph.node_defaults.setdefault(key, value)
+    for key, value in defaults.get("edge", {}).items():
+        graph.edge_defaults.setdefault(key, value)
+    for sg in graph.subgraphs.values():
+        for attrs in (sg.attrs, sg.node_defaults, sg.edge_defaults):
+            _recolor(attrs, theme)
+    for node in graph.nodes.values():
+        _recolor(node.attrs, theme)
+    for edge in graph.edges:
+        _recolor(edge.attrs, theme)
+    return graph
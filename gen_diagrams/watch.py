@@ -0,0 +1,136 @@
+"""
+Watch mode: re-render diagrams as their sources change.
+
+The ``diagrams`` library and the tooling modules stay imported between
+renders. When a diagram script or definition changes only that diagram is
+rebuilt; when a tooling module such as ``common.py`` or ``render.py``
+changes, it is reloaded together with every module that imports it (in
+dependency order) and every diagram is re-rendered. Scripts only import
+``common.py``, but they are all drawn through the rendering pipeline, so
+each diagram depends on all the tooling.
+"""
+
+import ast
+import importlib
+import sys
+import time
+import traceback
+from pathlib import Path
+
+import gen_diagrams
+from gen_diagrams.runner import definition_paths, diagram_modules, run
+
+PACKAGE = "gen_diagrams"
+PACKAGE_DIR = Path(gen_diagrams.__file__).parent
+
+# never reloaded: the entry points that are running the watch loop
+ENTRY_MODULES = frozenset({"__main__", "watch"})
+
+
+def imports(module: str) -> set[str]:
+    """``gen_diagrams`` modules imported by ``module``."""
+    tree = ast.parse((PACKAGE_DIR / f"{module}.py").read_text())
+    found = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names = [node.module] + [f"{node.module}.{a.name}" for a in node.names]
+        else:
+            continue
+        for name in names:
+            parts = name.split(".")
+            if parts[0] == PACKAGE and len(parts) > 1:
+                if (PACKAGE_DIR / f"{parts[1]}.py").exists():
+                    found.add(parts[1])
+    found.discard(module)
+    return found
+
+
+def dependency_graph() -> dict[str, set[str]]:
+    scripts = set(diagram_modules())
+    graph = {path.stem: imports(path.stem) for path in PACKAGE_DIR.glob("*.py")}
+    tooling = {
+        module
+        for module in graph
+        if module not in scripts
+        and module not in ENTRY_MODULES
+        and not module.startswith("_")
+    }
+    for name in scripts:
+        graph[name] = graph.get(name, set()) | tooling
+    return graph
+
+
+def affected(changed: set[str], graph: dict[str, set[str]]) -> list[str]:
+    """``changed`` plus everything importing it, dependencies first."""
+    closure = set(changed)
+    grew = True
+    while grew:
+        grew = False
+        for module, deps in graph.items():
+            if module not in closure and deps & closure:
+                closure.add(module)
+                grew = True
+
+    ordered, visiting = [], set()
+
+    def visit(module: str):
+        if module in ordered or module in visiting:
+            return
+        visiting.add(module)
+        for dep in sorted(graph.get(module, set()) & closure):
+            visit(dep)
+        ordered.append(module)
+
+    for module in sorted(closure):
+        visit(module)
+    return ordered
+
+
+def snapshot() -> dict[str, int]:
+    paths = [*PACKAGE_DIR.glob("*.py"), *definition_paths().values()]
+    return {path.stem: path.stat().st_mtime_ns for path in paths}
+
+
+def refresh(changed: set[str]) -> list[str]:
+    """Reload changed tooling and re-render affected diagrams; returns them."""
+    scripts = set(diagram_modules())
+    order = affected(changed, dependency_graph())
+
+    for module in order:
+        qualified = f"{PACKAGE}.{module}"
+        if module in scripts or module in ENTRY_MODULES:
+            continue
+        if qualified in sys.modules:
+            importlib.reload(sys.modules[qualified])
+
+    rendered = []
+    for module in order:
+        if module not in scripts:
+            continue
+        start = time.perf_counter()
+        try:
+            run(module)
+        except Exception:
+            traceback.print_exc()
+            continue
+        rendered.append(module)
+        print(f"Rendered {module} in {time.perf_counter() - start:.2f}s")
+    return rendered
+
+
+def watch(interval: float = 0.3):
+    print(f"Watching {PACKAGE_DIR} for changes (Ctrl+C to stop)")
+    seen = snapshot()
+    while True:
+        time.sleep(interval)
+        current = snapshot()
+        changed = {m for m, mtime in current.items() if seen.get(m) != mtime}
+        seen = current
+        if changed:
+            print(f"Changed: {', '.join(sorted(changed))}")
+            try:
+                refresh(changed)
+            except Exception:
+                traceback.print_exc()
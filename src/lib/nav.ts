@@ -0,0 +1,75 @@
+// Precomputed spec navigation, written by `doc-manager collect-specs`
+// (see auto/navigation.py). Every lookup is a single key access, so pages
+// never regroup or sort the whole spec collection.
+import specNav from "@/assets/spec-nav.json";
+import { parseQualifiedId } from "@/lib/specs";
+
+export interface NavSpec {
+  kind: string;
+  number: number;
+  title: string;
+  status: string;
+  route: string;
+  components: string[];
+  prev: string | null;
+  next: string | null;
+}
+
+export interface NavKind {
+  id: string;
+  name: string;
+  route: string;
+  specs: string[];
+}
+
+export interface NavCategory {
+  id: string;
+  name: string;
+  kinds: NavKind[];
+}
+
+interface SpecNav {
+  categories: NavCategory[];
+  specs: Record<string, NavSpec>;
+  components: Record<string, string[]>;
+  statuses: Record<string, string[]>;
+}
+
+export const nav = specNav as SpecNav;
+
+const kinds: Record<string, NavKind> = Object.fromEntries(
+  nav.categories.flatMap((c) => c.kinds).map((k) => [k.id.toLowerCase(), k]),
+);
+
+/** Navigation entry of a qualified id such as 'RFC-0019'. */
+export function navSpec(qid: string): NavSpec | undefined {
+  return nav.specs[qid.toUpperCase()];
+}
+
+/** Spec ids of a kind, in number order. */
+export function specsOfKind(kind: string): string[] {
+  return kinds[kind.toLowerCase()]?.specs ?? [];
+}
+
+/** Spec ids with a status. */
+export function specsWithStatus(status: string): string[] {
+  return nav.statuses[status] ?? [];
+}
+
+/**
+ * Collection `entries` of a kind in navigation order. Specs added since the
+ * last `collect-specs` run are not in spec-nav.json yet and go last, in
+ * number order.
+ */
+export function orderedSpecs<T>(
+  kind: string,
+  entries: T[],
+  qid: (entry: T) => string,
+): T[] {
+  const byId = new Map(entries.map((entry) => [qid(entry), entry]));
+  const ordered = specsOfKind(kind).flatMap((id) => byId.get(id) ?? []);
+  const number = (entry: T) => parseQualifiedId(qid(entry))?.number ?? 0;
+  const added = entries.filter((entry) => !navSpec(qid(entry)));
+  added.sort((a, b) => number(a) - number(b));
+  return ordered.concat(added);
+}